@@ -22,10 +22,22 @@ def run_tokenize(args):
         args.outfile.write(' '.join(
             indic_tokenize.trivial_tokenize(line,args.lang)))
 
+SENTENCE_DELIM_PATS={
+        'auto':'auto',
+        'danda':sentence_tokenize.DELIM_PAT_DANDA,
+        'no_danda':sentence_tokenize.DELIM_PAT_NO_DANDA,
+    }
+
 def run_sentence_split(args):            
-    text=' '.join([  l.replace('\n','').replace('\r','') for l in args.infile])
-    outlines=sentence_tokenize.sentence_split(text,args.lang)
-    for line in outlines:
+    ## the delimiter pattern is chosen before reading the lines: a file is 
+    ## scanned for a danda and rewound, other input is buffered until the first danda
+    delim_pat=SENTENCE_DELIM_PATS[args.delim]
+    if delim_pat=='auto' and args.lang!='ur': 
+        delim_pat=sentence_tokenize.get_delim_pat(args.infile,args.lang)
+
+    ## the lines are joined by spaces, and the text is split as it is read 
+    lines=(  l.replace('\n','').replace('\r','')+' ' for l in args.infile )
+    for line in sentence_tokenize.iter_sentences(lines,args.lang,delim_pat):
         args.outfile.write(line+'\n')
 
 def run_normalize(args):
@@ -167,6 +179,11 @@ def add_detokenize_parser(subparsers):
 def add_sentence_split_parser(subparsers):
     task_parser=subparsers.add_parser('sentence_split', help='sentence split help')
     add_common_monolingual_args(task_parser)
+    task_parser.add_argument('-d','--delim', 
+                default='auto',
+                choices=list(SENTENCE_DELIM_PATS.keys()),
+                help='Sentence delimiters. In auto mode, languages which use danda as delimiter use the danda delimiters if the text has a danda: input which is not a file is buffered until the first danda',
+            )
     task_parser.set_defaults(func=run_sentence_split)
 
 def add_normalize_parser(subparsers):
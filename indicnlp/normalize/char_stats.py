@@ -0,0 +1,188 @@
+#
+#  Copyright (c) 2013-present, Anoop Kunchukuttan
+#  All rights reserved.
+#
+#  This source code is licensed under the MIT license found in the
+#  LICENSE file in the root directory of this source tree.
+#
+
+"""
+Character statistics of a corpus, to choose the settings of the normalizers
+without normalizing the corpus.
+
+The profiler computes a histogram of the characters of the corpus, and counts
+how many times each rule of a normalizer would apply to the corpus. The rules
+are counted independently, on the original text. The histogram is computed
+with `numpy.unique` on the UTF-32 code units of large blocks of text, and
+the single character rules are counted from the histogram. Other rules are
+counted only in the blocks which contain their trigger characters.
+"""
+
+from collections import Counter
+import re
+import numpy as np
+
+from indicnlp.normalize import indic_normalize
+
+WHITESPACE=' \n\t\r'
+
+## texts shorter than this are counted with a Counter, which is faster than 
+## the numpy conversions for short texts
+SHORT_TEXT_LEN=200
+
+def codepoint_histogram(text):
+    """
+    Count the occurrences of each codepoint in the text, in a single pass
+
+    Args:
+        text (str): text
+
+    Returns:
+        dict: count of each codepoint which occurs in the text
+    """
+    if len(text)<SHORT_TEXT_LEN:
+        return { ord(c):n for c, n in Counter(text).items() }
+    ## np.unique rather than np.bincount, which allocates a count for every 
+    ## codepoint up to the largest one (e.g. an emoji)
+    codepoints=np.frombuffer(text.encode('utf-32-le'),dtype='<u4')
+    values, counts=np.unique(codepoints,return_counts=True)
+    return dict(zip(values.tolist(),counts.tolist()))
+
+class CharStatsProfiler(object):
+    """
+    Character statistics of a corpus for a normalizer.
+
+    Texts are added with `update` (complete texts) or `update_chunks` (a text
+    read in chunks), and the statistics are read with `stats`.
+    """
+
+    def __init__(self,normalizer):
+        """
+        Args:
+            normalizer (NormalizerI): normalizer whose rules are counted. Normalizers without a normalization plan (Urdu) only get the character histogram
+        """
+        self.normalizer=normalizer
+        self.lang=normalizer.lang
+        self.n_texts=0
+        self.n_chars=0
+        self._codepoint_counts=Counter()
+
+        plan=getattr(normalizer,'plan',None)
+        self.rules=plan.rules if plan is not None else []
+        ## None for the rules which cannot be counted: functions without a 
+        ## count function, and insertions
+        self._rule_counts=[ None if (kind=='transform' and count is None) or pattern=='' else 0
+                            for kind, pattern, _, _, count in self.rules ]
+        self._patterns=[ re.compile(pattern) if kind=='sub' else None
+                            for kind, pattern, _, _, _ in self.rules ]
+
+    def _count_rule(self,i,text,histogram):
+        kind, pattern, _, triggers, count=self.rules[i]
+        if triggers is not None and not any( ord(c) in histogram for c in triggers ):
+            return 0
+        if kind=='replace':
+            if len(pattern)==1:
+                return histogram.get(ord(pattern),0)
+            return text.count(pattern)
+        elif kind=='sub':
+            return len(self._patterns[i].findall(text))
+        else:
+            return count(text)
+
+    def _update(self,text,histogram):
+        self.n_chars+=len(text)
+        self._codepoint_counts.update(histogram)
+        for i in range(len(self.rules)):
+            if self._rule_counts[i] is not None:
+                self._rule_counts[i]+=self._count_rule(i,text,histogram)
+
+    def update(self,text):
+        """
+        Add a complete text (e.g. a line or a document) to the statistics. For
+        many short texts, `update_chunks` on their concatenation is faster.
+
+        Args:
+            text (str): text
+        """
+        self.n_texts+=1
+        self._update(text,codepoint_histogram(text))
+
+    def update_chunks(self,chunks,block_size=1<<20):
+        """
+        Add a text given in chunks (e.g. the lines of a file, including the
+        newlines) to the statistics. The chunks are processed in blocks of
+        about `block_size` characters, cut after a whitespace character, so
+        that the rule matches are counted as in the whole text (see
+        `indic_normalize.StreamingNormalizer`).
+
+        Args:
+            chunks (iterable): chunks of the text
+            block_size (int): number of characters processed at once
+        """
+        self.n_texts+=1
+        carry=''
+        block=[]
+        size=0
+        for chunk in chunks:
+            block.append(chunk)
+            size+=len(chunk)
+            if size>=block_size:
+                text=carry+''.join(block)
+                end=max( text.rfind(c) for c in WHITESPACE )+1
+                carry=text[end:]
+                block=[]
+                size=0
+                if end>0:
+                    self._update(text[:end],codepoint_histogram(text[:end]))
+        text=carry+''.join(block)
+        self._update(text,codepoint_histogram(text))
+
+    def char_counts(self):
+        """
+        Returns:
+            collections.Counter: count of each character in the corpus
+        """
+        return Counter({ chr(c):n for c, n in self._codepoint_counts.items() })
+
+    def rule_counts(self):
+        """
+        Returns:
+            list: for each rule of the normalizer, in order, a dict with the `rule` kind ('replace', 'sub' or 'transform'), its `pattern` (the name of the function for 'transform'), `replacement` and `count`, the number of matches in the corpus (None if the rule cannot be counted)
+        """
+        rule_counts=[]
+        for (kind, pattern, repl, _, _), n in zip(self.rules,self._rule_counts):
+            if kind=='transform':
+                pattern=pattern.__name__
+            rule_counts.append({'rule':kind, 'pattern':pattern, 'replacement':repl, 'count':n})
+        return rule_counts
+
+    def stats(self):
+        """
+        Returns:
+            dict: the `lang`, the number of texts `n_texts` and characters `n_chars`, the `char_counts` (see `char_counts`) and the `rule_counts` (see `rule_counts`)
+        """
+        return {
+            'lang':self.lang,
+            'n_texts':self.n_texts,
+            'n_chars':self.n_chars,
+            'char_counts':self.char_counts(),
+            'rule_counts':self.rule_counts(),
+        }
+
+def profile_corpus(chunks,lang,**kwargs):
+    """
+    Compute the character statistics of a corpus, e.g. a file object, for the
+    normalizer of a language
+
+    Args:
+        chunks (iterable): chunks of the corpus, e.g. lines including the newlines
+        lang (str): language code
+        kwargs: arguments of the normalizer, see `IndicNormalizerFactory.get_normalizer`
+
+    Returns:
+        dict: statistics, see `CharStatsProfiler.stats`
+    """
+    normalizer=indic_normalize.IndicNormalizerFactory().get_normalizer(lang,**kwargs)
+    profiler=CharStatsProfiler(normalizer)
+    profiler.update_chunks(chunks)
+    return profiler.stats()
@@ -13,8 +13,13 @@
 # @author Anoop Kunchukuttan 
 #
 
-import sys, codecs, string, itertools, re
+import sys, codecs, string, itertools, re, functools, threading
+from collections import OrderedDict
 from indicnlp import langinfo
+from indicnlp.common import IndicNlpException
+from indicnlp import parallel
+from indicnlp import urdu
+from indicnlp.normalize.normalization_plan import NormalizationPlan
 
 
 class NormalizerI(object):
@@ -42,25 +47,32 @@ class NormalizerI(object):
     ZERO_WIDTH_NON_JOINER='\u200C'
     ZERO_WIDTH_JOINER='\u200D'
 
+    ## Applied many of the punctuation normalizations that are part of MosesNormalizer 
+    ## from sacremoses
+    PUNCTUATION_SUBSTITUTIONS=[
+        (BYTE_ORDER_MARK,''),
+        ('„', r'"'),
+        ('“', r'"'),
+        ('”', r'"'),
+        ('–', r'-'),
+        ('—', r' - '),
+        ('´', r"'"),
+        ('‘', r"'"),
+        ('‚', r"'"),
+        ('’', r"'"),
+        ("''", r'"'),
+        ('´´', r'"'),
+        ('…', r'...'),
+    ]
+
     def _normalize_punctuations(self, text):
         """
         Normalize punctuations. 
         Applied many of the punctuation normalizations that are part of MosesNormalizer 
         from sacremoses
         """
-        text=text.replace(NormalizerI.BYTE_ORDER_MARK,'')
-        text=text.replace('„', r'"')
-        text=text.replace('“', r'"')
-        text=text.replace('”', r'"')
-        text=text.replace('–', r'-')
-        text=text.replace('—', r' - ')
-        text=text.replace('´', r"'")
-        text=text.replace('‘', r"'")
-        text=text.replace('‚', r"'")
-        text=text.replace('’', r"'")
-        text=text.replace("''", r'"')
-        text=text.replace('´´', r'"')
-        text=text.replace('…', r'...')
+        for match, repl in NormalizerI.PUNCTUATION_SUBSTITUTIONS:
+            text=text.replace(match,repl)
 
         return text
 
@@ -86,15 +98,42 @@ class BaseNormalizer(NormalizerI):
         self._init_normalize_nasals()
         self._init_normalize_vowel_ending()
         #self._init_visarga_correction()
+
+        self.plan=NormalizationPlan()
+        self._init_normalization_plan(self.plan)
+        self.plan.compile()
         
     def _init_normalize_vowel_ending(self):
+        """
+        for IE
+        - consonant ending: add halant
+        - halant ending: no change
+        - 'a' ki maatra: no change
+
+        for Dravidian
+        - consonant ending: add 'a' ki maatra
+        - halant ending: no change
+        - 'a' ki maatra: no change
+
+        Words are separated by spaces. The vowel ending is inserted before every 
+        space which follows a consonant, in a single regex pass with a literal 
+        replacement, and after a consonant at the end of the text. 
+        """
 
         if self.lang in langinfo.IE_LANGUAGES:
-            self.fn_vowel_ending=self._normalize_word_vowel_ending_ie
+            vowel_ending=langinfo.offset_to_char(langinfo.HALANTA_OFFSET,self.lang)
         elif self.lang in langinfo.DRAVIDIAN_LANGUAGES:
-            self.fn_vowel_ending=self._normalize_word_vowel_ending_dravidian
+            vowel_ending=langinfo.offset_to_char(0x3e,self.lang)
         else:
-            self.fn_vowel_ending=lambda x: x
+            vowel_ending=None
+
+        if vowel_ending is None: 
+            self.vowel_ending_consonants=''
+            self.vowel_ending_pat=None
+        else: 
+            self.vowel_ending_consonants=''.join([ langinfo.offset_to_char(o,self.lang) for o in range(0x15,0x3a) ])
+            self.vowel_ending_pat=re.compile(r'(?<=[{}]) '.format(self.vowel_ending_consonants))
+            self.vowel_ending=vowel_ending
 
     def _init_normalize_chandras(self):
 
@@ -137,28 +176,40 @@ class BaseNormalizer(NormalizerI):
         halant_offset=0x4d
         anusvaara_offset=0x02
         
-        pats=[]
-        
+        halant=langinfo.offset_to_char(halant_offset,self.lang)
+        anusvaara=langinfo.offset_to_char(anusvaara_offset,self.lang)
+
+        ## All the classes are matched by a single pattern: a nasal, halant and 
+        ## a consonant of any class. The table has the replacements of the 
+        ## (nasal,halant,consonant) sequences where the consonant is of the class 
+        ## of the nasal, other matches are left unchanged. The nasals are not in 
+        ## any class, so the matches of the classes never overlap, and a single 
+        ## pass gives the same result as a pass per class. 
+        nasals=''
+        consonants=''
+        repls={}
         for pat_signature in pat_signatures:
-            pat=re.compile(r'{nasal}{halant}([{start_r}-{end_r}])'.format(
-                nasal=langinfo.offset_to_char(pat_signature[0],self.lang),
-                halant=langinfo.offset_to_char(halant_offset,self.lang),
-                start_r=langinfo.offset_to_char(pat_signature[1],self.lang),
-                end_r=langinfo.offset_to_char(pat_signature[2],self.lang),
-            ))
-            pats.append(pat)
-        
-        repl_string='{anusvaara}\\1'.format(anusvaara=langinfo.offset_to_char(anusvaara_offset,self.lang))
-
-        self.pats_repls=(pats,repl_string)
+            nasal=langinfo.offset_to_char(pat_signature[0],self.lang)
+            nasals+=nasal
+            for offset in range(pat_signature[1],pat_signature[2]+1):
+                consonant=langinfo.offset_to_char(offset,self.lang)
+                consonants+=consonant
+                repls[nasal+halant+consonant]=anusvaara+consonant
+
+        self.nasal_pat=re.compile('[{nasals}]{halant}[{consonants}]'.format(
+                nasals=nasals, halant=halant, consonants=consonants))
+        self.nasal_repls=repls
+        self.nasal_chars=nasals+halant+consonants+anusvaara
     
+    def _to_anusvaara_strict_repl(self,m):
+        match=m.group()
+        return self.nasal_repls.get(match,match)
+
     def _to_anusvaara_strict(self,text):
-        
-        pats, repl_string = self.pats_repls
-        for pat in pats:
-            text=pat.sub(repl_string,text)
-            
-        return text
+        return self.nasal_pat.sub(self._to_anusvaara_strict_repl,text)
+
+    def _count_anusvaara_strict(self,text):
+        return sum( 1 for match in self.nasal_pat.findall(text) if match in self.nasal_repls )
 
     def _init_to_anusvaara_relaxed(self):
         """
@@ -179,10 +230,16 @@ class BaseNormalizer(NormalizerI):
         repl_string='{anusvaara}'.format(anusvaara=langinfo.offset_to_char(anusvaara_offset,self.lang))
 
         self.pats_repls = (pat,repl_string)
+        ## the character class of the pattern also contains the commas
+        self.nasal_chars=nasals_list_str+langinfo.offset_to_char(halant_offset,self.lang)+repl_string
     
     def _to_anusvaara_relaxed(self,text):
         pat, repl_string = self.pats_repls
         return pat.sub(repl_string,text)
+
+    def _count_anusvaara_relaxed(self,text):
+        pat, repl_string = self.pats_repls
+        return len(pat.findall(text))
     
 
     def _init_to_nasal_consonants(self):
@@ -203,30 +260,35 @@ class BaseNormalizer(NormalizerI):
         halant_offset=0x4d
         anusvaara_offset=0x02 
         
-        pats=[]
-        repl_strings=[]
-        
+        halant=langinfo.offset_to_char(halant_offset,self.lang)
+        anusvaara=langinfo.offset_to_char(anusvaara_offset,self.lang)
+
+        ## All the classes are matched by a single pattern: anusvaara followed 
+        ## by a consonant of any class. The dental class appears twice, the 
+        ## first nasal listed for a consonant is used. 
+        consonants=''
+        repls={}
         for pat_signature in pat_signatures:
-            pat=re.compile(r'{anusvaara}([{start_r}-{end_r}])'.format(
-                anusvaara=langinfo.offset_to_char(anusvaara_offset,self.lang),
-                start_r=langinfo.offset_to_char(pat_signature[1],self.lang),
-                end_r=langinfo.offset_to_char(pat_signature[2],self.lang),
-            ))
-            pats.append(pat)
-            repl_string='{nasal}{halant}\\1'.format(
-                nasal=langinfo.offset_to_char(pat_signature[0],self.lang),
-                halant=langinfo.offset_to_char(halant_offset,self.lang),
-                )
-            repl_strings.append(repl_string)
-    
-        self.pats_repls=list(zip(pats,repl_strings))
+            nasal=langinfo.offset_to_char(pat_signature[0],self.lang)
+            for offset in range(pat_signature[1],pat_signature[2]+1):
+                consonant=langinfo.offset_to_char(offset,self.lang)
+                if anusvaara+consonant not in repls:
+                    consonants+=consonant
+                    repls[anusvaara+consonant]=nasal+halant+consonant
+
+        self.nasal_pat=re.compile('{anusvaara}[{consonants}]'.format(
+                anusvaara=anusvaara, consonants=consonants))
+        self.nasal_repls=repls
+        self.nasal_chars=anusvaara+consonants+''.join(repls.values())
+
+    def _to_nasal_consonants_repl(self,m):
+        return self.nasal_repls[m.group()]
 
     def _to_nasal_consonants(self,text):
-    
-        for pat, repl in self.pats_repls:
-            text=pat.sub(repl,text)
-            
-        return text
+        return self.nasal_pat.sub(self._to_nasal_consonants_repl,text)
+
+    def _count_nasal_consonants(self,text):
+        return len(self.nasal_pat.findall(text))
 
     def _init_normalize_nasals(self):
 
@@ -247,75 +309,91 @@ class BaseNormalizer(NormalizerI):
         else:
             return text
 
-    
-    def _normalize_word_vowel_ending_dravidian(self,word):
-        """
-        for Dravidian
-        - consonant ending: add 'a' ki maatra
-        - halant ending: no change
-        - 'a' ki maatra: no change
-        """
-        if len(word)>0 and langinfo.is_consonant(word[-1],self.lang):
-            return word+langinfo.offset_to_char(0x3e,self.lang)
-        else:
-            return word
-
-    def _normalize_word_vowel_ending_ie(self,word):
-        """
-        for IE
-        - consonant ending: add halant
-        - halant ending: no change
-        - 'a' ki maatra: no change
-        """
-        if len(word)>0 and langinfo.is_consonant(word[-1],self.lang):
-            return word+langinfo.offset_to_char(langinfo.HALANTA_OFFSET,self.lang)
+    def _count_nasals(self,text): 
+        if self.nasals_mode == 'to_anusvaara_strict':
+            return self._count_anusvaara_strict(text)
+        elif self.nasals_mode == 'to_anusvaara_relaxed':
+            return self._count_anusvaara_relaxed(text)
+        elif self.nasals_mode == 'to_nasal_consonants':
+            return self._count_nasal_consonants(text)
         else:
-            return word 
-
+            return 0
+    
     def _normalize_vowel_ending(self,text):
-        return ' '.join([ self.fn_vowel_ending(w) for w in text.split(' ') ])
+        if self.vowel_ending_pat is None: 
+            return text
+        text=self.vowel_ending_pat.sub(self.vowel_ending+' ',text)
+        if len(text)>0 and text[-1] in self.vowel_ending_consonants: 
+            text+=self.vowel_ending
+        return text
 
-    def normalize(self,text):
+    def _count_vowel_ending(self,text):
+        if self.vowel_ending_pat is None: 
+            return 0
+        count=len(self.vowel_ending_pat.findall(text))
+        if len(text)>0 and text[-1] in self.vowel_ending_consonants: 
+            count+=1
+        return count
+
+    def _init_normalization_plan(self,plan):
         """
-        Method to be implemented for normalization for each script 
+        Add the normalization rules to the plan, in the order in which they are applied. 
+        Script specific normalizers should override this method, and call the super 
+        class method to add the common normalization rules. The plan is compiled once, 
+        when the normalizer is created. 
         """
-        text=text.replace(NormalizerI.BYTE_ORDER_MARK,'')
-        text=text.replace(NormalizerI.BYTE_ORDER_MARK_2,'')
-        text=text.replace(NormalizerI.WORD_JOINER,'')
-        text=text.replace(NormalizerI.SOFT_HYPHEN,'')
+        plan.replace(NormalizerI.BYTE_ORDER_MARK,'')
+        plan.replace(NormalizerI.BYTE_ORDER_MARK_2,'')
+        plan.replace(NormalizerI.WORD_JOINER,'')
+        plan.replace(NormalizerI.SOFT_HYPHEN,'')
 
-        text=text.replace(NormalizerI.ZERO_WIDTH_SPACE,' ') # ??
-        text=text.replace(NormalizerI.NO_BREAK_SPACE,' ')
+        plan.replace(NormalizerI.ZERO_WIDTH_SPACE,' ') # ??
+        plan.replace(NormalizerI.NO_BREAK_SPACE,' ')
 
-        text=text.replace(NormalizerI.ZERO_WIDTH_NON_JOINER, '')
-        text=text.replace(NormalizerI.ZERO_WIDTH_JOINER,'')
+        plan.replace(NormalizerI.ZERO_WIDTH_NON_JOINER, '')
+        plan.replace(NormalizerI.ZERO_WIDTH_JOINER,'')
         
-        text=self._normalize_punctuations(text)
+        for match, repl in NormalizerI.PUNCTUATION_SUBSTITUTIONS:
+            plan.replace(match,repl)
 
         if self.do_normalize_chandras:
-            text=self._normalize_chandras(text)
-        text=self._normalize_nasals(text)
+            for match, repl in self.chandra_substitutions:
+                plan.replace(match,repl)
+        ## The nasal patterns contain a halant or an anusvaara respectively. 
+        ## The script specific rules added later which do not involve the 
+        ## characters of the patterns and replacements are merged with the 
+        ## stages before the nasal and vowel ending functions. 
+        if self.nasals_mode in ['to_anusvaara_strict','to_anusvaara_relaxed']:
+            plan.transform(self._normalize_nasals,triggers=langinfo.offset_to_char(langinfo.HALANTA_OFFSET,self.lang),
+                    count=self._count_nasals,chars=self.nasal_chars)
+        elif self.nasals_mode=='to_nasal_consonants':
+            plan.transform(self._normalize_nasals,triggers=langinfo.offset_to_char(0x02,self.lang),
+                    count=self._count_nasals,chars=self.nasal_chars)
+
+        ## only the words ending with a consonant are changed
         if self.do_normalize_vowel_ending:
-            text=self._normalize_vowel_ending(text)
-        
-        return text
+            plan.transform(self._normalize_vowel_ending,triggers=self.vowel_ending_consonants,
+                    count=self._count_vowel_ending,chars=self.vowel_ending_consonants+' '+self.vowel_ending)
 
+    def normalize(self,text):
+        """
+        Normalize the text by applying the compiled normalization plan 
+        """
+        return self.plan.apply(text)
 
-    def get_char_stats(self,text):    
-        print(len(re.findall(NormalizerI.BYTE_ORDER_MARK,text)))
-        print(len(re.findall(NormalizerI.BYTE_ORDER_MARK_2,text)))
-        print(len(re.findall(NormalizerI.WORD_JOINER,text)))
-        print(len(re.findall(NormalizerI.SOFT_HYPHEN,text)))
-
-        print(len(re.findall(NormalizerI.ZERO_WIDTH_SPACE,text) ))
-        print(len(re.findall(NormalizerI.NO_BREAK_SPACE,text)))
 
-        print(len(re.findall(NormalizerI.ZERO_WIDTH_NON_JOINER,text)))
-        print(len(re.findall(NormalizerI.ZERO_WIDTH_JOINER,text)))
+    def get_char_stats(self,text):    
+        """
+        Get the character statistics of the text: the count of each character, 
+        and the number of matches of each normalization rule in the text 
 
-        #for mobj in re.finditer(NormalizerI.ZERO_WIDTH_NON_JOINER,text):
-        #    print text[mobj.start()-10:mobj.end()+10].replace('\n', ' ').replace(NormalizerI.ZERO_WIDTH_NON_JOINER,'').encode('utf-8')
-        #print hex(ord(text[mobj.end():mobj.end()+1]))
+        Returns:
+            dict: statistics, see `indicnlp.normalize.char_stats.CharStatsProfiler.stats`
+        """
+        from indicnlp.normalize.char_stats import CharStatsProfiler
+        profiler=CharStatsProfiler(self)
+        profiler.update(text)
+        return profiler.stats()
 
     def correct_visarga(self,text,visarga_char,char_range):
         text=re.sub(r'([\u0900-\u097f]):','\\1\u0903',text)
@@ -337,64 +415,35 @@ class DevanagariNormalizer(BaseNormalizer):
             do_normalize_chandras=False,do_normalize_vowel_ending=False):
         super(DevanagariNormalizer,self).__init__(lang,remove_nuktas,nasals_mode,do_normalize_chandras,do_normalize_vowel_ending)
 
-    def normalize(self,text): 
+    def _init_normalization_plan(self,plan): 
 
         # common normalization for Indic scripts 
-        text=super(DevanagariNormalizer,self).normalize(text)
+        super(DevanagariNormalizer,self)._init_normalization_plan(plan)
 
         # chandra a replacement for Marathi
-        text=text.replace('\u0972','\u090f')
+        plan.replace('\u0972','\u090f')
 
         # decomposing Nukta based composite characters
-        text=text.replace('\u0929','\u0928'+DevanagariNormalizer.NUKTA)
-        text=text.replace('\u0931','\u0930'+DevanagariNormalizer.NUKTA)
-        text=text.replace('\u0934','\u0933'+DevanagariNormalizer.NUKTA)
-        text=text.replace('\u0958','\u0915'+DevanagariNormalizer.NUKTA)
-        text=text.replace('\u0959','\u0916'+DevanagariNormalizer.NUKTA)
-        text=text.replace('\u095A','\u0917'+DevanagariNormalizer.NUKTA)
-        text=text.replace('\u095B','\u091C'+DevanagariNormalizer.NUKTA)
-        text=text.replace('\u095C','\u0921'+DevanagariNormalizer.NUKTA)
-        text=text.replace('\u095D','\u0922'+DevanagariNormalizer.NUKTA)
-        text=text.replace('\u095E','\u092B'+DevanagariNormalizer.NUKTA)
-        text=text.replace('\u095F','\u092F'+DevanagariNormalizer.NUKTA)
+        plan.replace('\u0929','\u0928'+DevanagariNormalizer.NUKTA)
+        plan.replace('\u0931','\u0930'+DevanagariNormalizer.NUKTA)
+        plan.replace('\u0934','\u0933'+DevanagariNormalizer.NUKTA)
+        plan.replace('\u0958','\u0915'+DevanagariNormalizer.NUKTA)
+        plan.replace('\u0959','\u0916'+DevanagariNormalizer.NUKTA)
+        plan.replace('\u095A','\u0917'+DevanagariNormalizer.NUKTA)
+        plan.replace('\u095B','\u091C'+DevanagariNormalizer.NUKTA)
+        plan.replace('\u095C','\u0921'+DevanagariNormalizer.NUKTA)
+        plan.replace('\u095D','\u0922'+DevanagariNormalizer.NUKTA)
+        plan.replace('\u095E','\u092B'+DevanagariNormalizer.NUKTA)
+        plan.replace('\u095F','\u092F'+DevanagariNormalizer.NUKTA)
 
         if self.remove_nuktas:
-            text=text.replace(DevanagariNormalizer.NUKTA,'')
+            plan.replace(DevanagariNormalizer.NUKTA,'')
 
         # replace pipe character for poorna virama 
-        text=text.replace('\u007c','\u0964')
+        plan.replace('\u007c','\u0964')
 
         # correct visarga 
-        text=re.sub(r'([\u0900-\u097f]):','\\1\u0903',text)
-
-        return text
-
-    def get_char_stats(self,text):
-        super(DevanagariNormalizer,self).get_char_stats(text)
-
-        print((len(re.findall('\u0929',text))))
-        print((len(re.findall('\u0931',text))))
-        print((len(re.findall('\u0934',text))))
-        print((len(re.findall('\u0958',text))))
-        print((len(re.findall('\u0959',text))))
-        print((len(re.findall('\u095A',text))))
-        print((len(re.findall('\u095B',text))))
-        print((len(re.findall('\u095C',text))))
-        print((len(re.findall('\u095D',text))))
-        print((len(re.findall('\u095E',text))))
-        print((len(re.findall('\u095F',text))))
-
-        #print(len(re.findall(u'\u0928'+DevanagariNormalizer.NUKTA,text)))
-        #print(len(re.findall(u'\u0930'+DevanagariNormalizer.NUKTA,text)))
-        #print(len(re.findall(u'\u0933'+DevanagariNormalizer.NUKTA,text)))
-        #print(len(re.findall(u'\u0915'+DevanagariNormalizer.NUKTA,text)))
-        #print(len(re.findall(u'\u0916'+DevanagariNormalizer.NUKTA,text)))
-        #print(len(re.findall(u'\u0917'+DevanagariNormalizer.NUKTA,text)))
-        #print(len(re.findall(u'\u091C'+DevanagariNormalizer.NUKTA,text)))
-        #print(len(re.findall(u'\u0921'+DevanagariNormalizer.NUKTA,text)))
-        #print(len(re.findall(u'\u0922'+DevanagariNormalizer.NUKTA,text)))
-        #print(len(re.findall(u'\u092B'+DevanagariNormalizer.NUKTA,text)))
-        #print(len(re.findall(u'\u092F'+DevanagariNormalizer.NUKTA,text)))
+        plan.sub(r'([\u0900-\u097f]):','\\1\u0903',triggers=':')
 
 class GurmukhiNormalizer(BaseNormalizer): 
     """
@@ -426,13 +475,14 @@ class GurmukhiNormalizer(BaseNormalizer):
                 do_canonicalize_addak=False, 
                 do_canonicalize_tippi=False, 
                 do_replace_vowel_bases=False):
-        super(GurmukhiNormalizer,self).__init__(lang,remove_nuktas,nasals_mode,do_normalize_chandras,do_normalize_vowel_ending)
+        ## set before the super class constructor, which compiles the normalization plan
         self.do_canonicalize_addak=do_canonicalize_addak
         self.do_canonicalize_tippi=do_canonicalize_tippi
         self.do_replace_vowel_bases=do_replace_vowel_bases
+        super(GurmukhiNormalizer,self).__init__(lang,remove_nuktas,nasals_mode,do_normalize_chandras,do_normalize_vowel_ending)
 
 
-    def _normalize_vowels(self,text):
+    def _init_normalize_vowels(self,plan):
         """
         """
 
@@ -441,7 +491,7 @@ class GurmukhiNormalizer(BaseNormalizer):
         ## Table 12-16
 
         for k,v in GurmukhiNormalizer.VOWEL_NORM_MAPS.items():
-            text=text.replace(k,v)
+            plan.replace(k,v)
         
         ## the above mappings should account for majority of the variantions, 
         ## Rest are handled via this generic rule which looks at the diacritic 
@@ -451,53 +501,49 @@ class GurmukhiNormalizer(BaseNormalizer):
         ## If these special characters occur without any diacritic, replace them with closet
         ## equivalent vowels
         if self.do_replace_vowel_bases:
-            text=text.replace('\u0a72','\u0a07')
-            text=text.replace('\u0a73','\u0a09')
+            plan.replace('\u0a72','\u0a07')
+            plan.replace('\u0a73','\u0a09')
 
-        return text
 
-
-    def normalize(self,text): 
+    def _init_normalization_plan(self,plan): 
 
         # Addak
         if self.do_canonicalize_addak:
             ## replace addak+consonant with consonat+halant+consonant
-            text=re.sub(r'\u0a71(.)','\\1\u0a4d\\1',text)
+            plan.sub(r'\u0a71(.)','\\1\u0a4d\\1',triggers='\u0a71')
             
         # Tippi 
         if self.do_canonicalize_tippi:
-            text=text.replace('\u0a70','\u0a02') 
+            plan.replace('\u0a70','\u0a02') 
 
         # Vowels: Gurumuki has multiple ways of representing independent vowels due
         # to the characters 'iri' and 'ura'. 
-        text=self._normalize_vowels(text)
+        self._init_normalize_vowels(plan)
 
         # common normalization for Indic scripts 
-        text=super(GurmukhiNormalizer,self).normalize(text)
+        super(GurmukhiNormalizer,self)._init_normalization_plan(plan)
 
         # decomposing Nukta based composite characters
-        text=text.replace('\u0a33','\u0a32'+GurmukhiNormalizer.NUKTA)
-        text=text.replace('\u0a36','\u0a38'+GurmukhiNormalizer.NUKTA)
-        text=text.replace('\u0a59','\u0a16'+GurmukhiNormalizer.NUKTA)
-        text=text.replace('\u0a5a','\u0a17'+GurmukhiNormalizer.NUKTA)
-        text=text.replace('\u0a5b','\u0a1c'+GurmukhiNormalizer.NUKTA)
-        text=text.replace('\u0a5e','\u0a2b'+GurmukhiNormalizer.NUKTA)
+        plan.replace('\u0a33','\u0a32'+GurmukhiNormalizer.NUKTA)
+        plan.replace('\u0a36','\u0a38'+GurmukhiNormalizer.NUKTA)
+        plan.replace('\u0a59','\u0a16'+GurmukhiNormalizer.NUKTA)
+        plan.replace('\u0a5a','\u0a17'+GurmukhiNormalizer.NUKTA)
+        plan.replace('\u0a5b','\u0a1c'+GurmukhiNormalizer.NUKTA)
+        plan.replace('\u0a5e','\u0a2b'+GurmukhiNormalizer.NUKTA)
 
         if self.remove_nuktas:
-            text=text.replace(GurmukhiNormalizer.NUKTA,'')
+            plan.replace(GurmukhiNormalizer.NUKTA,'')
 
         # replace the poorna virama codes specific to script 
         # with generic Indic script codes
-        text=text.replace('\u0a64','\u0964')
-        text=text.replace('\u0a65','\u0965')
+        plan.replace('\u0a64','\u0964')
+        plan.replace('\u0a65','\u0965')
 
         ## replace pipe character for poorna virama 
-        text=text.replace('\u007c','\u0964')
+        plan.replace('\u007c','\u0964')
 
         # correct visarge 
-        text=re.sub(r'([\u0a00-\u0a7f]):','\\1\u0a03',text)
-
-        return text
+        plan.sub(r'([\u0a00-\u0a7f]):','\\1\u0a03',triggers=':')
 
 
 class GujaratiNormalizer(BaseNormalizer): 
@@ -513,25 +559,23 @@ class GujaratiNormalizer(BaseNormalizer):
                     do_normalize_vowel_ending=False):
         super(GujaratiNormalizer,self).__init__(lang,remove_nuktas,nasals_mode,do_normalize_chandras,do_normalize_vowel_ending)
 
-    def normalize(self,text): 
+    def _init_normalization_plan(self,plan): 
 
         # common normalization for Indic scripts 
-        text=super(GujaratiNormalizer,self).normalize(text)
+        super(GujaratiNormalizer,self)._init_normalization_plan(plan)
 
         # decomposing Nukta based composite characters
         if self.remove_nuktas:
-            text=text.replace(GujaratiNormalizer.NUKTA,'')
+            plan.replace(GujaratiNormalizer.NUKTA,'')
 
 
         # replace the poorna virama codes specific to script 
         # with generic Indic script codes
-        text=text.replace('\u0ae4','\u0964')
-        text=text.replace('\u0ae5','\u0965')
+        plan.replace('\u0ae4','\u0964')
+        plan.replace('\u0ae5','\u0965')
 
         # correct visarge 
-        text=re.sub(r'([\u0a80-\u0aff]):','\\1\u0a83',text)
-
-        return text
+        plan.sub(r'([\u0a80-\u0aff]):','\\1\u0a83',triggers=':')
 
 
 class OriyaNormalizer(BaseNormalizer): 
@@ -558,57 +602,56 @@ class OriyaNormalizer(BaseNormalizer):
     def __init__(self,lang='or',remove_nuktas=False,nasals_mode='do_nothing',do_normalize_chandras=False,
                 do_normalize_vowel_ending=False,
                 do_remap_wa=False):
-        super(OriyaNormalizer,self).__init__(lang,remove_nuktas,nasals_mode,do_normalize_chandras,do_normalize_vowel_ending)
+        ## set before the super class constructor, which compiles the normalization plan
         self.do_remap_wa=do_remap_wa
+        super(OriyaNormalizer,self).__init__(lang,remove_nuktas,nasals_mode,do_normalize_chandras,do_normalize_vowel_ending)
 
-    def normalize(self,text): 
+    def _init_normalization_plan(self,plan): 
 
         # common normalization for Indic scripts 
-        text=super(OriyaNormalizer,self).normalize(text)
+        super(OriyaNormalizer,self)._init_normalization_plan(plan)
 
         ## standard vowel replacements as per suggestions in Unicode documents
         for k,v in OriyaNormalizer.VOWEL_NORM_MAPS.items():
-            text=text.replace(k,v)
+            plan.replace(k,v)
 
         # decomposing Nukta based composite characters
-        text=text.replace('\u0b5c','\u0b21'+OriyaNormalizer.NUKTA)
-        text=text.replace('\u0b5d','\u0b22'+OriyaNormalizer.NUKTA)
+        plan.replace('\u0b5c','\u0b21'+OriyaNormalizer.NUKTA)
+        plan.replace('\u0b5d','\u0b22'+OriyaNormalizer.NUKTA)
 
         if self.remove_nuktas:
-            text=text.replace(OriyaNormalizer.NUKTA,'')
+            plan.replace(OriyaNormalizer.NUKTA,'')
 
         # replace the poorna virama codes specific to script 
         # with generic Indic script codes
-        text=text.replace('\u0b64','\u0964')
-        text=text.replace('\u0b65','\u0965')
+        plan.replace('\u0b64','\u0964')
+        plan.replace('\u0b65','\u0965')
 
         # replace pipe character for poorna virama 
-        text=text.replace('\u0b7c','\u0964')
+        plan.replace('\u0b7c','\u0964')
 
         # replace wa with ba 
         if self.do_remap_wa:
-            text=text.replace('\u0b71','\u0b2c')
+            plan.replace('\u0b71','\u0b2c')
 
         # replace va with ba 
         # NOTE: documentation (chapter on Indic scripts) and codepoint chart seem contradictory 
         # (this applied to wa to ba rule also above)
-        text=text.replace('\u0b35','\u0b2c')
+        plan.replace('\u0b35','\u0b2c')
 
         # AI dependent vowel sign 
-        text=text.replace('\u0b47\u0b56','\u0b58')
+        plan.replace('\u0b47\u0b56','\u0b58')
 
         # two part dependent vowels
-        text=text.replace('\u0b47\u0b3e','\u0b4b')
-        text=text.replace('\u0b47\u0b57','\u0b4c')
+        plan.replace('\u0b47\u0b3e','\u0b4b')
+        plan.replace('\u0b47\u0b57','\u0b4c')
 
 
         # additional consonant - not clear how to handle this
         # ignore
 
         # correct visarge 
-        text=re.sub(r'([\u0b00-\u0b7f]):','\\1\u0b03',text)
-
-        return text
+        plan.sub(r'([\u0b00-\u0b7f]):','\\1\u0b03',triggers=':')
 
 
 class BengaliNormalizer(BaseNormalizer): 
@@ -626,44 +669,43 @@ class BengaliNormalizer(BaseNormalizer):
     def __init__(self,lang='bn',remove_nuktas=False,nasals_mode='do_nothing',do_normalize_chandras=False,
                     do_normalize_vowel_ending=False,
                     do_remap_assamese_chars=False):
-        super(BengaliNormalizer,self).__init__(lang,remove_nuktas,nasals_mode,do_normalize_chandras,do_normalize_vowel_ending)
+        ## set before the super class constructor, which compiles the normalization plan
         self.do_remap_assamese_chars=do_remap_assamese_chars
+        super(BengaliNormalizer,self).__init__(lang,remove_nuktas,nasals_mode,do_normalize_chandras,do_normalize_vowel_ending)
 
-    def normalize(self,text):
+    def _init_normalization_plan(self,plan): 
 
         # common normalization for Indic scripts 
-        text=super(BengaliNormalizer,self).normalize(text)
+        super(BengaliNormalizer,self)._init_normalization_plan(plan)
 
         # decomposing Nukta based composite characters
-        text=text.replace('\u09dc','\u09a1'+BengaliNormalizer.NUKTA)
-        text=text.replace('\u09dd','\u09a2'+BengaliNormalizer.NUKTA)
-        text=text.replace('\u09df','\u09af'+BengaliNormalizer.NUKTA)
+        plan.replace('\u09dc','\u09a1'+BengaliNormalizer.NUKTA)
+        plan.replace('\u09dd','\u09a2'+BengaliNormalizer.NUKTA)
+        plan.replace('\u09df','\u09af'+BengaliNormalizer.NUKTA)
 
         if self.remove_nuktas:
-            text=text.replace(BengaliNormalizer.NUKTA,'')
+            plan.replace(BengaliNormalizer.NUKTA,'')
 
         if self.do_remap_assamese_chars and self.lang=='as':
-            text=text.replace('\u09f0','\u09b0')  #  'ra' character
-            text=text.replace('\u09f1','\u09ac')  #  'va' character 
+            plan.replace('\u09f0','\u09b0')  #  'ra' character
+            plan.replace('\u09f1','\u09ac')  #  'va' character 
 
         # replace the poorna virama codes specific to script 
         # with generic Indic script codes
-        text=text.replace('\u09e4','\u0964')
-        text=text.replace('\u09e5','\u0965')
+        plan.replace('\u09e4','\u0964')
+        plan.replace('\u09e5','\u0965')
 
         # replace pipe character for poorna virama 
-        text=text.replace('\u007c','\u0964')
+        plan.replace('\u007c','\u0964')
         # replace bengali currency numerator four for poorna virama  (it looks similar and is used as a substitute)
-        text=text.replace('\u09f7','\u0964')
+        plan.replace('\u09f7','\u0964')
 
         # two part dependent vowels
-        text=text.replace('\u09c7\u09be','\u09cb')
-        text=text.replace('\u09c7\u09d7','\u09cc')
+        plan.replace('\u09c7\u09be','\u09cb')
+        plan.replace('\u09c7\u09d7','\u09cc')
 
         # correct visarge 
-        text=re.sub(r'([\u0980-\u09ff]):','\\1\u0983',text)
-
-        return text
+        plan.sub(r'([\u0980-\u09ff]):','\\1\u0983',triggers=':')
 
 
 class TamilNormalizer(BaseNormalizer): 
@@ -678,26 +720,24 @@ class TamilNormalizer(BaseNormalizer):
             do_normalize_chandras=False,do_normalize_vowel_ending=False):
         super(TamilNormalizer,self).__init__(lang,remove_nuktas,nasals_mode,do_normalize_chandras,do_normalize_vowel_ending)
 
-    def normalize(self,text): 
+    def _init_normalization_plan(self,plan): 
 
         # common normalization for Indic scripts 
-        text=super(TamilNormalizer,self).normalize(text)
+        super(TamilNormalizer,self)._init_normalization_plan(plan)
 
         # replace the poorna virama codes specific to script 
         # with generic Indic script codes
-        text=text.replace('\u0be4','\u0964')
-        text=text.replace('\u0be5','\u0965')
+        plan.replace('\u0be4','\u0964')
+        plan.replace('\u0be5','\u0965')
 
         # two part dependent vowels
-        text=text.replace('\u0b92\u0bd7','\u0b94')
-        text=text.replace('\u0bc6\u0bbe','\u0bca')
-        text=text.replace('\u0bc7\u0bbe','\u0bcb')
-        text=text.replace('\u0bc6\u0bd7','\u0bcc')
+        plan.replace('\u0b92\u0bd7','\u0b94')
+        plan.replace('\u0bc6\u0bbe','\u0bca')
+        plan.replace('\u0bc7\u0bbe','\u0bcb')
+        plan.replace('\u0bc6\u0bd7','\u0bcc')
 
         # correct visarge 
-        text=re.sub(r'([\u0b80-\u0bff]):','\\1\u0b83',text)
-
-        return text
+        plan.sub(r'([\u0b80-\u0bff]):','\\1\u0b83',triggers=':')
 
 
 class TeluguNormalizer(BaseNormalizer): 
@@ -712,26 +752,21 @@ class TeluguNormalizer(BaseNormalizer):
                 do_normalize_chandras=False,do_normalize_vowel_ending=False):
         super(TeluguNormalizer,self).__init__(lang,remove_nuktas,nasals_mode,do_normalize_chandras,do_normalize_vowel_ending)
 
-    def normalize(self,text): 
+    def _init_normalization_plan(self,plan): 
 
         # common normalization for Indic scripts 
-        text=super(TeluguNormalizer,self).normalize(text)
+        super(TeluguNormalizer,self)._init_normalization_plan(plan)
 
         # replace the poorna virama codes specific to script 
         # with generic Indic script codes
-        text=text.replace('\u0c64','\u0964')
-        text=text.replace('\u0c65','\u0965')
+        plan.replace('\u0c64','\u0964')
+        plan.replace('\u0c65','\u0965')
 
         # dependent vowels
-        text=text.replace('\u0c46\u0c56','\u0c48')
+        plan.replace('\u0c46\u0c56','\u0c48')
 
         # correct visarge 
-        text=re.sub(r'([\u0c00-\u0c7f]):','\\1\u0c03',text)
-
-        return text
-
-    def get_char_stats(self,text):
-        pass 
+        plan.sub(r'([\u0c00-\u0c7f]):','\\1\u0c03',triggers=':')
 
 class KannadaNormalizer(BaseNormalizer): 
     """
@@ -746,27 +781,25 @@ class KannadaNormalizer(BaseNormalizer):
         super(KannadaNormalizer,self).__init__(lang,remove_nuktas,nasals_mode,do_normalize_chandras,do_normalize_vowel_ending)
 
 
-    def normalize(self,text): 
+    def _init_normalization_plan(self,plan): 
 
         # common normalization for Indic scripts 
-        text=super(KannadaNormalizer,self).normalize(text)
+        super(KannadaNormalizer,self)._init_normalization_plan(plan)
 
         # replace the poorna virama codes specific to script 
         # with generic Indic script codes
-        text=text.replace('\u0ce4','\u0964')
-        text=text.replace('\u0ce5','\u0965')
+        plan.replace('\u0ce4','\u0964')
+        plan.replace('\u0ce5','\u0965')
 
         # dependent vowels
-        text=text.replace('\u0cbf\u0cd5','\u0cc0')
-        text=text.replace('\u0cc6\u0cd5','\u0cc7')
-        text=text.replace('\u0cc6\u0cd6','\u0cc8')
-        text=text.replace('\u0cc6\u0cc2','\u0cca')
-        text=text.replace('\u0cca\u0cd5','\u0ccb')
+        plan.replace('\u0cbf\u0cd5','\u0cc0')
+        plan.replace('\u0cc6\u0cd5','\u0cc7')
+        plan.replace('\u0cc6\u0cd6','\u0cc8')
+        plan.replace('\u0cc6\u0cc2','\u0cca')
+        plan.replace('\u0cca\u0cd5','\u0ccb')
 
         # correct visarge 
-        text=re.sub(r'([\u0c80-\u0cff]):','\\1\u0c83',text)
-
-        return text
+        plan.sub(r'([\u0c80-\u0cff]):','\\1\u0c83',triggers=':')
 
 
 class MalayalamNormalizer(BaseNormalizer): 
@@ -787,114 +820,102 @@ class MalayalamNormalizer(BaseNormalizer):
                     '\u0d7f': '\u0d15',
                  }
 
-    def _canonicalize_chillus(self,text):
+    def _init_canonicalize_chillus(self,plan):
         for chillu, char in MalayalamNormalizer.CHILLU_CHAR_MAP.items(): 
-            text=text.replace(chillu,'{}\u0d4d'.format(char)) 
-        return text
+            plan.replace(chillu,'{}\u0d4d'.format(char)) 
 
-    def _correct_geminated_T(self,text):
-        return text.replace('\u0d31\u0d4d\u0d31','\u0d1f\u0d4d\u0d1f')
+    def _init_correct_geminated_T(self,plan):
+        plan.replace('\u0d31\u0d4d\u0d31','\u0d1f\u0d4d\u0d1f')
 
     def __init__(self,lang='ml',remove_nuktas=False,nasals_mode='do_nothing',do_normalize_chandras=False,
                 do_normalize_vowel_ending=False,
                 do_canonicalize_chillus=False, do_correct_geminated_T=False):
-        super(MalayalamNormalizer,self).__init__(lang,remove_nuktas,nasals_mode,do_normalize_chandras,do_normalize_vowel_ending)
+        ## set before the super class constructor, which compiles the normalization plan
         self.do_canonicalize_chillus=do_canonicalize_chillus
         self.do_correct_geminated_T=do_correct_geminated_T
+        super(MalayalamNormalizer,self).__init__(lang,remove_nuktas,nasals_mode,do_normalize_chandras,do_normalize_vowel_ending)
 
-    def normalize(self,text): 
+    def _init_normalization_plan(self,plan): 
 
         # Change from old encoding of chillus (till Unicode 5.0) to new encoding
-        text=text.replace('\u0d23\u0d4d\u200d','\u0d7a')
-        text=text.replace('\u0d28\u0d4d\u200d','\u0d7b')
-        text=text.replace('\u0d30\u0d4d\u200d','\u0d7c')
-        text=text.replace('\u0d32\u0d4d\u200d','\u0d7d')
-        text=text.replace('\u0d33\u0d4d\u200d','\u0d7e')
-        text=text.replace('\u0d15\u0d4d\u200d','\u0d7f')
+        plan.replace('\u0d23\u0d4d\u200d','\u0d7a')
+        plan.replace('\u0d28\u0d4d\u200d','\u0d7b')
+        plan.replace('\u0d30\u0d4d\u200d','\u0d7c')
+        plan.replace('\u0d32\u0d4d\u200d','\u0d7d')
+        plan.replace('\u0d33\u0d4d\u200d','\u0d7e')
+        plan.replace('\u0d15\u0d4d\u200d','\u0d7f')
 
         # Normalize chillus
         if self.do_canonicalize_chillus:
-            text=self._canonicalize_chillus(text)
+            self._init_canonicalize_chillus(plan)
 
         # common normalization for Indic scripts 
-        text=super(MalayalamNormalizer,self).normalize(text)
+        super(MalayalamNormalizer,self)._init_normalization_plan(plan)
 
         # replace the poorna virama codes specific to script 
         # with generic Indic script codes
-        text=text.replace('\u0d64','\u0964')
-        text=text.replace('\u0d65','\u0965')
+        plan.replace('\u0d64','\u0964')
+        plan.replace('\u0d65','\u0965')
 
         # dependent vowels
-        text=text.replace('\u0d46\u0d3e','\u0d4a')
-        text=text.replace('\u0d47\u0d3e','\u0d4b')
+        plan.replace('\u0d46\u0d3e','\u0d4a')
+        plan.replace('\u0d47\u0d3e','\u0d4b')
 
         # au forms
-        text=text.replace('\u0d46\u0d57','\u0d4c')
-        text=text.replace('\u0d57','\u0d4c')
+        plan.replace('\u0d46\u0d57','\u0d4c')
+        plan.replace('\u0d57','\u0d4c')
 
         # correct geminated T
         if self.do_correct_geminated_T:
-            text=self._correct_geminated_T(text)
+            self._init_correct_geminated_T(plan)
 
         # correct visarga 
-        text=re.sub(r'([\u0d00-\u0d7f]):','\\1\u0d03',text)
-
-        return text
+        plan.sub(r'([\u0d00-\u0d7f]):','\\1\u0d03',triggers=':')
 
 class UrduNormalizer(NormalizerI):
-    '''Uses UrduHack library.
+    '''Uses UrduHack library, if installed, else a Python implementation of its rules. See `indicnlp.urdu`.
     https://docs.urduhack.com/en/stable/_modules/urduhack/normalization/character.html#normalize
     '''
 
     def __init__(self, lang, remove_nuktas=True):
         self.lang = lang
         self.remove_nuktas = remove_nuktas
-    
-        from urduhack.normalization import (
-            remove_diacritics,
-            normalize_characters,
-            normalize_combine_characters
-        ) # TODO: Use only required normalizers
-        from urduhack.preprocessing import (
-            normalize_whitespace,
-            digits_space,
-            all_punctuations_space,
-            english_characters_space
-        )
-        self.normalize_whitespace = normalize_whitespace
-        self.digits_space = digits_space
-        self.all_punctuations_space = all_punctuations_space
-        self.english_characters_space = english_characters_space
-
-        self.remove_diacritics = remove_diacritics
-        self.normalize_characters = normalize_characters
-        self.normalize_combine_characters = normalize_combine_characters
 
     def normalize(self, text):
         text = self._normalize_punctuations(text)
-        text = self.normalize_whitespace(text)
-        if self.remove_nuktas:
-            text = self.remove_diacritics(text)
-        text = self.normalize_characters(text)
-        text = self.normalize_combine_characters(text)
-        text = self.digits_space(text)
-        text = self.all_punctuations_space(text)
-        text = self.english_characters_space(text)
-        return text
+        return urdu.normalize(text, remove_diacritics=self.remove_nuktas)
+
 
+## languages for which the factory has a specific normalizer
+SUPPORTED_LANGUAGES=['hi','mr','sa','kK','ne','sd',
+                    'ur',
+                    'pa',
+                    'gu',
+                    'bn','as',
+                    'or',
+                    'ml',
+                    'kn',
+                    'ta',
+                    'te']
 
 class IndicNormalizerFactory(object):
     """
     Factory class to create language specific normalizers. 
+
+    The normalizers are cached: `get_normalizer` returns the same instance for 
+    the same language and arguments. The cache is shared by all the factory 
+    instances, is thread-safe and holds at most `CACHE_SIZE` normalizers, 
+    evicting the least recently used one. The cached normalizers are shared, 
+    so they must not be modified. 
     """
 
-    def get_normalizer(self,language,**kwargs):
-        """
-            Call the get_normalizer function to get the language specific normalizer
-            Paramters: 
-            |language: language code
-            |remove_nuktas: boolean, should the normalizer remove nukta characters 
-        """
+    CACHE_SIZE=128
+
+    _cache=OrderedDict()
+    _cache_lock=threading.Lock()
+    _cache_stats={'hits':0, 'misses':0, 'evictions':0}
+
+    def _create_normalizer(self,language,**kwargs):
         normalizer=None
         if language in ['hi','mr','sa','kK','ne','sd']:
             normalizer=DevanagariNormalizer(lang=language, **kwargs)
@@ -923,49 +944,237 @@ class IndicNormalizerFactory(object):
 
         return normalizer    
 
+    def get_normalizer(self,language,**kwargs):
+        """
+            Call the get_normalizer function to get the language specific normalizer
+            Paramters: 
+            |language: language code
+            |remove_nuktas: boolean, should the normalizer remove nukta characters 
+
+            The normalizer is cached by language and arguments, and the same 
+            instance is returned to every caller. It must not be mutated: 
+            setting its attributes or adding rules to its plan changes it for all 
+            the callers, and the statistics of its plan (`n_calls`, `n_fast_path`, 
+            `reset_stats`) are shared counters. Create a normalizer class directly 
+            to get a private instance. 
+        """
+        key=(language,tuple(sorted(kwargs.items())))
+        cls=IndicNormalizerFactory
+
+        with cls._cache_lock: 
+            normalizer=cls._cache.get(key)
+            if normalizer is not None: 
+                cls._cache.move_to_end(key)
+                cls._cache_stats['hits']+=1
+                return normalizer
+            cls._cache_stats['misses']+=1
+
+        ## created outside the lock, if two threads create the same normalizer 
+        ## the first one is kept
+        normalizer=self._create_normalizer(language,**kwargs)
+
+        with cls._cache_lock: 
+            normalizer=cls._cache.setdefault(key,normalizer)
+            cls._cache.move_to_end(key)
+            while len(cls._cache)>cls.CACHE_SIZE: 
+                cls._cache.popitem(last=False)
+                cls._cache_stats['evictions']+=1
+
+        return normalizer
+
+    def cache_info(self): 
+        """
+        Get the statistics of the normalizer cache 
+
+        Returns:
+            dict: number of `hits`, `misses` and `evictions`, and the current `size` of the cache
+        """
+        cls=IndicNormalizerFactory
+        with cls._cache_lock: 
+            info=dict(cls._cache_stats)
+            info['size']=len(cls._cache)
+        return info
+
+    def clear_cache(self): 
+        """
+        Remove all the normalizers from the cache and reset the statistics 
+        """
+        cls=IndicNormalizerFactory
+        with cls._cache_lock: 
+            cls._cache.clear()
+            for k in cls._cache_stats: 
+                cls._cache_stats[k]=0
+
+    def warmup(self,languages=None,**kwargs): 
+        """
+        Create and cache the normalizers for a list of languages, e.g. at the 
+        startup of a server 
+
+        Args:
+            languages (list): language codes. If None, all the supported languages. For Urdu, the Urdu backend is also loaded, see `indicnlp.urdu.warmup`
+            kwargs: arguments of the normalizers, see `get_normalizer`
+        """
+        if languages is None: 
+            languages=SUPPORTED_LANGUAGES
+
+        for language in languages: 
+            self.get_normalizer(language,**kwargs)
+            if language=='ur': 
+                urdu.warmup()
+
     def is_language_supported(self,language): 
         """
         Is the language supported?
         """
-        if language in ['hi','mr','sa','kK','ne','sd',
-                        'ur',
-                        'pa',
-                        'gu',
-                        'bn','as',
-                        'or',
-                        'ml',
-                        'kn',
-                        'ta',
-                        'te']:
+        if language in SUPPORTED_LANGUAGES:
             return True
         else:
             return False
 
+class StreamingNormalizer(object):
+    """
+    Normalizes a text which arrives in chunks (e.g. read in blocks from a file 
+    or object storage), giving the same result as normalizing the whole text 
+    at once. 
+
+    The normalization rules of `BaseNormalizer` and its subclasses never match 
+    across a whitespace character: a match may end with a space (e.g. the 
+    vowel ending rule), but does not continue after it. So the text up to the 
+    last whitespace character of the input received so far is normalized and 
+    returned, and only the partial word after it is carried over to the next 
+    chunk. The vowel ending rule also applies at the end of the text, so the 
+    carried over text is normalized by `flush` at the end of the stream. 
+
+    The chunks must be strings, use an incremental decoder (`codecs.getincrementaldecoder`) 
+    for bytes. 
+
+    Usage::
+
+        streaming_normalizer=StreamingNormalizer(normalizer)
+        for chunk in chunks: 
+            ofile.write(streaming_normalizer.normalize(chunk))
+        ofile.write(streaming_normalizer.flush())
+    """
+
+    WHITESPACE=' \n\t\r'
+
+    def __init__(self,normalizer):
+        """
+        Args:
+            normalizer (BaseNormalizer): normalizer applied to the text
+        """
+        if not isinstance(normalizer,BaseNormalizer): 
+            raise IndicNlpException('Streaming normalization is not supported for {}'.format(type(normalizer).__name__))
+        self.normalizer=normalizer
+        self._carry=''
+
+    def normalize(self,chunk):
+        """
+        Normalize the next chunk of the text
+
+        Args:
+            chunk (str): next chunk of the text
+
+        Returns:
+            str: normalized text up to the last whitespace character in the chunk. Empty if the chunk has no whitespace character
+        """
+        text=self._carry+chunk
+        end=max( text.rfind(c) for c in StreamingNormalizer.WHITESPACE )+1
+        self._carry=text[end:]
+        if end==0: 
+            return ''
+        return self.normalizer.normalize(text[:end])
+
+    def flush(self):
+        """
+        Normalize the text carried over from the last chunk, at the end of the 
+        stream. The streaming normalizer can then be used for a new text. 
+
+        Returns:
+            str: normalized text
+        """
+        text=self._carry
+        self._carry=''
+        return self.normalizer.normalize(text)
+
+    def normalize_chunks(self,chunks):
+        """
+        Normalize a text given as an iterable of chunks
+
+        Args:
+            chunks (iterable): chunks of the text
+
+        Returns:
+            generator: normalized text, in pieces
+        """
+        for chunk in chunks: 
+            text=self.normalize(chunk)
+            if len(text)>0: 
+                yield text
+        text=self.flush()
+        if len(text)>0: 
+            yield text
+
+def _init_batch_normalizer(lang,kwargs): 
+    IndicNormalizerFactory().get_normalizer(lang,**kwargs)
+
+def _normalize_lines(lang,kwargs,lines): 
+    ## the normalizer created by the initializer is in the factory cache
+    normalizer=IndicNormalizerFactory().get_normalizer(lang,**kwargs)
+    return [ normalizer.normalize(line) for line in lines ]
+
+def _normalize_chunks(lines,lang,n_jobs,chunksize,kwargs): 
+    return parallel.imap_chunks(functools.partial(_normalize_lines,lang,kwargs),
+                        parallel.chunked(lines,chunksize),n_jobs=n_jobs,
+                        initializer=_init_batch_normalizer,initargs=(lang,kwargs))
+
+def normalize_batch(lines,lang,n_jobs=1,chunksize=10000,**kwargs): 
+    """normalize a batch of strings using multiple processes
+
+    The lines are split into chunks of `chunksize` lines, which are 
+    normalized by a pool of `n_jobs` worker processes. Each worker creates 
+    the normalizer once, using `IndicNormalizerFactory.get_normalizer`, 
+    which caches it. 
+
+    Args:
+        lines (iterable): strings to normalize
+        lang (str): language code
+        n_jobs (int): number of worker processes. If -1, as many as the number of CPUs. If 1, the lines are normalized in the calling process 
+        chunksize (int): number of lines sent to a worker at a time
+        kwargs: arguments of the normalizer, see `IndicNormalizerFactory.get_normalizer`
+
+    Returns:
+        list: normalized strings, in the input order
+    """
+    normalized=[]
+    for result in _normalize_chunks(lines,lang,n_jobs,chunksize,kwargs): 
+        normalized.extend(result)
+    return normalized
+
 
 if __name__ == '__main__': 
 
     if len(sys.argv)<4:
-        print("Usage: python normalize.py <infile> <outfile> <language> [<replace_nukta(True,False)>] [<normalize_nasals(do_nothing|to_anusvaara_strict|to_anusvaara_relaxed|to_nasal_consonants)>]") 
+        print("Usage: python normalize.py <infile> <outfile> <language> [<replace_nukta(True,False)>] [<normalize_nasals(do_nothing|to_anusvaara_strict|to_anusvaara_relaxed|to_nasal_consonants)>] [<n_jobs>]") 
         sys.exit(1)
 
     language=sys.argv[3]
     remove_nuktas=False
     normalize_nasals='do_nothing'
+    n_jobs=1
     if len(sys.argv)>=5:
         remove_nuktas=bool(sys.argv[4])
     if len(sys.argv)>=6:
         normalize_nasals=sys.argv[5]
+    if len(sys.argv)>=7:
+        n_jobs=int(sys.argv[6])
 
-    # create normalizer
-    factory=IndicNormalizerFactory()
-    normalizer=factory.get_normalizer(language,remove_nuktas=remove_nuktas,nasals_mode=normalize_nasals)
-
-    # DO normalization 
+    # DO normalization, streaming the input in chunks
     with codecs.open(sys.argv[1],'r','utf-8') as ifile:
         with codecs.open(sys.argv[2],'w','utf-8') as ofile:
-            for line in ifile.readlines():
-                normalized_line=normalizer.normalize(line)
-                ofile.write(normalized_line)
+            for normalized_lines in _normalize_chunks(ifile,language,n_jobs,10000,
+                                    dict(remove_nuktas=remove_nuktas,nasals_mode=normalize_nasals)):
+                ofile.writelines(normalized_lines)
    
     ## gather status about normalization 
     #with codecs.open(sys.argv[1],'r','utf-8') as ifile:
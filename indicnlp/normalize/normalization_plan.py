@@ -0,0 +1,455 @@
+#
+#  Copyright (c) 2013-present, Anoop Kunchukuttan
+#  All rights reserved.
+#
+#  This source code is licensed under the MIT license found in the
+#  LICENSE file in the root directory of this source tree.
+#
+
+"""
+Compilation of a sequence of normalization rules into a small number of passes
+over the text.
+
+The rules of a normalizer are added to a `NormalizationPlan` in the order in
+which they have to be applied. Literal replacements are merged as they are
+added:
+
+- replacements of a single character are merged into a translation table
+- other replacements are merged into one alternation regex
+
+A merged stage finds which of its characters or patterns occur in the text,
+and only replaces those. A regex scan finds all of them at once, but costs
+about 8ns per character. Looking for a character with `in` costs a few
+hundredths of that, and for a short string about a fifth, but each lookup is
+a call. So translation tables scan short texts with a regex and look up each
+character in long texts; small stages of multi-character patterns always look
+up each pattern, large ones always scan.
+
+Every stage also knows its triggers, a set of characters and strings: the
+stage cannot change a text which contains none of them. When a text contains
+none of the triggers of the plan, it is returned unchanged after a single scan
+(the fast path).
+
+Rules are merged only when the merged stage gives exactly the same output as
+applying the rules one after another. Otherwise, the rule starts a new stage.
+Regex substitutions and arbitrary functions are opaque: they are always
+separate stages. Rules are never moved across regex substitutions. A
+replacement is moved before the stages at the end of the plan which it
+commutes with, to be merged with an earlier stage: literal stages which do
+not share its characters, and functions which declare the characters they
+work on (see `NormalizationPlan.transform`) when the replacement neither
+contains nor deletes them.
+"""
+
+import re
+
+## a translation table looks up each of its characters with `in`, rather 
+## than scanning the text with a regex, when the text has at least this many 
+## characters per character of the table
+LOOKUP_MIN_LEN_PER_CHAR=15
+
+## stages of multi-character replacements with at most this many patterns look 
+## up each pattern with `in`, larger ones scan the text with a regex
+MAX_LOOKUP_PATTERNS=4
+
+## opaque stages with at most this many trigger characters check whether one 
+## of them occurs with `in` before scanning the text 
+MAX_GATE_TRIGGERS=4
+
+def _overlaps(a,b):
+    """
+    Can occurrences of the strings `a` and `b` overlap in some text?
+    """
+    if a in b or b in a:
+        return True
+    for k in range(1,min(len(a),len(b))):
+        if a.endswith(b[:k]) or b.endswith(a[:k]):
+            return True
+    return False
+
+def _can_follow(rules,old,new):
+    """
+    Can the replacement of `old` by `new` be applied in the same single pass as
+    `rules`, after them? The replacements of the earlier rules must not create
+    or destroy occurrences of `old`.
+    """
+    for r_old, r_new in rules:
+        if _overlaps(r_old,old) or r_new=='' or not set(r_new).isdisjoint(old):
+            return False
+    return True
+
+def _commutes(rules,old,new):
+    """
+    Can the replacement of `old` by `new`, which follows the single pass
+    `rules`, be applied before them instead?
+    """
+    if new=='':
+        return False
+    for r_old, r_new in rules:
+        if r_old=='' or r_new=='' or not set(old).isdisjoint(r_old+r_new) or not set(new).isdisjoint(r_old):
+            return False
+    return True
+
+def _gated(fn,triggers):
+    """
+    Wrap the function of an opaque stage, so that it is skipped when none of 
+    its few trigger characters occurs in the text. Checking a character with 
+    `in` is much faster than a regex scan of the text. 
+    """
+    if triggers is None or len(triggers)>MAX_GATE_TRIGGERS:
+        return fn
+    triggers=sorted(triggers)
+    def apply(text):
+        for c in triggers:
+            if c in text:
+                return fn(text)
+        return text
+    return apply
+
+class _TranslateStage(object):
+    """
+    Replacements of single characters, merged into a single translation table
+    """
+
+    def __init__(self):
+        ## maps every character to its replacement after all the rules
+        self.table={}
+
+    def rules(self):
+        return list(self.table.items())
+
+    def add(self,old,new):
+        for c, repl in self.table.items():
+            self.table[c]=repl.replace(old,new)
+        if old not in self.table:
+            self.table[old]=new
+
+    def triggers(self):
+        return set( c for c, repl in self.table.items() if c!=repl )
+
+    def compile(self):
+        table={ c:repl for c, repl in self.table.items() if c!=repl }
+        if len(table)==0:
+            return None
+
+        pat=re.compile('[{}]'.format(''.join( re.escape(c) for c in table )))
+
+        if any( c in table for repl in table.values() for c in repl ):
+            ## a replacement contains a replaced character, substitute in one pass
+            repl_fn=lambda m: table[m.group()]
+            return lambda text: pat.sub(repl_fn,text)
+
+        ## The characters replaced by normalization are rare in real text. Find 
+        ## which of them occur in a single scan, and replace only those with 
+        ## str.replace, which is much faster than str.translate (it looks up 
+        ## every character of the text) or a substitution callback per match. 
+        ## On long texts, looking up each character with `in` is faster than 
+        ## the scan. 
+        rules=list(table.items())
+        min_len=LOOKUP_MIN_LEN_PER_CHAR*len(rules)
+        def apply(text):
+            if len(text)>=min_len:
+                for c, repl in rules:
+                    if c in text:
+                        text=text.replace(c,repl)
+                return text
+            for c in set(pat.findall(text)):
+                text=text.replace(c,table[c])
+            return text
+        return apply
+
+class _ReplaceStage(object):
+    """
+    Literal replacements which do not interact, found in a single scan
+    """
+
+    def __init__(self):
+        self.repls={}
+
+    def rules(self):
+        return list(self.repls.items())
+
+    def add(self,old,new):
+        self.repls[old]=new
+
+    def triggers(self):
+        if '' in self.repls:
+            return None
+        return set(self.repls)
+
+    def compile(self):
+        if len(self.repls)==1:
+            (old, new), =self.repls.items()
+            return lambda text: text.replace(old,new)
+
+        rules=list(self.repls.items())
+        if len(rules)<=MAX_LOOKUP_PATTERNS:
+            def lookup(text):
+                for old, new in rules:
+                    if old in text:
+                        text=text.replace(old,new)
+                return text
+            return lookup
+
+        ## The patterns do not overlap, so a single scan finds all the patterns 
+        ## which occur in the text. Only those rules are applied, in order. 
+        pat=re.compile('|'.join( re.escape(old) for old, _ in rules ))
+        def apply(text):
+            found=set(pat.findall(text))
+            if len(found)==0:
+                return text
+            for old, new in rules:
+                if old in found:
+                    text=text.replace(old,new)
+            return text
+        return apply
+
+class _RegexStage(object):
+    """
+    A regex substitution
+    """
+
+    def __init__(self,pattern,repl,triggers):
+        self.pat=re.compile(pattern)
+        self.repl=repl
+        self._triggers=triggers
+
+    def triggers(self):
+        return self._triggers
+
+    def compile(self):
+        pat, repl=self.pat, self.repl
+        return _gated(lambda text: pat.sub(repl,text),self._triggers)
+
+class _FunctionStage(object):
+    """
+    An opaque transformation of the text
+    """
+
+    def __init__(self,fn,triggers,chars):
+        self.fn=fn
+        self._triggers=triggers
+        self.chars=chars
+
+    def triggers(self):
+        return self._triggers
+
+    def commutes(self,old,new):
+        """
+        Can the replacement of `old` by `new`, which follows the function, be 
+        applied before it instead? The function only changes runs of its 
+        characters, so a replacement which neither contains nor deletes them 
+        leaves the runs as they are, and the function does not change the 
+        occurrences of `old`.
+        """
+        return self.chars is not None and new!='' and set(old+new).isdisjoint(self.chars)
+
+    def compile(self):
+        return _gated(self.fn,self._triggers)
+
+class NormalizationPlan(object):
+    """
+    A sequence of normalization rules compiled into a few passes over the text.
+
+    Rules are added with `replace`, `sub` and `transform`, and are applied in
+    the order in which they are added.
+
+    The plan counts the calls to `apply` (`n_calls`), and the calls which took
+    the fast path (`n_fast_path`).
+
+    The rules are also kept as added, in `rules`, a list of tuples
+    `(kind, pattern, replacement, triggers, count)`, where kind is 'replace', 
+    'sub' or 'transform'. They are used to profile a corpus, see 
+    `indicnlp.normalize.char_stats`.
+    """
+
+    def __init__(self):
+        self.stages=[]
+        self.rules=[]
+        self.n_rules=0
+        self.n_calls=0
+        self.n_fast_path=0
+        self._fns=None
+        self._trigger_pat=None
+
+    def replace(self,old,new):
+        """
+        Add a rule which replaces all occurrences of the string `old` by `new`,
+        like `str.replace`
+        """
+        self.n_rules+=1
+        self.rules.append(('replace',old,new,None if old=='' else set(old[0]),None))
+        self._fns=None
+        if old=='':
+            stage=_ReplaceStage()
+            stage.add(old,new)
+            self.stages.append(stage)
+            return
+
+        ## the rule is moved before the stages at the end of the plan which it 
+        ## commutes with, until it can be merged with a stage
+        end=len(self.stages)
+        while not self._merge(end,old,new):
+            if end==0 or not self._moves_before(self.stages[end-1],old,new):
+                break
+            end-=1
+        else:
+            return
+
+        stage=_TranslateStage() if len(old)==1 else _ReplaceStage()
+        stage.add(old,new)
+        self.stages.append(stage)
+
+    @staticmethod
+    def _moves_before(stage,old,new):
+        """
+        Can the replacement of `old` by `new`, which follows the stage, be 
+        applied before it instead?
+        """
+        if isinstance(stage,_FunctionStage):
+            return stage.commutes(old,new)
+        if isinstance(stage,(_TranslateStage,_ReplaceStage)):
+            return _commutes(stage.rules(),old,new)
+        return False
+
+    def _merge(self,end,old,new):
+        """
+        Merge the replacement of `old` by `new` into the stages before the 
+        position `end`, if the result is the same as applying it after them. 
+
+        Returns:
+            bool: True if the replacement was merged
+        """
+        last=self.stages[end-1] if end>0 else None
+        prev=self.stages[end-2] if end>1 else None
+
+        if len(old)==1:
+            if isinstance(last,_TranslateStage):
+                last.add(old,new)
+            elif isinstance(last,_ReplaceStage) and isinstance(prev,_TranslateStage) \
+                    and _commutes(last.rules(),old,new):
+                prev.add(old,new)
+            elif isinstance(last,_ReplaceStage) and _can_follow(last.rules(),old,new):
+                last.add(old,new)
+            else:
+                return False
+        else:
+            if isinstance(last,_ReplaceStage) and _can_follow(last.rules(),old,new):
+                last.add(old,new)
+            elif isinstance(last,_TranslateStage) and isinstance(prev,_ReplaceStage) \
+                    and _commutes(last.rules(),old,new) and _can_follow(prev.rules(),old,new):
+                prev.add(old,new)
+            else:
+                return False
+        return True
+
+    def sub(self,pattern,repl,triggers=None):
+        """
+        Add a rule which substitutes the matches of the regex `pattern` by
+        `repl`, like `re.sub`
+
+        Args:
+            pattern (str): regex
+            repl (str): replacement
+            triggers (str): characters one of which occurs in every match of the regex. If None, the fast path is disabled
+        """
+        self.n_rules+=1
+        self.rules.append(('sub',pattern,repl,None if triggers is None else set(triggers),None))
+        self._fns=None
+        self.stages.append(_RegexStage(pattern,repl,None if triggers is None else set(triggers)))
+
+    def transform(self,fn,triggers=None,count=None,chars=None):
+        """
+        Add a rule which applies the function `fn` to the text
+
+        Args:
+            fn (callable): function from text to text
+            triggers (str): characters without which `fn` returns the text unchanged. If None, the fast path is disabled
+            count (callable): function which counts the places where `fn` changes a text, used for profiling. Optional
+            chars (str): characters which `fn` reads and writes. `fn` must only change the runs of these characters, depending only on the run and on whether it ends the text (e.g. a regex substitution whose matches and replacements consist of these characters). Later replacements which do not involve these characters are merged with the stages before `fn`. If None, no rule is moved across `fn`
+        """
+        self.n_rules+=1
+        self.rules.append(('transform',fn,None,None if triggers is None else set(triggers),count))
+        self._fns=None
+        self.stages.append(_FunctionStage(fn,None if triggers is None else set(triggers),
+                None if chars is None else set(chars)))
+
+    def __getstate__(self):
+        ## the compiled stages are closures, they are rebuilt after unpickling
+        state=dict(self.__dict__)
+        state['_fns']=None
+        state['_trigger_pat']=None
+        return state
+
+    def compile(self):
+        """
+        Compile the stages. This is done automatically the first time the plan
+        is applied after rules have been added.
+        """
+        fns=[ stage.compile() for stage in self.stages ]
+        self._fns=[ fn for fn in fns if fn is not None ]
+
+        triggers=self.triggers()
+        if triggers is None:
+            self._trigger_pat=None
+        elif len(triggers)==0:
+            ## the plan never changes the text
+            self._trigger_pat=re.compile(r'(?!)')
+        else:
+            chars=sorted( t for t in triggers if len(t)==1 )
+            strings=sorted( t for t in triggers if len(t)>1 and set(t).isdisjoint(chars) )
+            ## every alternative starts with a literal, so that the regex engine 
+            ## can skip quickly to the positions where a trigger can start
+            self._trigger_pat=re.compile('|'.join( re.escape(t) for t in strings+chars ))
+
+    def triggers(self):
+        """
+        Get the triggers of the plan, i.e. the characters and strings without 
+        which the plan does not change the text. None if a stage does not declare
+        its trigger characters.
+        """
+        triggers=set()
+        for stage in self.stages:
+            stage_triggers=stage.triggers()
+            if stage_triggers is None:
+                return None
+            triggers.update(stage_triggers)
+        return triggers
+
+    def fast_path_hit_rate(self):
+        """
+        Fraction of the calls to `apply` which returned the text unchanged after
+        a single scan for the trigger characters
+        """
+        return self.n_fast_path/self.n_calls if self.n_calls>0 else 0.0
+
+    def reset_stats(self):
+        """
+        Reset the call counters
+        """
+        self.n_calls=0
+        self.n_fast_path=0
+
+    def n_passes(self):
+        """
+        Number of passes over the text made by the compiled plan
+        """
+        if self._fns is None:
+            self.compile()
+        return len(self._fns)
+
+    def apply(self,text):
+        """
+        Apply the rules to the text
+        """
+        if self._fns is None:
+            self.compile()
+
+        self.n_calls+=1
+        if self._trigger_pat is not None and self._trigger_pat.search(text) is None:
+            self.n_fast_path+=1
+            return text
+
+        for fn in self._fns:
+            text=fn(text)
+        return text
@@ -0,0 +1,86 @@
+#
+#  Copyright (c) 2013-present, Anoop Kunchukuttan
+#  All rights reserved.
+#
+#  This source code is licensed under the MIT license found in the
+#  LICENSE file in the root directory of this source tree.
+#
+
+"""
+Utilities to run the text processing functions of the library over large
+collections of texts using a pool of worker processes.
+
+Work is sent to the workers in chunks (lists of items), so that the cost
+of inter-process communication is amortized over many items.
+"""
+
+import os
+import itertools
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+def get_n_jobs(n_jobs):
+    """
+    Resolve the number of worker processes. `None` or a value less than 1
+    means as many workers as there are CPUs.
+    """
+    if n_jobs is None or n_jobs<1:
+        return os.cpu_count() or 1
+    return n_jobs
+
+def chunked(items,chunksize):
+    """
+    Split an iterable into lists of `chunksize` items. The last list may
+    be shorter.
+    """
+    it=iter(items)
+    while True:
+        chunk=list(itertools.islice(it,chunksize))
+        if len(chunk)==0:
+            return
+        yield chunk
+
+def imap_chunks(fn,chunks,n_jobs=1,initializer=None,initargs=(),ordered=True):
+    """apply a function to each chunk using a pool of worker processes
+
+    At most two chunks per worker are in flight at any time, so the chunks
+    are consumed lazily and memory use is bounded even for very large
+    inputs.
+
+    Args:
+        fn (callable): function applied to each chunk. Must be picklable, i.e. a module level function (or a `functools.partial` of one)
+        chunks (iterable): chunks of work
+        n_jobs (int): number of worker processes. If 1, the chunks are processed in the calling process. See `get_n_jobs`
+        initializer (callable): function called once in every worker process before it processes any chunk
+        initargs (tuple): arguments for `initializer`
+        ordered (bool): if True, results are yielded in the order of the chunks, else as soon as they are available
+
+    Returns:
+        generator: results of `fn` for each chunk
+    """
+    n_jobs=get_n_jobs(n_jobs)
+
+    if n_jobs==1:
+        if initializer is not None:
+            initializer(*initargs)
+        for chunk in chunks:
+            yield fn(chunk)
+        return
+
+    max_pending=2*n_jobs
+    chunks=iter(chunks)
+    with ProcessPoolExecutor(max_workers=n_jobs,initializer=initializer,initargs=initargs) as executor:
+        pending=deque( executor.submit(fn,chunk) for chunk in itertools.islice(chunks,max_pending) )
+        while len(pending)>0:
+            if ordered:
+                done=[pending.popleft()]
+            else:
+                done,_=wait(pending,return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.remove(future)
+
+            for future in done:
+                result=future.result()
+                for chunk in itertools.islice(chunks,1):
+                    pending.append(executor.submit(fn,chunk))
+                yield result
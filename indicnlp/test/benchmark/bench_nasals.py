@@ -0,0 +1,57 @@
+#
+#  Copyright (c) 2013-present, Anoop Kunchukuttan
+#  All rights reserved.
+#
+#  This source code is licensed under the MIT license found in the
+#  LICENSE file in the root directory of this source tree.
+#
+
+"""
+Microbenchmark of the nasal normalization for each nasals_mode and Brahmi
+script: the single pass `_normalize_nasals` against the original regex
+substitution per articulation class, on nasal-dense lines. The outputs are
+checked to be equal. Then the whole normalizer is timed on a document of
+`test_data/tokenize/trivial.txt`, with the rules applied one by one (the
+nasal rule being the per-class substitutions) and with the compiled plan.
+Run with:
+
+    python -m indicnlp.test.benchmark.bench_nasals [n_lines]
+"""
+
+import random
+import sys
+
+from indicnlp.normalize.indic_normalize import IndicNormalizerFactory
+from indicnlp.test.benchmark.bench_normalize import apply_rules, load_lines, best_time
+from indicnlp.test.unit.test_indic_normalize import (
+        BRAHMI_LANGS,
+        NASALS_MODES,
+        ref_nasal_pats,
+        ref_normalize_nasals,
+        nasal_texts,
+    )
+
+def main(n_lines=20000):
+    print('{:4} {:22} {:>24} {:>8} {:>24}'.format('lang','nasals_mode','lines (classes -> single)','passes','document (rules -> plan)'))
+    for lang in BRAHMI_LANGS:
+        lines=list(nasal_texts(lang,random.Random(1),n_lines,60))
+        doc='\n'.join(load_lines(lang,n_lines))
+        for nasals_mode in NASALS_MODES:
+            normalizer=IndicNormalizerFactory().get_normalizer(lang,nasals_mode=nasals_mode)
+            pats=ref_nasal_pats(lang,nasals_mode)
+            assert [ normalizer._normalize_nasals(line) for line in lines ]==[ ref_normalize_nasals(pats,line) for line in lines ]
+
+            ## the rules of the plan, with the per-class substitutions as the nasal rule
+            rules=[ ('transform',lambda text: ref_normalize_nasals(pats,text),None,None,None)
+                        if rule[1]==normalizer._normalize_nasals else rule for rule in normalizer.plan.rules ]
+            assert normalizer.normalize(doc)==apply_rules(rules,doc)
+
+            ref_lines=best_time(lambda: [ ref_normalize_nasals(pats,line) for line in lines ])
+            new_lines=best_time(lambda: [ normalizer._normalize_nasals(line) for line in lines ])
+            ref_doc=best_time(lambda: apply_rules(rules,doc))
+            plan_doc=best_time(lambda: normalizer.normalize(doc))
+            print('{:4} {:22} {:>10.4f}s -> {:.4f}s {:>8} {:>10.3f}s -> {:.3f}s'.format(
+                lang,nasals_mode,ref_lines,new_lines,normalizer.plan.n_passes(),ref_doc,plan_doc))
+
+if __name__ == '__main__':
+    main(*[ int(a) for a in sys.argv[1:] ])
@@ -0,0 +1,84 @@
+#
+#  Copyright (c) 2013-present, Anoop Kunchukuttan
+#  All rights reserved.
+#
+#  This source code is licensed under the MIT license found in the
+#  LICENSE file in the root directory of this source tree.
+#
+
+"""
+Benchmark of the compiled normalization plans against the rules applied one
+after another, as the normalizers did before the plans.
+
+The text is `test_data/tokenize/trivial.txt` transliterated to each language,
+normalized line by line and as a single document. Run with:
+
+    python -m indicnlp.test.benchmark.bench_normalize [n_lines]
+"""
+
+import os
+import re
+import sys
+import time
+
+from indicnlp.normalize.indic_normalize import IndicNormalizerFactory
+from indicnlp.transliterate.unicode_transliterate import UnicodeIndicTransliterator
+
+TEST_DATA_DIR=os.path.join(os.path.dirname(__file__),'..','..','..','test_data')
+
+LANGS=['hi','pa','bn','ta','ml']
+
+CONFIGS=[
+        {},
+        {'nasals_mode':'to_anusvaara_strict'},
+        {'nasals_mode':'to_nasal_consonants'},
+        {'do_normalize_vowel_ending':True},
+    ]
+
+def apply_rules(rules,text):
+    """
+    Apply the rules of a plan one by one
+    """
+    for kind, pattern, repl, _, _ in rules:
+        if kind=='replace':
+            text=text.replace(pattern,repl)
+        elif kind=='sub':
+            text=re.sub(pattern,repl,text)
+        else:
+            text=pattern(text)
+    return text
+
+def load_lines(lang,n_lines):
+    with open(os.path.join(TEST_DATA_DIR,'tokenize','trivial.txt'),encoding='utf-8') as ifile:
+        lines=[ line for line in ifile.read().split('\n') if len(line)>0 ]
+    lines=[ UnicodeIndicTransliterator.transliterate(line,'mr',lang) for line in lines ]
+    return (lines*(n_lines//len(lines)+1))[:n_lines]
+
+def best_time(fn,n_runs=5):
+    times=[]
+    for _ in range(n_runs):
+        start=time.perf_counter()
+        fn()
+        times.append(time.perf_counter()-start)
+    return min(times)
+
+def main(n_lines=20000):
+    print('{:4} {:40} {:>9} {:>22} {:>22}'.format('lang','config','passes','lines (rules -> plan)','document (rules -> plan)'))
+    for lang in LANGS:
+        lines=load_lines(lang,n_lines)
+        doc='\n'.join(lines)
+        for config in CONFIGS:
+            normalizer=IndicNormalizerFactory().get_normalizer(lang,**config)
+            plan=normalizer.plan
+            assert [ plan.apply(line) for line in lines ]==[ apply_rules(plan.rules,line) for line in lines ]
+            assert plan.apply(doc)==apply_rules(plan.rules,doc)
+
+            ref_lines=best_time(lambda: [ apply_rules(plan.rules,line) for line in lines ])
+            plan_lines=best_time(lambda: [ plan.apply(line) for line in lines ])
+            ref_doc=best_time(lambda: apply_rules(plan.rules,doc))
+            plan_doc=best_time(lambda: plan.apply(doc))
+            print('{:4} {:40} {:>4} -> {:<2} {:>9.3f}s -> {:.3f}s {:>9.3f}s -> {:.3f}s'.format(
+                lang,str(config),plan.n_rules,plan.n_passes(),ref_lines,plan_lines,ref_doc,plan_doc))
+
+if __name__ == '__main__':
+    main(*[ int(a) for a in sys.argv[1:] ])
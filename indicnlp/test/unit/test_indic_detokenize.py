@@ -0,0 +1,125 @@
+#
+#  Copyright (c) 2013-present, Anoop Kunchukuttan
+#  All rights reserved.
+#
+#  This source code is licensed under the MIT license found in the
+#  LICENSE file in the root directory of this source tree.
+#
+
+"""
+Conformance of the detokenizer with the original implementation of
+`trivial_detokenize`, which attached the quotes in one pass per quote
+character and is kept below as the reference.
+"""
+
+import os
+import random
+import re
+import unittest
+
+from indicnlp.tokenize import indic_detokenize
+from indicnlp.tokenize import indic_tokenize
+
+TEST_DATA_DIR=os.path.join(os.path.dirname(__file__),'..','..','..','test_data')
+
+### reference implementation (before the single scan quote attachment)
+ref_la=re.compile(r'[ ]([!%)\]},.:;>?।॥])')
+ref_ra=re.compile(r'([#$(\[{<@])[ ]')
+ref_lra=re.compile(r'[ ]([-/\\])[ ]')
+ref_num_seq=re.compile(r'([0-9]+ [,.:/] )+[0-9]+')
+
+def ref_detokenize(s):
+    new_s=''
+    prev=0
+    for m in ref_num_seq.finditer(s):
+        start=m.start()
+        end=m.end()
+        if start>prev:
+            new_s=new_s+s[prev:start]
+            new_s=new_s+s[start:end].replace(' ','')
+            prev=end
+    s=new_s+s[prev:]
+
+    s=ref_lra.sub('\\1',s)
+    s=ref_la.sub('\\1',s)
+    s=ref_ra.sub('\\1',s)
+
+    for punc in '\'"`':
+        cnt=0
+        out_str=[]
+        for c in s:
+            if c==punc:
+                out_str.append('@RA' if cnt%2==0 else '@LA')
+                cnt+=1
+            else:
+                out_str.append(c)
+        s=''.join(out_str).replace('@RA ',punc).replace(' @LA',punc).replace('@RA',punc).replace('@LA',punc)
+    return s
+
+## tokens used to generate random tokenized texts: quotes, words, number
+## sequences and punctuations of each attachment. The letters of the
+## markers '@RA' and '@LA' are left out, see `test_markers`
+FUZZ_TOKENS=['\'','\'','"','"','`','क','ख','a','1','23','.',',',':','/','-','\\',
+             '(',')','[','<','@','#','!','?','।','%',' ','\n']
+
+def fuzz_texts(rng,n,max_len=20):
+    for _ in range(n):
+        yield ' '.join( rng.choice(FUZZ_TOKENS) for _ in range(rng.randint(0,max_len)) )
+
+class TrivialDetokenizeTest(unittest.TestCase):
+
+    def assert_same(self,text):
+        self.assertEqual(indic_detokenize.trivial_detokenize(text),ref_detokenize(text),msg=repr(text))
+
+    def test_test_data(self):
+        with open(os.path.join(TEST_DATA_DIR,'tokenize','trivial.txt'),encoding='utf-8') as ifile:
+            for line in ifile:
+                self.assert_same(' '.join(indic_tokenize.trivial_tokenize(line)))
+
+    def test_quotes(self):
+        for text in ['" a "','\' a \' " b "','" \' a \' "','` ` a \' \'','" " "','a "',
+                     '" a " b " c','\' " \' "','( " a " )','" - "','" 1 , 2 "']:
+            self.assert_same(text)
+
+    def test_random(self):
+        rng=random.Random(1)
+        for text in fuzz_texts(rng,20000):
+            self.assert_same(text)
+
+    def test_markers(self):
+        ## the reference marks the quotes with '@RA' and '@LA', and also
+        ## turned these strings into quotes where they occurred in the text
+        for text, expected, ref_expected in [
+                    ('ab@RA cd','ab@RA cd','ab\'cd'),
+                    ('mail @ RA \' x \'','mail @RA \'x\'','mail \'\'x\''),
+                    ('" @LA "','"@LA"','"\'"'),
+                ]:
+            self.assertEqual(indic_detokenize.trivial_detokenize(text),expected)
+            self.assertEqual(ref_detokenize(text),ref_expected)
+
+class DetokenizeBatchTest(unittest.TestCase):
+
+    def assert_same(self,texts):
+        self.assertEqual(indic_detokenize.detokenize_batch(texts),
+                         [ indic_detokenize.trivial_detokenize(text) for text in texts ],msg=repr(texts))
+
+    def test_edge_cases(self):
+        for texts in [[],[''],['',''],['" a'],['" a','b "'],['1 ,','2'],['1 , 2','" x " 3 . 4']]:
+            self.assert_same(texts)
+
+    def test_separator(self):
+        ## texts containing the separator are not split at it
+        sep=indic_detokenize.BATCH_SEP
+        for texts in [[sep],['a '+sep+' "','" b'],['" a','b '+sep+' "'],['1 , '+sep+' 2'],['1 ,',sep+' 2']]:
+            self.assert_same(texts)
+
+    def test_random(self):
+        rng=random.Random(1)
+        for i in range(2000):
+            texts=list(fuzz_texts(rng,rng.randint(1,10)))
+            if i%10==0:
+                texts[rng.randrange(len(texts))]+=' '+indic_detokenize.BATCH_SEP
+            self.assert_same(texts)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,231 @@
+#
+#  Copyright (c) 2013-present, Anoop Kunchukuttan
+#  All rights reserved.
+#
+#  This source code is licensed under the MIT license found in the
+#  LICENSE file in the root directory of this source tree.
+#
+
+"""
+Tests of the script normalizers. The nasal normalization is compared with the
+original implementation, one regex substitution per articulation class, which
+is kept below as the reference.
+"""
+
+import random
+import re
+import threading
+import unittest
+from unittest import mock
+
+from indicnlp import langinfo
+from indicnlp.normalize.indic_normalize import IndicNormalizerFactory, StreamingNormalizer
+
+## one language per script
+BRAHMI_LANGS=['hi','pa','gu','bn','or','ta','te','kn','ml']
+
+NASALS_MODES=['to_anusvaara_strict','to_anusvaara_relaxed','to_nasal_consonants']
+
+### reference implementation (before the single pass nasal normalization)
+PAT_SIGNATURES=[
+        [0x19,0x15,0x18],
+        [0x1e,0x1a,0x1d],
+        [0x23,0x1f,0x22],
+        [0x28,0x24,0x27],
+        [0x29,0x24,0x27],
+        [0x2e,0x2a,0x2d],
+    ]
+
+def ref_nasal_pats(lang,nasals_mode):
+    """
+    The list of (pattern, replacement) substituted one after another
+    """
+    c=lambda offset: langinfo.offset_to_char(offset,lang)
+    halant=c(0x4d)
+    anusvaara=c(0x02)
+    if nasals_mode=='to_anusvaara_strict':
+        return [ (re.compile(r'{}{}([{}-{}])'.format(c(s[0]),halant,c(s[1]),c(s[2]))),anusvaara+'\\1')
+                    for s in PAT_SIGNATURES ]
+    elif nasals_mode=='to_anusvaara_relaxed':
+        nasals_list_str=','.join([ c(x) for x in [0x19,0x1e,0x23,0x28,0x29,0x2e] ])
+        return [ (re.compile(r'[{}]{}'.format(nasals_list_str,halant)),anusvaara) ]
+    elif nasals_mode=='to_nasal_consonants':
+        return [ (re.compile(r'{}([{}-{}])'.format(anusvaara,c(s[1]),c(s[2]))),c(s[0])+halant+'\\1')
+                    for s in PAT_SIGNATURES ]
+    return []
+
+def ref_normalize_nasals(pats,text):
+    for pat, repl in pats:
+        text=pat.sub(repl,text)
+    return text
+
+def nasal_texts(lang,rng,n,max_len=20):
+    """
+    Random texts of the nasals, halant, anusvaara, consonants and a few other
+    characters of the script, so that the nasal patterns are frequent
+    """
+    chars=[ langinfo.offset_to_char(o,lang) for o in [0x02,0x4d,0x4d,0x3c]+list(range(0x15,0x3a)) ]
+    chars+=[' ',',','a']
+    for _ in range(n):
+        yield ''.join( rng.choice(chars) for _ in range(rng.randint(0,max_len)) )
+
+class NasalsTest(unittest.TestCase):
+
+    def test_nasals(self):
+        rng=random.Random(1)
+        for lang in BRAHMI_LANGS:
+            for nasals_mode in NASALS_MODES:
+                normalizer=IndicNormalizerFactory().get_normalizer(lang,nasals_mode=nasals_mode)
+                pats=ref_nasal_pats(lang,nasals_mode)
+                for text in nasal_texts(lang,rng,3000):
+                    self.assertEqual(normalizer._normalize_nasals(text),ref_normalize_nasals(pats,text),
+                                     msg='{!r} ({}, {})'.format(text,lang,nasals_mode))
+
+    def test_count_nasals(self):
+        rng=random.Random(1)
+        for lang in BRAHMI_LANGS:
+            for nasals_mode in NASALS_MODES:
+                normalizer=IndicNormalizerFactory().get_normalizer(lang,nasals_mode=nasals_mode)
+                pats=ref_nasal_pats(lang,nasals_mode)
+                for text in nasal_texts(lang,rng,300):
+                    expected=0
+                    out=text
+                    for pat, repl in pats:
+                        out, n=pat.subn(repl,out)
+                        expected+=n
+                    self.assertEqual(normalizer._count_nasals(text),expected,msg='{!r} ({}, {})'.format(text,lang,nasals_mode))
+
+    def test_nasal_chars(self):
+        ## the rules of the plan which do not involve the nasal characters are
+        ## merged with the stages before the nasal function
+        for lang in ['ta','te','gu']:
+            for nasals_mode in NASALS_MODES:
+                normalizer=IndicNormalizerFactory().get_normalizer(lang,nasals_mode=nasals_mode)
+                self.assertEqual(normalizer.plan.n_passes(),IndicNormalizerFactory().get_normalizer(lang).plan.n_passes()+1)
+
+## normalizer flags whose rules involve word boundaries: the vowel ending is
+## added before a space and at the end of the text, and the Gurmukhi addak
+## doubles the next character, which may be a space
+STREAMING_CONFIGS=[
+        ('hi',{}),
+        ('hi',{'do_normalize_vowel_ending':True,'nasals_mode':'to_anusvaara_strict'}),
+        ('ta',{'do_normalize_vowel_ending':True}),
+        ('ml',{'do_normalize_vowel_ending':True,'nasals_mode':'to_nasal_consonants'}),
+        ('pa',{'do_canonicalize_addak':True}),
+        ('pa',{'do_canonicalize_addak':True,'do_normalize_vowel_ending':True,'do_canonicalize_tippi':True}),
+    ]
+
+def streaming_texts(lang,rng,n,max_len=40):
+    """
+    Random texts of characters of the script (including the addak for
+    Gurmukhi), whitespace, characters replaced by a space or by ' - ', and
+    punctuations of the rules
+    """
+    chars=[ langinfo.offset_to_char(o,lang) for o in [0x02,0x3e,0x4d,0x71]+list(range(0x15,0x3a)) ]
+    chars+=[' ',' ','  ','\n','\t','\r\n','\u200b','\u00a0','\u2014',':','|',"'",'a']
+    for _ in range(n):
+        yield ''.join( rng.choice(chars) for _ in range(rng.randint(0,max_len)) )
+
+class StreamingNormalizerTest(unittest.TestCase):
+
+    def assert_same(self,normalizer,chunks):
+        streaming_normalizer=StreamingNormalizer(normalizer)
+        self.assertEqual(''.join(streaming_normalizer.normalize_chunks(chunks)),normalizer.normalize(''.join(chunks)),
+                         msg=repr(chunks))
+
+    def test_splits(self):
+        rng=random.Random(1)
+        for lang, kwargs in STREAMING_CONFIGS:
+            normalizer=IndicNormalizerFactory().get_normalizer(lang,**kwargs)
+            for text in streaming_texts(lang,rng,500):
+                ## at every whitespace character, inside the words, at random
+                ## positions, and character by character
+                self.assert_same(normalizer,re.split(r'(?<=\s)',text))
+                self.assert_same(normalizer,re.split(r'(?<=\S)(?=\S)',text))
+                cuts=sorted( rng.randint(0,len(text)) for _ in range(rng.randint(0,8)) )
+                self.assert_same(normalizer,[ text[s:e] for s, e in zip([0]+cuts,cuts+[len(text)]) ])
+                self.assert_same(normalizer,list(text))
+
+    def test_word_end(self):
+        ## a chunk which ends with a consonant or an addak is not the end of the text
+        for lang, kwargs, chunks in [
+                    ('hi',{'do_normalize_vowel_ending':True},['क','ख ग','']),
+                    ('ta',{'do_normalize_vowel_ending':True},['க','\n','க ']),
+                    ('pa',{'do_canonicalize_addak':True},['ਕ\u0a71','ਕ \u0a71',' ਖ']),
+                ]:
+            self.assert_same(IndicNormalizerFactory().get_normalizer(lang,**kwargs),chunks)
+
+    def test_reuse(self):
+        normalizer=IndicNormalizerFactory().get_normalizer('hi',do_normalize_vowel_ending=True)
+        streaming_normalizer=StreamingNormalizer(normalizer)
+        for text in ['क ख','ग घ ']:
+            self.assertEqual(streaming_normalizer.normalize(text)+streaming_normalizer.flush(),normalizer.normalize(text))
+
+class FactoryCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        IndicNormalizerFactory().clear_cache()
+
+    def tearDown(self):
+        IndicNormalizerFactory().clear_cache()
+
+    def test_hits_and_misses(self):
+        factory=IndicNormalizerFactory()
+        normalizer=factory.get_normalizer('hi',remove_nuktas=True,nasals_mode='to_anusvaara_strict')
+        self.assertEqual(factory.cache_info(),{'hits':0,'misses':1,'evictions':0,'size':1})
+
+        ## the key does not depend on the order of the arguments, and the
+        ## cache is shared by the factory instances
+        self.assertIs(IndicNormalizerFactory().get_normalizer('hi',nasals_mode='to_anusvaara_strict',remove_nuktas=True),normalizer)
+        self.assertEqual(factory.cache_info(),{'hits':1,'misses':1,'evictions':0,'size':1})
+
+        ## other arguments or language
+        for language, kwargs in [('hi',{}),('hi',{'remove_nuktas':True}),('mr',{'remove_nuktas':True,'nasals_mode':'to_anusvaara_strict'})]:
+            other=factory.get_normalizer(language,**kwargs)
+            self.assertIsNot(other,normalizer)
+            self.assertEqual(other.lang,language)
+            self.assertEqual(other.remove_nuktas,kwargs.get('remove_nuktas',False))
+        self.assertEqual(factory.cache_info(),{'hits':1,'misses':4,'evictions':0,'size':4})
+
+    def test_eviction(self):
+        factory=IndicNormalizerFactory()
+        with mock.patch.object(IndicNormalizerFactory,'CACHE_SIZE',2):
+            hi=factory.get_normalizer('hi')
+            pa=factory.get_normalizer('pa')
+            self.assertIs(factory.get_normalizer('hi'),hi)
+            ## 'pa' is the least recently used
+            factory.get_normalizer('gu')
+            self.assertEqual(factory.cache_info(),{'hits':1,'misses':3,'evictions':1,'size':2})
+            self.assertIs(factory.get_normalizer('hi'),hi)
+            self.assertIsNot(factory.get_normalizer('pa'),pa)
+            self.assertEqual(factory.cache_info(),{'hits':2,'misses':4,'evictions':2,'size':2})
+
+    def test_clear_cache(self):
+        factory=IndicNormalizerFactory()
+        normalizer=factory.get_normalizer('ta')
+        factory.get_normalizer('ta')
+        factory.clear_cache()
+        self.assertEqual(factory.cache_info(),{'hits':0,'misses':0,'evictions':0,'size':0})
+        self.assertIsNot(factory.get_normalizer('ta'),normalizer)
+        self.assertEqual(factory.cache_info(),{'hits':0,'misses':1,'evictions':0,'size':1})
+
+    def test_threads(self):
+        ## the normalizer may be created by several threads, but one instance is kept
+        factory=IndicNormalizerFactory()
+        normalizers=[]
+        barrier=threading.Barrier(8)
+        def get():
+            barrier.wait()
+            normalizers.append(factory.get_normalizer('bn',do_normalize_vowel_ending=True))
+        threads=[ threading.Thread(target=get) for _ in range(8) ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(set(map(id,normalizers))),1)
+        info=factory.cache_info()
+        self.assertEqual(info['hits']+info['misses'],8)
+        self.assertEqual(info['size'],1)
+
+if __name__ == '__main__':
+    unittest.main()
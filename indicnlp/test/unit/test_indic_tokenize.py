@@ -0,0 +1,135 @@
+#
+#  Copyright (c) 2013-present, Anoop Kunchukuttan
+#  All rights reserved.
+#
+#  This source code is licensed under the MIT license found in the
+#  LICENSE file in the root directory of this source tree.
+#
+
+"""
+Conformance of the single scan tokenizer with the original implementation
+of `trivial_tokenize`, which is kept below as the reference.
+"""
+
+import os
+import random
+import re
+import string
+import unittest
+
+from indicnlp.tokenize import indic_tokenize
+
+TEST_DATA_DIR=os.path.join(os.path.dirname(__file__),'..','..','..','test_data')
+
+### reference implementation (before the single scan tokenizer)
+ref_indic_pat=re.compile(r'(['+string.punctuation+r'\u0964\u0965\uAAF1\uAAF0\uABEB\uABEC\uABED\uABEE\uABEF\u1C7E\u1C7F'+r'])')
+ref_urdu_pat=re.compile(r'(['+string.punctuation+r'\u0609\u060A\u060C\u061E\u066A\u066B\u066C\u066D\u06D4'+r'])')
+ref_num_seq=re.compile(r'([0-9]+ [,.:/] )+[0-9]+')
+
+def ref_tokenize_indic(text):
+    tok_str=ref_indic_pat.sub(r' \1 ',text.replace('\t',' '))
+    s=re.sub(r'[ ]+',' ',tok_str).strip(' ')
+
+    new_s=''
+    prev=0
+    for m in ref_num_seq.finditer(s):
+        start=m.start()
+        end=m.end()
+        if start>prev:
+            new_s=new_s+s[prev:start]
+            new_s=new_s+s[start:end].replace(' ','')
+            prev=end
+    new_s=new_s+s[prev:]
+    return new_s.split(' ')
+
+def ref_tokenize_urdu(text):
+    tok_str=ref_urdu_pat.sub(r' \1 ',text.replace('\t',' '))
+    return re.sub(r'[ ]+',' ',tok_str).strip(' ').split(' ')
+
+def ref_tokenize(text,lang):
+    return ref_tokenize_urdu(text) if lang=='ur' else ref_tokenize_indic(text)
+
+## characters used to generate random texts: letters, digits, spaces and
+## punctuations of both paths, so that number sequences are frequent
+FUZZ_CHARS=['क','ा','्','a','Z','ب','ی','0','1','9','२',' ',' ','  ','\t','\n',
+            '.',',',':','/','-','?','"','\u0964','\u0965','\u06d4','\u060c','\u066b']
+
+class TrivialTokenizeTest(unittest.TestCase):
+
+    def assert_same(self,text,lang):
+        self.assertEqual(indic_tokenize.trivial_tokenize(text,lang),ref_tokenize(text,lang),
+                         msg='{!r} ({})'.format(text,lang))
+
+    def test_test_data(self):
+        with open(os.path.join(TEST_DATA_DIR,'tokenize','trivial.txt'),encoding='utf-8') as ifile:
+            text=ifile.read()
+        for lang in ['hi','ur']:
+            self.assert_same(text,lang)
+            for line in text.split('\n'):
+                self.assert_same(line,lang)
+
+    def test_num_seqs(self):
+        for text in ['12 / 06 / 2014 को',
+                     '12/06/2014 को',
+                     'तारीख 12 / 06 / 2014 को 3 . 5 %',
+                     '  1 , 2 , 3 और 4 : 5',
+                     '1.2.3',
+                     'धारा 3 . 2 . 1 ( क )',
+                     '12\t:\t30 बजे',
+                     'a1 . 2',
+                     ]:
+            for lang in ['hi','ur']:
+                self.assert_same(text,lang)
+
+    def test_empty(self):
+        for text in ['',' ','\t \t']:
+            for lang in ['hi','ur']:
+                self.assert_same(text,lang)
+
+    def test_random(self):
+        rng=random.Random(1)
+        for _ in range(20000):
+            text=''.join( rng.choice(FUZZ_CHARS) for _ in range(rng.randint(0,25)) )
+            for lang in ['hi','ur']:
+                self.assert_same(text,lang)
+
+class IterTokensTest(unittest.TestCase):
+
+    def assert_same(self,pieces,lang):
+        self.assertEqual(list(indic_tokenize.iter_tokens(pieces,lang)),
+                         indic_tokenize.trivial_tokenize(''.join(pieces),lang),
+                         msg='{!r} ({})'.format(pieces,lang))
+
+    def test_long_token(self):
+        for pieces in [['क']*1000,['1','2 ',', ','3']*200,['1 . 2'*300,' ab'],['a\t']+['ब']*500+['۔']]:
+            for lang in ['hi','ur']:
+                self.assert_same(pieces,lang)
+
+    def test_random(self):
+        rng=random.Random(1)
+        for _ in range(10000):
+            text=''.join( rng.choice(FUZZ_CHARS) for _ in range(rng.randint(0,25)) )
+            cuts=sorted( rng.randint(0,len(text)) for _ in range(rng.randint(0,10)) )
+            pieces=[ text[s:e] for s, e in zip([0]+cuts,cuts+[len(text)]) ]
+            for lang in ['hi','ur']:
+                self.assert_same(pieces,lang)
+
+class TokenizeWithOffsetsTest(unittest.TestCase):
+
+    def test_offsets(self):
+        text='तारीख 12 / 06 / 2014 को, a b।'
+        spans=indic_tokenize.trivial_tokenize_with_offsets(text)
+        self.assertEqual([ t for t, _, _ in spans ],indic_tokenize.trivial_tokenize(text))
+        for token, start, end in spans:
+            self.assertEqual(text[start:end].replace(' ',''),token)
+
+    def test_slice(self):
+        spans=indic_tokenize.trivial_tokenize_with_offsets('a b c')
+        self.assertIsInstance(spans[0:2],indic_tokenize.TokenSpans)
+        self.assertEqual(list(spans[0:2]),[('a',0,1),('b',2,3)])
+        self.assertEqual(list(spans[::-2]),[('c',4,5),('a',0,1)])
+        self.assertEqual(len(spans[5:]),0)
+        self.assertEqual(spans[-1],('c',4,5))
+
+if __name__ == '__main__':
+    unittest.main()
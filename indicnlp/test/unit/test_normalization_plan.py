@@ -0,0 +1,115 @@
+#
+#  Copyright (c) 2013-present, Anoop Kunchukuttan
+#  All rights reserved.
+#
+#  This source code is licensed under the MIT license found in the
+#  LICENSE file in the root directory of this source tree.
+#
+
+"""
+Equivalence of a compiled `NormalizationPlan` with applying its rules one
+after another, in the order in which they were added.
+"""
+
+import random
+import re
+import unittest
+
+from indicnlp import langinfo
+from indicnlp.normalize.indic_normalize import IndicNormalizerFactory, SUPPORTED_LANGUAGES
+from indicnlp.normalize.normalization_plan import NormalizationPlan
+
+def apply_rules(rules,text):
+    """
+    Reference: apply the rules of a plan one by one
+    """
+    for kind, pattern, repl, _, _ in rules:
+        if kind=='replace':
+            text=text.replace(pattern,repl)
+        elif kind=='sub':
+            text=re.sub(pattern,repl,text)
+        else:
+            text=pattern(text)
+    return text
+
+def random_texts(rng,chars,n,max_len=20):
+    for _ in range(n):
+        yield ''.join( rng.choice(chars) for _ in range(rng.randint(0,max_len)) )
+
+class NormalizationPlanTest(unittest.TestCase):
+
+    def assert_plan(self,plan,texts):
+        for text in texts:
+            self.assertEqual(plan.apply(text),apply_rules(plan.rules,text),
+                             msg='{!r} {!r}'.format(text,[ r[:3] for r in plan.rules ]))
+
+    def make_plan(self,rules):
+        plan=NormalizationPlan()
+        for old, new in rules:
+            plan.replace(old,new)
+        return plan
+
+    def test_pattern_creating_pairs(self):
+        rng=random.Random(1)
+        for rules in [
+                    [('’',"'"),("''",'"')],
+                    [('´',"'"),('’',"'"),("''",'"'),('´´','"')],
+                    [("''",'"'),('’',"'")],
+                    [('a','b'),('bb','c')],
+                    [('ab','c'),('c','a'),('aa','d')],
+                    [('a',''),('bc','d')],
+                    [('ab','ba'),('ba','x')],
+                    [('a','bc'),('b','c'),('cc','a')],
+                    [('aba','x'),('ab','y')],
+                    [('a','aa'),('aa','b')],
+                ]:
+            chars=sorted(set( c for old, new in rules for c in old+new ))+['z']
+            self.assert_plan(self.make_plan(rules),random_texts(rng,chars,2000))
+
+    def test_malayalam_chillus(self):
+        rng=random.Random(1)
+        chars=['ണ','ന','ര','ക','്','‍','‌','ൺ','ൿ','െ','ാ','ൗ',':',' ']
+        for kwargs in [{},{'do_canonicalize_chillus':True},{'do_canonicalize_chillus':True,'do_correct_geminated_T':True}]:
+            normalizer=IndicNormalizerFactory().get_normalizer('ml',**kwargs)
+            texts=['ണ്‍','ണ്‍‍','ണ‍്‍','ൺ‍']
+            self.assert_plan(normalizer.plan,texts+list(random_texts(rng,chars,3000)))
+
+    def test_random_plans(self):
+        rng=random.Random(1)
+        alphabet='abcd'
+        strings=['','a','b','c','d','aa','ab','ba','abc','cab','bb','cd','dc','dd']
+        for _ in range(3000):
+            plan=NormalizationPlan()
+            for _ in range(rng.randint(1,6)):
+                r=rng.random()
+                if r<0.1:
+                    plan.sub('a+b','c',triggers='a')
+                elif r<0.15:
+                    plan.transform(lambda text: text[::-1],triggers=None)
+                elif r<0.25:
+                    ## changes only the runs of 'a' and 'b'
+                    plan.transform(lambda text: text.replace('ab','b'),triggers='a',chars='ab')
+                else:
+                    plan.replace(rng.choice(strings[1:]),rng.choice(strings))
+            ## long enough for the stages to look up their patterns with `in`
+            self.assert_plan(plan,random_texts(rng,alphabet,10,40))
+
+    def test_normalizers(self):
+        rng=random.Random(1)
+        for lang in SUPPORTED_LANGUAGES:
+            if lang=='ur':
+                continue
+            for kwargs in [{},{'remove_nuktas':True,'nasals_mode':'to_anusvaara_relaxed','do_normalize_chandras':True,'do_normalize_vowel_ending':True},
+                           {'nasals_mode':'to_anusvaara_strict'},{'nasals_mode':'to_nasal_consonants','do_normalize_vowel_ending':True}]:
+                normalizer=IndicNormalizerFactory().get_normalizer(lang,**kwargs)
+                base=langinfo.SCRIPT_RANGES[lang][0]
+                chars=set( chr(base+o) for o in range(0x80) )
+                for kind, pattern, repl, _, _ in normalizer.plan.rules:
+                    if kind=='replace':
+                        chars.update(pattern+repl)
+                chars=sorted(chars)+[' ',':','‍','‌']
+                self.assert_plan(normalizer.plan,random_texts(rng,chars,500,30))
+                self.assert_plan(normalizer.plan,random_texts(rng,chars,20,2000))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,287 @@
+#
+#  Copyright (c) 2013-present, Anoop Kunchukuttan
+#  All rights reserved.
+#
+#  This source code is licensed under the MIT license found in the
+#  LICENSE file in the root directory of this source tree.
+#
+
+"""
+Conformance of the sentence splitter with the original implementation of
+`sentence_split`, which is kept below as the reference.
+"""
+
+import io
+import random
+import re
+import unittest
+from unittest import mock
+
+from indicnlp import langinfo
+from indicnlp import urdu
+from indicnlp.common import IndicNlpException
+from indicnlp.tokenize import sentence_tokenize
+from indicnlp.transliterate.unicode_transliterate import UnicodeIndicTransliterator
+
+### reference implementation (before the streaming sentence splitter)
+ref_latin_or_numeric=re.compile(r'^[a-zA-Z0-9_-]$')
+
+def ref_is_latin_or_numeric(c):
+    return ref_latin_or_numeric.match(c) is not None
+
+def ref_is_acronym_abbvr(text,lang):
+    return UnicodeIndicTransliterator.transliterate(text,lang,'hi') in sentence_tokenize.NON_BREAKING_PHRASES_HI
+
+def ref_sentence_split(text,lang,delim_pat='auto'):
+    if delim_pat=='auto':
+        if langinfo.is_danda_delim(lang) and sentence_tokenize.CONTAINS_DANDA.search(text) is not None:
+            delim_pat=sentence_tokenize.DELIM_PAT_DANDA
+        else:
+            delim_pat=sentence_tokenize.DELIM_PAT_NO_DANDA
+
+    ### Phase 1: break on sentence delimiters.
+    cand_sentences=[]
+    begin=0
+    text=text.strip()
+    for mo in delim_pat.finditer(text):
+        p1=mo.start()
+        if p1>0 and text[p1-1].isnumeric():
+            continue
+        ## changed: text[p1-1] was the last character of the text for p1==0
+        if lang!='en' and p1>0:
+            if ref_is_latin_or_numeric(text[p1-1]):
+                if p1+1<len(text) and ref_is_latin_or_numeric(text[p1+1]):
+                    continue
+        s=text[begin:p1+1].strip()
+        if len(s)>0:
+            cand_sentences.append(s)
+        begin=p1+1
+    s=text[begin:].strip()
+    if len(s)>0:
+        cand_sentences.append(s)
+
+    if not delim_pat.search('.'):
+        return cand_sentences
+
+    ### Phase 2: merge the sentences broken at non-breaking phrases
+    final_sentences=[]
+    sen_buffer=''
+    bad_state=False
+    for sentence in cand_sentences:
+        words=sentence.split(' ')
+        if len(words)==1 and sentence[-1]=='.':
+            bad_state=True
+            sen_buffer=sen_buffer+' '+sentence
+        elif sentence[-1]=='.' and ref_is_acronym_abbvr(words[-1][:-1],lang):
+            if len(sen_buffer)>0 and not bad_state:
+                final_sentences.append(sen_buffer)
+                sen_buffer=sentence
+            else:
+                sen_buffer=sen_buffer+' '+sentence
+            bad_state=True
+        elif bad_state:
+            sen_buffer=sen_buffer+' '+sentence
+            if len(sen_buffer)>0:
+                final_sentences.append(sen_buffer)
+            sen_buffer=''
+            bad_state=False
+        else:
+            if len(sen_buffer)>0:
+                final_sentences.append(sen_buffer)
+            sen_buffer=sentence
+            bad_state=False
+    if len(sen_buffer)>0:
+        final_sentences.append(sen_buffer)
+
+    return [ re.sub(' +',' ',s.strip()) for s in final_sentences ]
+
+## pieces used to generate random texts: delimiters, spaces, Latin letters,
+## digits, domains and non-breaking phrases
+FUZZ_PIECES=['.','.',' ','  ','\n','?','!','।','a','b','1','x.y','-',
+             'क','ए','डॉ','श्री','அ','ক']
+
+FUZZ_LANGS=['hi','mr','ta','bn','en']
+
+def fuzz_texts(rng,n,max_len=25):
+    for _ in range(n):
+        yield ''.join( rng.choice(FUZZ_PIECES) for _ in range(rng.randint(0,max_len)) )
+
+class SentenceSplitTest(unittest.TestCase):
+
+    def assert_same(self,text,lang):
+        self.assertEqual(sentence_tokenize.sentence_split(text,lang),ref_sentence_split(text,lang),
+                         msg='{!r} ({})'.format(text,lang))
+
+    def test_text_start(self):
+        ## a delimiter at the start of the text has no character before it,
+        ## whatever the last character of the text
+        for text, expected in [('.a b c d',['. a b c d']),
+                               ('  .a b c d 1 ',['. a b c d 1']),
+                               ('.a b c ड',['. a b c ड']),
+                               ('\n?a b। c',['?','a b।','c']),
+                               ('.',['.']),
+                               ('1.a',['1.a'])]:
+            self.assertEqual(sentence_tokenize.sentence_split(text,'ta'),expected)
+            self.assertEqual(list(sentence_tokenize.iter_sentences(text,'ta')),expected)
+            self.assert_same(text,'ta')
+
+    def test_random(self):
+        rng=random.Random(1)
+        for text in fuzz_texts(rng,5000):
+            for lang in FUZZ_LANGS:
+                self.assert_same(text,lang)
+
+class NonBreakingPhrasesTest(unittest.TestCase):
+
+    LANGS=['bn','ta','gu']
+
+    def test_phrases(self):
+        ## the phrases of each script are the strings which transliterate to
+        ## a Devanagari phrase, as checked by the original splitter
+        for lang in self.LANGS:
+            phrases=sentence_tokenize.get_non_breaking_phrases(lang)
+            for phrase in phrases:
+                self.assertTrue(ref_is_acronym_abbvr(phrase,lang),msg='{!r} ({})'.format(phrase,lang))
+            for hi_phrase in sentence_tokenize.NON_BREAKING_PHRASES_HI:
+                phrase=UnicodeIndicTransliterator.transliterate(hi_phrase,'hi',lang)
+                self.assertEqual(phrase in phrases,ref_is_acronym_abbvr(phrase,lang),msg='{!r} ({})'.format(phrase,lang))
+
+    def test_abbreviations(self):
+        hi_sentences=['डॉ. राम आए.','श्री. मोहन गए.','क. ख. ग. वे गए.']
+        for lang in self.LANGS:
+            sentences=[ UnicodeIndicTransliterator.transliterate(s,'hi',lang) for s in hi_sentences ]
+            text=' '.join(sentences)
+            self.assertEqual(sentence_tokenize.sentence_split(text,lang),sentences,msg=lang)
+            self.assertEqual(ref_sentence_split(text,lang),sentences,msg=lang)
+
+    def test_random(self):
+        rng=random.Random(1)
+        for lang in self.LANGS:
+            for text in fuzz_texts(rng,2000):
+                text=UnicodeIndicTransliterator.transliterate(text,'hi',lang)
+                self.assertEqual(sentence_tokenize.sentence_split(text,lang),ref_sentence_split(text,lang),
+                                 msg='{!r} ({})'.format(text,lang))
+
+## pieces of random Urdu texts: words, words which end a sentence,
+## conjunctions, full stops, question marks, commas and spaces
+URDU_FUZZ_PIECES=['کتاب','اچھی','ہے','تھا','گا','اور','کہ','۔','۔','؟','،','a','1',' ',' ','  ','\n','\t']
+
+class SpansTest(unittest.TestCase):
+
+    def setUp(self):
+        self.backend=urdu._backend
+        urdu.set_backend('python')
+
+    def tearDown(self):
+        urdu.set_backend(self.backend)
+
+    def assert_spans(self,text,lang):
+        sentences=sentence_tokenize.sentence_split(text,lang)
+        spans=sentence_tokenize.sentence_split_spans(text,lang)
+        msg='{!r} ({})'.format(text,lang)
+        self.assertEqual(len(spans),len(sentences),msg=msg)
+        prev_end=0
+        for (start,end), sentence in zip(spans,sentences):
+            self.assertLessEqual(prev_end,start,msg=msg)
+            prev_end=end
+            span=text[start:end]
+            self.assertEqual(span,span.strip(),msg=msg)
+            if lang=='ur':
+                self.assertEqual(' '.join(span.split()),sentence,msg=msg)
+            else:
+                ## the whitespace is normalized, and merged parts are joined by a space
+                self.assertEqual(re.sub(r'\s+','',span),re.sub(r'\s+','',sentence),msg=msg)
+
+    def test_random(self):
+        rng=random.Random(1)
+        for text in fuzz_texts(rng,3000):
+            for lang in FUZZ_LANGS:
+                self.assert_spans(text,lang)
+
+    def test_urdu(self):
+        for text in ['یہ کتاب اچھی ہے۔ وہ کتاب اچھی تھی۔',
+                     '  یہ کتاب\nاچھی ہے اور وہ   کتاب اچھی تھی؟ہاں۔',
+                     'کتاب۔کتاب اچھی ہے',
+                     '']:
+            self.assert_spans(text,'ur')
+        rng=random.Random(1)
+        for _ in range(5000):
+            text=''.join( rng.choice(URDU_FUZZ_PIECES) for _ in range(rng.randint(0,30)) )
+            self.assert_spans(text,'ur')
+
+    def test_urdu_not_found(self):
+        ## the search for a sentence stops at the end of the text
+        with mock.patch.object(urdu,'sentence_split',return_value=['کتاب اچھی','نہیں ہے']):
+            with self.assertRaises(IndicNlpException):
+                sentence_tokenize.sentence_split_spans('کتاب اچھی ہے۔','ur')
+
+class SentenceSplitBatchTest(unittest.TestCase):
+
+    def docs(self):
+        rng=random.Random(1)
+        docs=[ (i,text,rng.choice(FUZZ_LANGS)) for i, text in enumerate(fuzz_texts(rng,500,60)) ]
+        ## Urdu documents, and documents longer than `chunk_chars`
+        docs+=[ (500,'یہ کتاب اچھی ہے۔ وہ کتاب اچھی تھی۔','ur'),(501,'','hi'),(502,'क ख। '*200,'hi'),(503,'a. b? '*300,'en') ]
+        return docs
+
+    def assert_same(self,docs,**kwargs):
+        expected=[ (doc_id,sentence_tokenize.sentence_split(text,lang)) for doc_id, text, lang in docs ]
+        results=list(sentence_tokenize.sentence_split_batch(iter(docs),**kwargs))
+        if kwargs.get('ordered',True):
+            self.assertEqual(results,expected,msg=str(kwargs))
+        else:
+            self.assertEqual(len(results),len(expected),msg=str(kwargs))
+            self.assertEqual(dict(results),dict(expected),msg=str(kwargs))
+
+    def test_serial(self):
+        docs=self.docs()
+        self.assert_same(docs)
+        self.assert_same(docs,chunksize=7,chunk_chars=500)
+        self.assert_same([])
+
+    def test_parallel(self):
+        docs=self.docs()
+        self.assert_same(docs,n_jobs=2,chunksize=7,chunk_chars=500)
+        self.assert_same(docs,n_jobs=2,chunksize=7,chunk_chars=500,ordered=False)
+        self.assert_same([],n_jobs=2)
+
+class UnseekableStringIO(io.StringIO):
+
+    def seekable(self):
+        return False
+
+class IterSentencesTest(unittest.TestCase):
+
+    def test_random(self):
+        rng=random.Random(1)
+        for text in fuzz_texts(rng,2000,60):
+            cuts=sorted( rng.randint(0,len(text)) for _ in range(rng.randint(0,10)) )
+            pieces=[ text[s:e] for s, e in zip([0]+cuts,cuts+[len(text)]) ]
+            for lang in FUZZ_LANGS:
+                expected=sentence_tokenize.sentence_split(text,lang)
+                self.assertEqual(list(sentence_tokenize.iter_sentences(pieces,lang)),expected,msg='{!r} ({})'.format(pieces,lang))
+                for stream in [io.StringIO(text),UnseekableStringIO(text)]:
+                    self.assertEqual(list(sentence_tokenize.iter_sentences(stream,lang,chunk_size=7)),expected,
+                                     msg='{!r} ({})'.format(text,lang))
+
+    def test_get_delim_pat(self):
+        for text, lang, expected in [('a. b। c','hi',sentence_tokenize.DELIM_PAT_DANDA),
+                                     ('a. b. c','hi',sentence_tokenize.DELIM_PAT_NO_DANDA),
+                                     ('a. b। c','en',sentence_tokenize.DELIM_PAT_NO_DANDA)]:
+            stream=io.StringIO(text)
+            stream.read(1)
+            self.assertIs(sentence_tokenize.get_delim_pat(stream,lang,chunk_size=2),expected)
+            self.assertEqual(stream.tell(),1)
+        self.assertEqual(sentence_tokenize.get_delim_pat(UnseekableStringIO('a। b'),'hi'),'auto')
+
+    def test_auto_seekable(self):
+        ## a seekable file is rewound after the scan for a danda, and its
+        ## sentences are yielded as it is read
+        stream=io.StringIO('क ख? '*10000+'ग।')
+        sentences=sentence_tokenize.iter_sentences(stream,'hi',chunk_size=100)
+        self.assertEqual(next(sentences),'क ख?')
+        self.assertLessEqual(stream.tell(),100)
+        self.assertEqual(len(list(sentences)),10000)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+#
+#  Copyright (c) 2013-present, Anoop Kunchukuttan
+#  All rights reserved.
+#
+#  This source code is licensed under the MIT license found in the
+#  LICENSE file in the root directory of this source tree.
+#
+
+"""
+Equivalence of the translation tables used by `UnicodeIndicTransliterator`
+with the original character by character transliteration, which is kept
+below as the reference.
+"""
+
+import os
+import tempfile
+import unittest
+
+from indicnlp import common
+from indicnlp import langinfo
+from indicnlp.transliterate import unicode_transliterate as ut
+from indicnlp.transliterate.sinhala_transliterator import SinhalaDevanagariTransliterator as sdt
+from indicnlp.transliterate.unicode_transliterate import UnicodeIndicTransliterator
+
+### reference implementation (before the translation tables)
+def ref_transliterate(text,lang1_code,lang2_code):
+    if lang1_code in langinfo.SCRIPT_RANGES and lang2_code in langinfo.SCRIPT_RANGES:
+
+        if lang1_code=='si':
+            text=sdt.sinhala_to_devanagari(text)
+            lang1_code='hi'
+
+        org_lang2_code=''
+        if lang2_code=='si':
+            lang2_code='hi'
+            org_lang2_code='si'
+
+        trans_lit_text=[]
+        for c in text:
+            newc=c
+            offset=ord(c)-langinfo.SCRIPT_RANGES[lang1_code][0]
+            if offset >=langinfo.COORDINATED_RANGE_START_INCLUSIVE and offset <= langinfo.COORDINATED_RANGE_END_INCLUSIVE and c!='।' and c!='॥':
+                if lang2_code=='ta':
+                    offset=UnicodeIndicTransliterator._correct_tamil_mapping(offset)
+                newc=chr(langinfo.SCRIPT_RANGES[lang2_code][0]+offset)
+
+            trans_lit_text.append(newc)
+
+        if org_lang2_code=='si':
+            return sdt.devanagari_to_sinhala(''.join(trans_lit_text))
+
+        return ''.join(trans_lit_text)
+    else:
+        return text
+
+## every codepoint of the BMP except the surrogates, and a few astral ones
+ALL_CHARS=''.join( chr(c) for c in range(0x10000) if not 0xd800<=c<=0xdfff )+'\U0001f600\U00011000\U0010ffff'
+
+def lang_pairs():
+    """
+    One pair of languages for each pair of script ranges, since the languages
+    sharing a script range share the tables
+    """
+    langs={}
+    for lang, r in sorted(langinfo.SCRIPT_RANGES.items()):
+        langs.setdefault(r[0],lang)
+    return [ (l1,l2) for l1 in langs.values() for l2 in langs.values() ]
+
+class TranstableTest(unittest.TestCase):
+
+    def setUp(self):
+        ## do not use the tables cached or loaded by other tests
+        UnicodeIndicTransliterator._TRANS_TABLES.clear()
+        ut._LOADED_TRANSTABLES=None
+
+    tearDown=setUp
+
+    def assert_all_pairs(self):
+        for l1, l2 in lang_pairs():
+            out=UnicodeIndicTransliterator.transliterate(ALL_CHARS,l1,l2)
+            ref=ref_transliterate(ALL_CHARS,l1,l2)
+            self.assertEqual(len(out),len(ref))
+            if out!=ref:
+                c, o, r=next( t for t in zip(ALL_CHARS,out,ref) if t[1]!=t[2] )
+                self.fail('{}->{}: U+{:04X} gives U+{:04X}, expected U+{:04X}'.format(l1,l2,ord(c),ord(o),ord(r)))
+
+    def test_every_codepoint(self):
+        ## includes the Tamil corrections and the Sinhala pairs
+        self.assert_all_pairs()
+
+    def test_unknown_lang(self):
+        self.assertEqual(UnicodeIndicTransliterator.transliterate('कख','hi','en'),'कख')
+        self.assertEqual(UnicodeIndicTransliterator.transliterate('कख','ur','hi'),'कख')
+
+    def test_save_load(self):
+        ut.precompute_transtables()
+        tables=dict(UnicodeIndicTransliterator._TRANS_TABLES)
+        self.assertEqual(set(tables),set(ut._transtable_keys()))
+
+        fd, fname=tempfile.mkstemp(suffix='.bin')
+        os.close(fd)
+        try:
+            ut.save_transtables(fname)
+            UnicodeIndicTransliterator._TRANS_TABLES.clear()
+            ut.load_transtables(fname)
+            for key, table in tables.items():
+                self.assertEqual(UnicodeIndicTransliterator._get_transtable_by_key(key),table)
+        finally:
+            os.remove(fname)
+
+    def test_load_bad_file(self):
+        fd, fname=tempfile.mkstemp(suffix='.bin')
+        os.close(fd)
+        try:
+            with open(fname,'wb') as ofile:
+                ofile.write(b'not a table file')
+            with self.assertRaises(common.IndicNlpException):
+                ut.load_transtables(fname)
+        finally:
+            os.remove(fname)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+#
+#  Copyright (c) 2013-present, Anoop Kunchukuttan
+#  All rights reserved.
+#
+#  This source code is licensed under the MIT license found in the
+#  LICENSE file in the root directory of this source tree.
+#
+
+"""
+Conformance of the pure Python implementation of the Urdu rules with
+UrduHack. The expected outputs were produced by UrduHack 1.1.1
+(`urduhack.tokenization.sentence_tokenizer`, and the normalization steps
+called by `urdu._normalize_urduhack`), and do not vary with the hash seed.
+"""
+
+import unittest
+
+from indicnlp import urdu
+
+## (text, remove_diacritics, UrduHack output)
+NORMALIZE_CASES=[
+        ('یہ کتاب123اچھی ہے!ab',True,'یہ کتاب 123 اچھی ہے ! ab'),
+        ## Arabic characters
+        ('كتاب ي ى ە ۃ',True,'کتاب ی ی ە ۃ'),
+        ## presentation forms
+        ('ﺁپ ﻛﺘﺎﺏ',True,'آپ کتاب'),
+        ## diacritics
+        ('کِتاب اَچھی ہے',True,'کتاب اچھی ہے'),
+        ('کِتاب اَچھی ہے',False,
+            'کِتاب اَچھی ہے'),
+        ## combining characters
+        ('آب آ',True,'آب آ'),
+        ## whitespace
+        ('یہ\xa0کتاب\r\nاچھی   ہے',True,'یہ کتاب\nاچھی ہے'),
+        ## Urdu digits are not spaced
+        ('سال۲۰۲۰میں',True,'سال۲۰۲۰میں'),
+        ## punctuations and English characters
+        ('ہے،وہ؟نہیں۔',True,'ہے ، وہ ؟ نہیں ۔'),
+        ('(کتاب)',True,'( کتاب )'),
+        ('abcکتابxyz',True,'abc کتاب xyz'),
+        ('',True,''),
+    ]
+
+## (text, UrduHack sentences)
+SENTENCE_CASES=[
+        ('یہ کتاب اچھی ہے۔ وہ کتاب اچھی تھی۔',['یہ کتاب اچھی ہے۔','وہ کتاب اچھی تھی۔']),
+        ## example of the UrduHack documentation: a sentence ends after 'ہے'
+        ('عراق اور شام نے اعلان کیا ہے دونوں ممالک جلد اپنے اپنے سفیروں کو واپس بغداد اور دمشق بھیج دیں گے؟',
+            ['عراق اور شام نے اعلان کیا ہے','دونوں ممالک جلد اپنے اپنے سفیروں کو واپس بغداد اور دمشق بھیج دیں گے؟']),
+        ## not before a conjunction
+        ('وہ آیا تھا اور چلا گیا۔',['وہ آیا تھا اور چلا گیا۔']),
+        ## a following comma or full stop is kept in the sentence
+        ('وہ آیا تھا ، پھر چلا گیا',['وہ آیا تھا ،','پھر چلا گیا']),
+        ('وہ آیا تھا ۔ پھر چلا گیا',['وہ آیا تھا ۔','پھر چلا گیا']),
+        ('کیا وہ آیا؟ ہاں وہ آیا تھا۔ ٹھیک ہے',['کیا وہ آیا؟','ہاں وہ آیا تھا۔','ٹھیک ہے']),
+        ## sentences of a single word are dropped
+        ('ایک۔ دو تین۔',['دو تین۔']),
+        ('یہ ہے',['یہ ہے']),
+        ('ہے',[]),
+        ('',[]),
+        ('   \n  ',[]),
+        ('یہ کتاب\nاچھی ہے   وہ\tبھی',['یہ کتاب اچھی ہے','وہ بھی']),
+        ('یہ کتاب اچھی ہے کہ نہیں؟؟ پتہ نہیں۔۔',['یہ کتاب اچھی ہے کہ نہیں؟','پتہ نہیں۔']),
+    ]
+
+class PythonBackendTest(unittest.TestCase):
+
+    def setUp(self):
+        self.backend=urdu._backend
+        urdu.set_backend('python')
+
+    def tearDown(self):
+        urdu.set_backend(self.backend)
+
+    def test_normalize(self):
+        for text, remove_diacritics, expected in NORMALIZE_CASES:
+            self.assertEqual(urdu.normalize(text,remove_diacritics),expected,msg=ascii(text))
+
+    def test_sentence_split(self):
+        for text, expected in SENTENCE_CASES:
+            self.assertEqual(urdu.sentence_split(text),expected,msg=ascii(text))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -16,6 +16,8 @@ De-tokenizer for Indian languages.
 
 import string, re, sys
 from indicnlp.common import IndicNlpException
+from indicnlp.tokenize import indic_tokenize
+from indicnlp.tokenize.indic_tokenize import join_num_seqs
 
 ## detokenizer patterns 
 left_attach=r'!%)\]},.:;>?\u0964\u0965'
@@ -27,15 +29,58 @@ pat_ra=re.compile(r'(['+right_attach+r'])[ ]')
 lr_attach=r'-/\\'
 pat_lra=re.compile(r'[ ](['+lr_attach+r'])[ ]')
 
+## quotes alternate between right attachment (opening quote) and left 
+## attachment (closing quote)
+alt_attach='\'"`'
+pat_alt_attach=re.compile(r'(['+alt_attach+r'])')
+
+## separator between the texts of a batch, see `detokenize_batch`
+BATCH_SEP='\u0000'
+pat_alt_attach_batch=re.compile(r'(['+alt_attach+BATCH_SEP+r'])')
+
 #donknow=u'&*+=^_|~'
 
-## date, numbers, section/article numbering
+## date, numbers, section/article numbering: the pattern is shared with the 
+## tokenizer, and kept here for the callers which used this module's pattern
+pat_num_seq=indic_tokenize.pat_num_seq
 ## TODO: handle indic numbers
-pat_num_seq=re.compile(r'([0-9]+ [,.:/] )+[0-9]+')
 
 ### e-mail address
 #pat_num=re.compile(ur'[a-zA-Z]+[ ]? 
 
+def _attach_quotes(s,batch=False): 
+    """
+    Attach each quote to the following token if it is an opening quote, 
+    and to the preceding token if it is a closing quote. The occurrences 
+    of each quote character are counted separately, and all the quote 
+    characters are handled in a single scan of the text. 
+
+    If `batch` is True, the counts are restarted after every `BATCH_SEP`.
+    """
+    ## parts alternate between text and quote characters
+    parts=(pat_alt_attach_batch if batch else pat_alt_attach).split(s)
+    if len(parts)==1:
+        return s
+
+    counts=dict.fromkeys(alt_attach,0)
+    for i in range(1,len(parts),2): 
+        punc=parts[i]
+        if punc==BATCH_SEP:
+            counts=dict.fromkeys(alt_attach,0)
+            continue
+
+        if counts[punc]%2==0:
+            # right attach 
+            if parts[i+1].startswith(' '):
+                parts[i+1]=parts[i+1][1:]
+        else:
+            # left attach
+            if parts[i-1].endswith(' '):
+                parts[i-1]=parts[i-1][:-1]
+        counts[punc]+=1
+
+    return ''.join(parts)
+
 def trivial_detokenize_indic(text): 
     """detokenize string for Indian language scripts using Brahmi-derived scripts
 
@@ -52,22 +97,13 @@ def trivial_detokenize_indic(text):
         str: detokenized string
     """
 
-    s=text
+    return _detokenize(text)
+
+def _detokenize(s,batch=False): 
     ### some normalizations 
 
     #numbers and dates
-    new_s=''
-    prev=0
-    for m in pat_num_seq.finditer(s):
-        start=m.start()
-        end=m.end()
-        if start>prev:
-            new_s=new_s+s[prev:start]
-            new_s=new_s+s[start:end].replace(' ','')
-            prev=end
-   
-    new_s=new_s+s[prev:]
-    s=new_s
+    s=join_num_seqs(s,BATCH_SEP if batch else None)
 
     ###  consective single quotes or backslashes become double quotes
     #s=s.replace("' '", "''")
@@ -78,23 +114,7 @@ def trivial_detokenize_indic(text):
     s=pat_ra.sub('\\1',s)
 
     # assumes well formedness of quotes and alternates between right and left attach
-
-    alt_attach='\'"`'
-    for punc in alt_attach: 
-        cnt=0
-        out_str=[]
-        for c in s:
-            if c == punc:
-                if cnt%2==0:
-                    out_str.append('@RA')
-                else:
-                    out_str.append('@LA')
-                cnt+=1    
-            else:
-                out_str.append(c)
-
-        s=''.join(out_str).replace('@RA ',punc).replace(' @LA',punc
-                ).replace('@RA',punc).replace('@LA',punc)
+    s=_attach_quotes(s,batch)
 
     return s
 
@@ -118,6 +138,36 @@ def trivial_detokenize(text,lang='hi'):
     """
     return trivial_detokenize_indic(text)
 
+def detokenize_batch(texts,lang='hi'): 
+    """detokenize a batch of strings 
+
+    Detokenizes all the strings in a single pass of each detokenization 
+    step over their concatenation, which reduces the per-call overhead 
+    when detokenizing many short strings (e.g. the hypotheses of an MT 
+    system). The result for every string is the same as that of 
+    `trivial_detokenize`. 
+
+    The strings are joined with `BATCH_SEP` ('\\u0000'). If a string contains 
+    this separator, the batch is detokenized string by string instead, with 
+    the same result. 
+
+    Args:
+        texts (list): tokenized strings to process
+        lang (str): ISO 639-2 language code
+
+    Returns:
+        list: detokenized strings, in the input order
+    """
+    if len(texts)==0:
+        return []
+
+    joined=BATCH_SEP.join(texts)
+    if joined.count(BATCH_SEP)!=len(texts)-1:
+        ## the separator occurs in some text, which would be split at it 
+        return [ trivial_detokenize(text,lang) for text in texts ]
+
+    return _detokenize(joined,batch=True).split(BATCH_SEP)
+
 # if __name__ == '__main__': 
 
 #     if len(sys.argv)<4:
@@ -16,16 +16,79 @@ are supported (see `trivial_tokenize`). Major Indian language punctuations are
 handled. 
 """
 import string, re, sys
+import functools, bisect
+from array import array
 
 from indicnlp.common import IndicNlpException
+from indicnlp import parallel
 
 ### tokenizer patterns 
-triv_tokenizer_indic_pat=re.compile(r'(['+string.punctuation+r'\u0964\u0965\uAAF1\uAAF0\uABEB\uABEC\uABED\uABEE\uABEF\u1C7E\u1C7F'+r'])')
-triv_tokenizer_urdu_pat=re.compile(r'(['+string.punctuation+r'\u0609\u060A\u060C\u061E\u066A\u066B\u066C\u066D\u06D4'+r'])')
+## punctuation characters (contents of a regex character class)
+INDIC_PUNC_CLASS=string.punctuation+r'\u0964\u0965\uAAF1\uAAF0\uABEB\uABEC\uABED\uABEE\uABEF\u1C7E\u1C7F'
+URDU_PUNC_CLASS=string.punctuation+r'\u0609\u060A\u060C\u061E\u066A\u066B\u066C\u066D\u06D4'
+
+triv_tokenizer_indic_pat=re.compile(r'(['+INDIC_PUNC_CLASS+r'])')
+triv_tokenizer_urdu_pat=re.compile(r'(['+URDU_PUNC_CLASS+r'])')
 
 ## date, numbers, section/article numbering
 pat_num_seq=re.compile(r'([0-9]+ [,.:/] )+[0-9]+')
 
+def join_num_seqs(text,sep=None): 
+    """
+    Remove the spaces inside the number sequences (dates, numbers, 
+    section/article numbering) of tokenized text, e.g. `12 / 06 / 2014` 
+    becomes `12/06/2014`. All sequences are rewritten in a single pass, 
+    so the running time is linear in the length of the text.
+
+    If `sep` is given, `text` is treated as a concatenation of independent
+    texts separated by the character `sep`.
+    """
+    def join_num_seq_match(m): 
+        ## a number sequence at the very beginning of the text has never 
+        ## been joined, retained for compatibility
+        start=m.start()
+        if start==0 or (sep is not None and text[start-1]==sep):
+            return m.group()
+        return m.group().replace(' ','')
+
+    return pat_num_seq.sub(join_num_seq_match,text)
+
+## number sequences as they occur in untokenized text, i.e. before the 
+## punctuations have been padded with spaces
+RAW_NUM_SEQ=r'(?:[0-9]+[ \t]*[,.:/][ \t]*)+[0-9]+'
+pat_raw_num_seq=re.compile(RAW_NUM_SEQ)
+
+## Single scan token grammars. A token is either a single punctuation 
+## character, or a maximal run of non-space, non-punctuation characters. 
+## For Indic scripts, number sequences are part of the run, so that they 
+## are not split on the punctuations they contain.
+tok_indic_pat=re.compile(r'(?:[^ \t0-9'+INDIC_PUNC_CLASS+r']+|'+RAW_NUM_SEQ+r'|[0-9]+)+|['+INDIC_PUNC_CLASS+r']')
+tok_urdu_pat=re.compile(r'[^ \t'+URDU_PUNC_CLASS+r']+|['+URDU_PUNC_CLASS+r']')
+tok_plain_indic_pat=re.compile(r'[^ \t'+INDIC_PUNC_CLASS+r']+|['+INDIC_PUNC_CLASS+r']')
+pat_leading_space=re.compile(r'[ \t]*')
+
+## a number sequence which contains spaces has digits and one of its 
+## punctuations separated by spaces
+pat_spaced_num_seq=re.compile(r'[0-9][ \t]+[,.:/]|[,.:/][ \t]+[0-9]')
+
+def _join_num_seq(token): 
+    return token.replace(' ','').replace('\t','')
+
+def _split_leading_num_seq(token): 
+    """
+    The number sequence at the very beginning of the text is not joined by
+    the tokenizer (the original implementation only joined sequences which 
+    started after some other text). Retained for compatibility. 
+
+    Returns the tokens for `token`, which is the first token of the text
+    and starts with a number sequence.
+    """
+    end=pat_raw_num_seq.match(token).end()
+    tokens=tok_plain_indic_pat.findall(token,0,end)
+    if end<len(token):
+        tokens[-1]=tokens[-1]+_join_num_seq(token[end:])
+    return tokens
+
 def trivial_tokenize_indic(text): 
     """tokenize string for Indian language scripts using Brahmi-derived scripts
 
@@ -41,26 +104,19 @@ def trivial_tokenize_indic(text):
         list: list of tokens
 
     """
-    tok_str=triv_tokenizer_indic_pat.sub(r' \1 ',text.replace('\t',' '))
-#     return re.sub(r'[ ]+',' ',tok_str).strip(' ').split(' ')
+    tokens=tok_indic_pat.findall(text)
+    if len(tokens)==0:
+        return ['']
 
-    s=re.sub(r'[ ]+',' ',tok_str).strip(' ')
-    
-    # do not tokenize numbers and dates
-    new_s=''
-    prev=0
-    for m in pat_num_seq.finditer(s):
-        start=m.start()
-        end=m.end()
-        if start>prev:
-            new_s=new_s+s[prev:start]
-            new_s=new_s+s[start:end].replace(' ','')
-            prev=end
-   
-    new_s=new_s+s[prev:]
-    s=new_s
-    
-    return s.split(' ')
+    # do not tokenize numbers and dates: number sequences are matched as
+    # part of a token, only the spaces inside them have to be removed
+    if pat_spaced_num_seq.search(text) is not None: 
+        tokens=[ _join_num_seq(t) if ' ' in t or '\t' in t else t for t in tokens ]
+
+    if tokens[0][0].isdigit() and pat_raw_num_seq.match(tokens[0]) is not None: 
+        tokens[0:1]=_split_leading_num_seq(tok_indic_pat.match(text,pat_leading_space.match(text).end()).group())
+
+    return tokens
 
 def trivial_tokenize_urdu(text): 
     """tokenize Urdu string 
@@ -76,8 +132,10 @@ def trivial_tokenize_urdu(text):
     Returns:
         list: list of tokens
     """
-    tok_str=triv_tokenizer_urdu_pat.sub(r' \1 ',text.replace('\t',' '))
-    return re.sub(r'[ ]+',' ',tok_str).strip(' ').split(' ')
+    tokens=tok_urdu_pat.findall(text)
+    if len(tokens)==0:
+        return ['']
+    return tokens
     # from urduhack.tokenization import word_tokenizer
     # return word_tokenizer(text)
 
@@ -100,6 +158,260 @@ def trivial_tokenize(text,lang='hi'):
     else:
         return trivial_tokenize_indic(text)
 
+class TokenSpans(object): 
+    """
+    Tokens of a text along with their character offsets in the text. 
+
+    The offsets are stored in two integer arrays (`starts` and `ends`), 
+    so a large number of tokens does not need a large number of objects.
+    Indexing and iteration produce `(token, start, end)` tuples on demand, 
+    where `text[start:end]` is the span of the token in the text. The token 
+    differs from the span only for number sequences written with spaces 
+    (e.g. `12 / 06 / 2014`), the spaces are not part of the token. Slicing 
+    produces a `TokenSpans` of the selected tokens. 
+    """
+
+    def __init__(self,text,starts,ends): 
+        self.text=text
+        self.starts=starts
+        self.ends=ends
+
+    def _token(self,start,end): 
+        token=self.text[start:end]
+        if ' ' in token or '\t' in token: 
+            token=_join_num_seq(token)
+        return token
+
+    def __len__(self): 
+        return len(self.starts)
+
+    def __getitem__(self,i): 
+        if isinstance(i,slice): 
+            return TokenSpans(self.text,self.starts[i],self.ends[i])
+        start, end = self.starts[i], self.ends[i]
+        return (self._token(start,end),start,end)
+
+    def __iter__(self): 
+        for start, end in zip(self.starts,self.ends): 
+            yield (self._token(start,end),start,end)
+
+    def tokens(self): 
+        """
+        list of tokens, without the offsets
+        """
+        return [ self._token(start,end) for start, end in zip(self.starts,self.ends) ]
+
+def _token_spans(text,lang): 
+    starts=array('q')
+    ends=array('q')
+    for m in (tok_urdu_pat if lang=='ur' else tok_indic_pat).finditer(text): 
+        starts.append(m.start())
+        ends.append(m.end())
+    return starts, ends
+
+def _split_leading_num_seq_span(text,starts,ends): 
+    """
+    Span based version of `_split_leading_num_seq`, modifies the first 
+    token span in place if it starts with a number sequence.
+    """
+    if len(starts)==0 or not text[starts[0]].isdigit(): 
+        return 
+    start, end = starts[0], ends[0]
+    num_seq=pat_raw_num_seq.match(text,start,end)
+    if num_seq is not None:
+        split_starts=array('q')
+        split_ends=array('q')
+        for m in tok_plain_indic_pat.finditer(text,start,num_seq.end()):
+            split_starts.append(m.start())
+            split_ends.append(m.end())
+        split_ends[-1]=end
+        starts[0:1]=split_starts
+        ends[0:1]=split_ends
+
+def trivial_tokenize_with_offsets(text,lang='hi'): 
+    """trivial tokenizer which also returns the offsets of the tokens
+
+    Same tokenization as `trivial_tokenize`, but the tokens are returned 
+    with their start and end offsets in `text`. Unlike `trivial_tokenize`, 
+    an empty (or whitespace only) text has no tokens.
+
+    Args:
+        text (str): text to tokenize
+        lang (str): ISO 639-2 language code
+
+    Returns:
+        TokenSpans: sequence of `(token, start, end)` tuples 
+    """
+    starts, ends = _token_spans(text,lang)
+    if lang!='ur':
+        _split_leading_num_seq_span(text,starts,ends)
+    return TokenSpans(text,starts,ends)
+
+## characters which can be part of a number sequence
+NUM_SEQ_CHARS='0123456789 \t,.:/'
+
+## reversed suffix of a text, which can be the beginning of a number 
+## sequence which continues beyond the text
+pat_rev_num_seq_prefix=re.compile(r'(?:[ \t]*[,.:/])?[ \t]*(?:[0-9]+[ \t]*[,.:/][ \t]*)*[0-9]+')
+
+## size of the pieces in which string input is processed by `iter_tokens`
+STREAM_CHUNK_SIZE=65536
+
+def _iter_text_chunks(text_or_file): 
+    if isinstance(text_or_file,str): 
+        for i in range(0,len(text_or_file),STREAM_CHUNK_SIZE): 
+            yield text_or_file[i:i+STREAM_CHUNK_SIZE]
+    elif hasattr(text_or_file,'read'): 
+        for chunk in iter(lambda: text_or_file.read(STREAM_CHUNK_SIZE),''): 
+            yield chunk
+    else: 
+        for chunk in text_or_file: 
+            yield chunk
+
+def _final_tokens_end(text,starts,lang): 
+    """
+    Returns the offset up to which the tokens of `text` cannot change if 
+    more text is appended: the last token may extend, and a number 
+    sequence at the end may continue. 
+    """
+    if len(starts)==0: 
+        return len(text)
+
+    end=len(text) if text[-1] in ' \t' else starts[-1]
+
+    if lang!='ur':
+        n_num_chars=len(text)-len(text.rstrip(NUM_SEQ_CHARS))
+        if n_num_chars>0:
+            m=pat_rev_num_seq_prefix.match(text[-n_num_chars:][::-1])
+            if m is not None:
+                ## start of the token containing the number sequence prefix
+                i=bisect.bisect_right(starts,len(text)-m.end())-1
+                end=min(end,starts[i])
+
+    return end
+
+## characters which are neither token separators nor punctuations
+pat_indic_word_char=re.compile(r'[^ \t'+INDIC_PUNC_CLASS+r']')
+pat_urdu_word_char=re.compile(r'[^ \t'+URDU_PUNC_CLASS+r']')
+
+def _token_restart(text,start,end,lang): 
+    """
+    Returns a position `p` inside the token `text[start:end]` such that 
+    tokenizing `text[p:]` followed by more text gives the rest of the token 
+    as its first token, i.e. the same as tokenizing from the start of the 
+    token. This holds between two characters which are neither separators 
+    nor punctuations. Returns `start` if there is no such position.
+    """
+    pat=pat_urdu_word_char if lang=='ur' else pat_indic_word_char
+    for p in range(end-1,start,-1): 
+        if pat.match(text,p) is not None and pat.match(text,p-1) is not None: 
+            return p
+    return start
+
+def _prefixed_tokens(prefix,text,starts,ends,at_start,lang): 
+    """
+    Tokens of the spans of `text`, where the first token continues the 
+    token which begins with `prefix`
+    """
+    token=prefix+text[starts[0]:ends[0]]
+    if at_start and lang!='ur': 
+        first=TokenSpans(token,array('q',[0]),array('q',[len(token)]))
+        _split_leading_num_seq_span(token,first.starts,first.ends)
+        tokens=first.tokens()
+    else: 
+        tokens=TokenSpans(token,array('q',[0]),array('q',[len(token)])).tokens()
+    return tokens+TokenSpans(text,starts[1:],ends[1:]).tokens()
+
+def iter_tokens(text_or_file,lang='hi'): 
+    """tokenize a text incrementally
+
+    Generator version of `trivial_tokenize` for large inputs. The input is 
+    processed in pieces and the tokens are yielded as soon as they are 
+    known, so memory use does not depend on the size of the input. Only the 
+    text of a token which may continue in the next piece (including number 
+    sequences) is carried over. The beginning of a long token which cannot 
+    change is set aside, so that it is not scanned again with every piece.
+
+    The result is the same as tokenizing the concatenated input with 
+    `trivial_tokenize`. Note that only space and tab are token separators,
+    so line breaks are part of the tokens.
+
+    Args:
+        text_or_file (str|file|iterable): a string, a file object opened in text mode, or an iterable of strings (e.g. lines)
+        lang (str): ISO 639-2 language code
+
+    Returns:
+        generator: tokens
+    """
+    prefix=[]   ## beginning of the first token of carry, which is not scanned again
+    carry=''
+    at_start=True
+    for chunk in _iter_text_chunks(text_or_file): 
+        if len(chunk)==0:
+            continue
+        text=carry+chunk
+        starts, ends = _token_spans(text,lang)
+        end=_final_tokens_end(text,starts,lang)
+        n=bisect.bisect_left(starts,end)
+        if n>0:
+            if len(prefix)>0: 
+                ## the first token starts at 0, see _token_restart
+                yield from _prefixed_tokens(''.join(prefix),text,starts[:n],ends[:n],at_start,lang)
+                prefix=[]
+            else: 
+                if at_start and lang!='ur': 
+                    del starts[n:]
+                    del ends[n:]
+                    _split_leading_num_seq_span(text,starts,ends)
+                    n=len(starts)
+                yield from TokenSpans(text,starts[:n],ends[:n]).tokens()
+            at_start=False
+        carry=text[end:]
+
+        ## a single token is carried over: set aside its beginning
+        if len(carry)>0 and len(starts)==n+1 and starts[n]==end: 
+            p=_token_restart(text,end,ends[n],lang)-end
+            if p>0: 
+                prefix.append(carry[:p])
+                carry=carry[p:]
+
+    starts, ends = _token_spans(carry,lang)
+    if len(prefix)>0: 
+        yield from _prefixed_tokens(''.join(prefix),carry,starts,ends,at_start,lang)
+        return
+    if at_start:
+        if len(starts)==0: 
+            ## same as trivial_tokenize for empty input
+            yield ''
+            return
+        if lang!='ur':
+            _split_leading_num_seq_span(carry,starts,ends)
+    yield from TokenSpans(carry,starts,ends).tokens()
+
+def _tokenize_lines(lang,lines): 
+    return [ trivial_tokenize(line,lang) for line in lines ]
+
+def tokenize_batch(lines,lang='hi',n_jobs=1,chunksize=10000): 
+    """tokenize a batch of strings using multiple processes
+
+    The lines are split into chunks of `chunksize` lines, which are 
+    tokenized by a pool of `n_jobs` worker processes. 
+
+    Args:
+        lines (iterable): strings to tokenize
+        lang (str): ISO 639-2 language code
+        n_jobs (int): number of worker processes. If -1, as many as the number of CPUs. If 1, the lines are tokenized in the calling process 
+        chunksize (int): number of lines sent to a worker at a time
+
+    Returns:
+        list: list of token lists, one for each input string in the input order
+    """
+    tokenized=[]
+    for result in parallel.imap_chunks(functools.partial(_tokenize_lines,lang),
+                            parallel.chunked(lines,chunksize),n_jobs=n_jobs): 
+        tokenized.extend(result)
+    return tokenized
+
 # if __name__ == '__main__': 
 
 #     if len(sys.argv)<4:
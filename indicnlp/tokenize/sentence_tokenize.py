@@ -17,8 +17,13 @@ in many Indian languages.
 """
 
 import re
+import itertools
+import functools
 from indicnlp.transliterate import unicode_transliterate
 from indicnlp import langinfo
+from indicnlp import urdu
+from indicnlp import parallel
+from indicnlp.common import IndicNlpException
 
 
 ## for language which have danda as delimiter
@@ -47,7 +52,163 @@ def is_latin_or_numeric(character):
     Returns:
         bool: True if the character is a Latin character or a number, False otherwise.
     """
-    return re.match(CONTAINS_VALID_DOMAIN_CHAR, character) is not None
+    return CONTAINS_VALID_DOMAIN_CHAR.match(character) is not None
+
+## the characters matched by CONTAINS_VALID_DOMAIN_CHAR, to check single characters
+VALID_DOMAIN_CHARS=frozenset('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_-')
+
+## non-breaking phrases in Devanagari: acronyms of latin characters, 
+## single letters and abbreviations
+NON_BREAKING_PHRASES_HI=frozenset({
+ ## acronym for latin characters
+  'ए', 'ऎ',
+  'बी', 'बि', 
+  'सी', 'सि',
+  'डी', 'डि',
+  'ई', 'इ',
+   'एफ', 'ऎफ',
+  'जी', 'जि',
+  'एच','ऎच',
+  'आई',  'आइ','ऐ',
+  'जे', 'जॆ',
+  'के', 'कॆ',
+  'एल', 'ऎल',
+  'एम','ऎम',
+  'एन','ऎन',
+  'ओ', 'ऒ',
+  'पी', 'पि',
+  'क्यू', 'क्यु',
+  'आर', 
+  'एस','ऎस',
+  'टी', 'टि',
+  'यू', 'यु',
+  'वी', 'वि', 'व्ही', 'व्हि',
+  'डब्ल्यू', 'डब्ल्यु',
+  'एक्स','ऎक्स',
+  'वाय',
+  'जेड', 'ज़ेड',
+##  add halant to the previous English character mappings.            
+ 'एफ्',
+ 'ऎफ्',
+ 'एच्',
+ 'ऎच्',
+ 'एल्',
+ 'ऎल्',
+ 'एम्',
+ 'ऎम्',
+ 'एन्',
+ 'ऎन्',
+ 'आर्',
+ 'एस्',
+ 'ऎस्',
+ 'एक्स्',
+ 'ऎक्स्',
+ 'वाय्',
+ 'जेड्', 'ज़ेड्',    
+
+#Indic vowels
+    'ऄ',
+    'अ',
+    'आ',
+    'इ',
+    'ई',
+    'उ',
+    'ऊ',
+    'ऋ',
+    'ऌ',
+    'ऍ',
+    'ऎ',
+    'ए',
+    'ऐ',
+    'ऑ',
+    'ऒ',
+    'ओ',
+    'औ',
+    'ॠ',
+    'ॡ',
+    
+#Indic consonants
+    'क',
+    'ख',
+    'ग',
+    'घ',
+    'ङ',
+    'च',
+    'छ',
+    'ज',
+    'झ',
+    'ञ',
+    'ट',
+    'ठ',
+    'ड',
+    'ढ',
+    'ण',
+    'त',
+    'थ',
+    'द',
+    'ध',
+    'न',
+    'ऩ',
+    'प',
+    'फ',
+    'ब',
+    'भ',
+    'म',
+    'य',
+    'र',
+    'ऱ',
+    'ल',
+    'ळ',
+    'ऴ',
+    'व',
+    'श',
+    'ष',
+    'स',
+    'ह',  
+    
+## abbreviation
+ 'श्री',
+ 'डॉ',
+ 'कु',
+ 'चि',
+ 'सौ',
+})
+
+## non-breaking phrases of each language in its script, built on first use
+_non_breaking_phrases={}
+
+def get_non_breaking_phrases(lang):
+    """Get the non-breaking phrases of a language in its script
+
+    These are the strings which transliterate to a non-breaking phrase in 
+    Devanagari. The transliteration maps characters one to one, so the strings 
+    are enumerated from the characters which map to each character of a 
+    phrase. Characters not in the source script are not transliterated, so 
+    they map to themselves. 
+
+    Args:
+        lang (str): ISO 639-2 language code
+
+    Returns:
+        frozenset: non-breaking phrases
+    """
+    phrases=_non_breaking_phrases.get(lang)
+    if phrases is None: 
+        if lang in langinfo.SCRIPT_RANGES: 
+            table=unicode_transliterate.UnicodeIndicTransliterator.get_transtable(lang,'hi')
+            sources={}
+            for c, hi_c in table.items(): 
+                sources.setdefault(chr(hi_c),[]).append(chr(c))
+
+            def source_chars(hi_c): 
+                return sources.get(hi_c,[]) + ([] if ord(hi_c) in table else [hi_c])
+
+            phrases=frozenset( ''.join(chars) for phrase in NON_BREAKING_PHRASES_HI 
+                                for chars in itertools.product(*[ source_chars(c) for c in phrase ]) )
+        else: 
+            phrases=NON_BREAKING_PHRASES_HI
+        _non_breaking_phrases[lang]=phrases
+    return phrases
 
 def is_acronym_abbvr(text,lang):
     """Is the text a non-breaking phrase
@@ -59,123 +220,201 @@ def is_acronym_abbvr(text,lang):
     Returns:
         boolean: true if `text` is a non-breaking phrase
     """
+    return text in get_non_breaking_phrases(lang)
+
+def _strip_span(raw,begin): 
+    """
+    Strip the text `raw`, which starts at offset `begin` of the text, and 
+    return the stripped text with its span
+    """
+    s=raw.lstrip()
+    start=begin+len(raw)-len(s)
+    s=s.rstrip()
+    return s, start, start+len(s)
+
+## delimiters of DELIM_PAT_DANDA, and dandas, among the matches of DELIM_PAT_NO_DANDA
+DANDA_DELIMS=frozenset('?!\u0964\u0965')
+DANDAS=frozenset('\u0964\u0965')
+
+def _find_delims(text,lang,delim_pat): 
+    """
+    Find the positions of the sentence delimiters in the text. In 'auto' mode, 
+    the delimiter pattern is chosen in the same scan of the text.
+
+    Returns:
+        tuple: (positions, delim_pat), the list of positions of the delimiters, and the delimiter pattern used
+    """
+    if delim_pat!='auto': 
+        return [ mo.start() for mo in delim_pat.finditer(text) ], delim_pat
+
+    if not langinfo.is_danda_delim(lang):
+        return [ mo.start() for mo in DELIM_PAT_NO_DANDA.finditer(text) ], DELIM_PAT_NO_DANDA
+
+    # in modern texts it is possible that period is used as delimeter
+    # instead of DANDA. Hence, a check. Use danda delimiter pattern
+    # only if text contains at least one danda. 
+    # The text is scanned for all the delimiters up to the first danda, and 
+    # for the danda delimiters after it.
+    positions=[]
+    for mo in DELIM_PAT_NO_DANDA.finditer(text): 
+        p=mo.start()
+        if text[p] in DANDAS: 
+            positions=[ q for q in positions if text[q] in DANDA_DELIMS ]
+            positions.append(p)
+            positions.extend( mo.start() for mo in DELIM_PAT_DANDA.finditer(text,p+1) )
+            return positions, DELIM_PAT_DANDA
+        positions.append(p)
+    return positions, DELIM_PAT_NO_DANDA
+
+def _iter_candidate_sentences(chunks,lang): 
+    """
+    Phase 1 of the sentence splitter: break the text on sentence delimiters. 
+    The text is given as an iterable of tuples (chunk, positions), where 
+    positions lists the delimiters in the chunk, and the candidate sentences 
+    are yielded as soon as they are complete, as tuples (sentence, start, end) 
+    of the sentence and its offsets in the text. Only the text of the current 
+    candidate is kept. 
+
+    A delimiter at the start of the text has no character before it. (The 
+    original splitter checked `text[p1-1]`, which is the last character of 
+    the text for the first one.)
+    """
+    pending=[]        ## text of the current candidate
+    pending_begin=0   ## offset of the current candidate in the text
+    offset=0          ## offset of the chunk in the text
+    prev=None         ## last character of the previous chunks, None at the start of the text
+    deferred=False    ## the previous chunk ends with a delimiter, which is split depending on the next character
+
+    ## the text is not stripped: the checks below give the same result for a 
+    ## delimiter preceded or followed by whitespace as at the start or end of 
+    ## the text, and the candidates are stripped
+    for chunk, positions in chunks: 
+        if len(chunk)==0: 
+            continue
+
+        begin=0
+        if deferred: 
+            deferred=False
+            if chunk[0] not in VALID_DOMAIN_CHARS: 
+                cand=_strip_span(''.join(pending),pending_begin)
+                pending=[]
+                pending_begin=offset
+                if len(cand[0])>0:
+                    yield cand
+
+        for p1 in positions:
+            c=chunk[p1-1] if p1>0 else prev
+
+            ## NEW
+            if c is not None and c.isnumeric():
+                continue
+
+            ## Prevents splitting on "." in URLs/emails in indic texts.
+            if lang != "en":
+                if c in VALID_DOMAIN_CHARS:
+                    if p1+1 < len(chunk): 
+                        if chunk[p1+1] in VALID_DOMAIN_CHARS:
+                            continue
+                    else: 
+                        deferred=True
+                        continue
+
+            if len(pending)>0:
+                pending.append(chunk[begin:p1+1])
+                raw=''.join(pending)
+                pending=[]
+            else:
+                raw=chunk[begin:p1+1]
+            ## strip the candidate and compute its span
+            s=raw.lstrip()
+            start=pending_begin+len(raw)-len(s)
+            s=s.rstrip()
+            if len(s)>0:
+                yield s, start, start+len(s)
+            pending_begin=offset+p1+1
+            begin=p1+1
+
+        if begin<len(chunk):
+            pending.append(chunk[begin:])
+        prev=chunk[-1]
+        offset+=len(chunk)
+
+    cand=_strip_span(''.join(pending),pending_begin)
+    if len(cand[0])>0:
+        yield cand
+
+def _collapse_spaces(sentence): 
+    sentence=sentence.strip()
+    ## the substitution is much slower than the check
+    if '  ' in sentence: 
+        return CONTAINS_MULTIPLE_SPACES.sub(' ', sentence)
+    return sentence
+
+def _merge_sentences(cand_sentences,lang): 
+    """
+    Phase 2 of the sentence splitter: address the fact that '.' may not always be 
+    a sentence delimiter. If there is a run of lines containing only a word 
+    (optionally) and '.', merge these lines as well one sentence preceding and 
+    succeeding this run of lines. The sentences are yielded as soon as they are 
+    complete, with the span from the start of their first candidate to the end 
+    of their last candidate. 
+    """
+    sen_buffer=''        
+    sen_start=sen_end=0
+    bad_state=False
+    ## see is_acronym_abbvr
+    non_breaking_phrases=get_non_breaking_phrases(lang)
 
-    ack_chars =  {
-     ## acronym for latin characters
-      'ए', 'ऎ',
-      'बी', 'बि', 
-      'सी', 'सि',
-      'डी', 'डि',
-      'ई', 'इ',
-       'एफ', 'ऎफ',
-      'जी', 'जि',
-      'एच','ऎच',
-      'आई',  'आइ','ऐ',
-      'जे', 'जॆ',
-      'के', 'कॆ',
-      'एल', 'ऎल',
-      'एम','ऎम',
-      'एन','ऎन',
-      'ओ', 'ऒ',
-      'पी', 'पि',
-      'क्यू', 'क्यु',
-      'आर', 
-      'एस','ऎस',
-      'टी', 'टि',
-      'यू', 'यु',
-      'वी', 'वि', 'व्ही', 'व्हि',
-      'डब्ल्यू', 'डब्ल्यु',
-      'एक्स','ऎक्स',
-      'वाय',
-      'जेड', 'ज़ेड',
-    ##  add halant to the previous English character mappings.            
-     'एफ्',
-     'ऎफ्',
-     'एच्',
-     'ऎच्',
-     'एल्',
-     'ऎल्',
-     'एम्',
-     'ऎम्',
-     'एन्',
-     'ऎन्',
-     'आर्',
-     'एस्',
-     'ऎस्',
-     'एक्स्',
-     'ऎक्स्',
-     'वाय्',
-     'जेड्', 'ज़ेड्',    
-
-    #Indic vowels
-        'ऄ',
-        'अ',
-        'आ',
-        'इ',
-        'ई',
-        'उ',
-        'ऊ',
-        'ऋ',
-        'ऌ',
-        'ऍ',
-        'ऎ',
-        'ए',
-        'ऐ',
-        'ऑ',
-        'ऒ',
-        'ओ',
-        'औ',
-        'ॠ',
-        'ॡ',
-        
-    #Indic consonants
-        'क',
-        'ख',
-        'ग',
-        'घ',
-        'ङ',
-        'च',
-        'छ',
-        'ज',
-        'झ',
-        'ञ',
-        'ट',
-        'ठ',
-        'ड',
-        'ढ',
-        'ण',
-        'त',
-        'थ',
-        'द',
-        'ध',
-        'न',
-        'ऩ',
-        'प',
-        'फ',
-        'ब',
-        'भ',
-        'म',
-        'य',
-        'र',
-        'ऱ',
-        'ल',
-        'ळ',
-        'ऴ',
-        'व',
-        'श',
-        'ष',
-        'स',
-        'ह',  
-        
-    ## abbreviation
-     'श्री',
-     'डॉ',
-     'कु',
-     'चि',
-     'सौ',
-    }
-
-    return unicode_transliterate.UnicodeIndicTransliterator.transliterate(text,lang,'hi') in ack_chars
+    for sentence, start, end in cand_sentences: 
+        ## the last word, i.e. sentence.split(' ')[-1], without splitting
+        last_space=sentence.rfind(' ')
+        #if len(words)<=2 and words[-1]=='.':
+        if last_space<0 and sentence[-1]=='.':
+            bad_state=True
+            if len(sen_buffer)==0:
+                sen_start=start
+            sen_buffer = sen_buffer + ' ' + sentence
+            sen_end=end
+        ## NEW condition    
+        elif sentence[-1]=='.' and sentence[last_space+1:-1] in non_breaking_phrases:
+            if len(sen_buffer)>0 and not bad_state:
+                yield _collapse_spaces(sen_buffer), sen_start, sen_end
+                sen_buffer = sentence
+                sen_start=start
+            else:
+                if len(sen_buffer)==0:
+                    sen_start=start
+                sen_buffer = sen_buffer + ' ' + sentence
+            sen_end=end
+            bad_state=True
+        elif bad_state:
+            if len(sen_buffer)==0:
+                sen_start=start
+            sen_buffer = sen_buffer + ' ' + sentence
+            yield _collapse_spaces(sen_buffer), sen_start, end
+            sen_buffer=''
+            bad_state=False
+        else: ## good state                    
+            if len(sen_buffer)>0:
+                yield _collapse_spaces(sen_buffer), sen_start, sen_end
+            sen_buffer=sentence
+            sen_start, sen_end=start, end
+            bad_state=False
+
+    if len(sen_buffer)>0:
+        yield _collapse_spaces(sen_buffer), sen_start, sen_end
+
+def _iter_sentences(chunks,lang,delim_pat): 
+    """
+    Split the text given as an iterable of tuples (chunk, positions) of the 
+    chunks and their delimiters, found with `delim_pat`. Yields tuples 
+    (sentence, start, end)
+    """
+    cand_sentences=_iter_candidate_sentences(chunks,lang)
+    if not delim_pat.search('.'):
+        ## run phase 2 only if delimiter pattern contains period
+        return cand_sentences
+    return _merge_sentences(cand_sentences,lang)
 
 def sentence_split(text,lang,delim_pat='auto'): ## New signature
     """split the text into sentences
@@ -200,102 +439,210 @@ def sentence_split(text,lang,delim_pat='auto'): ## New signature
     """
     
     if lang == "ur":
-        from urduhack.tokenization import sentence_tokenizer
-        sentences = sentence_tokenizer(text)
-        return sentences
+        return urdu.sentence_split(text)
     
-    #print('Input: {}'.format(delim_pat))
+    ## in 'auto' mode, the delimiter pattern is chosen while finding the 
+    ## delimiters, otherwise, assume the caller set the delimiter pattern
+    positions, delim_pat=_find_delims(text,lang,delim_pat)
+    
+    return [ s for s, _, _ in _iter_sentences([(text,positions)],lang,delim_pat) ]
+
+## the words seen by the Urdu sentence splitter: runs of non-space characters,
+## cut after full stops and question marks
+URDU_WORD_PAT=re.compile('[^\\s\u06d4\u061f]*[\u06d4\u061f]|[^\\s\u06d4\u061f]+')
+
+def _urdu_sentence_spans(text): 
+    ## the Urdu sentence splitter joins consecutive words of the text by single
+    ## spaces, so each sentence is located as the next run of its words 
+    words=[ (mo.group(),mo.start(),mo.end()) for mo in URDU_WORD_PAT.finditer(text) ]
+    spans=[]
+    i=0
+    for sentence in urdu.sentence_split(text): 
+        sen_words=sentence.split(' ')
+        n=len(sen_words)
+        ## i only increases, so at most len(words) runs are compared 
+        while i+n<=len(words) and [ w for w, _, _ in words[i:i+n] ]!=sen_words: 
+            i+=1
+        if i+n>len(words): 
+            raise IndicNlpException('Urdu sentence not found in the text: {}'.format(sentence))
+        spans.append((words[i][1],words[i+n-1][2]))
+        i+=n
+    return spans
+
+def sentence_split_spans(text,lang,delim_pat='auto'): 
+    """split the text into sentences, and locate them in the text
+
+    Same as `sentence_split`, but returns the offsets of the sentences in the 
+    text. The offsets are computed while splitting. `text[start:end]` starts 
+    at the first character of the sentence and ends after its delimiter. It 
+    is the sentence before its whitespace is normalized: `sentence_split` 
+    collapses runs of spaces and joins merged parts by a space when the 
+    period is a delimiter. 
+
+    For Urdu, the words of the sentences are located in the text after 
+    splitting. 
+
+    Args:
+        text (str): text to split into sentence
+        lang (str): ISO 639-2 language code
+        delim_pat (str): regular expression to identify sentence delimiter characters, see `sentence_split`
+
+    Returns:
+        list: list of tuples (start, end), the offsets of the sentences in the text 
+
+    Raises:
+        IndicNlpException: For Urdu, if a sentence is not a run of words of the text, which may happen with UrduHack if it changes the text 
+    """
+    if lang == "ur":
+        return _urdu_sentence_spans(text)
+
+    positions, delim_pat=_find_delims(text,lang,delim_pat)
+
+    return [ (start,end) for _, start, end in _iter_sentences([(text,positions)],lang,delim_pat) ]
+
+def _iter_urdu_sentences(chunks): 
+    ## the Urdu sentence splitter splits the text at full stops first, and 
+    ## splits the parts independently, so only the text after the last full 
+    ## stop is carried over
+    carry=''
+    for chunk in chunks: 
+        text=carry+chunk
+        end=text.rfind('\u06d4')+1
+        carry=text[end:]
+        if end>0: 
+            yield from urdu.sentence_split(text[:end])
+    yield from urdu.sentence_split(carry)
+
+def get_delim_pat(stream,lang,chunk_size=1<<16): 
+    """choose the delimiter pattern of a text file for the 'auto' mode 
+
+    For languages which use danda as delimiter, the file is read in blocks of 
+    `chunk_size` characters up to the first danda, and rewound to where it 
+    was, so that only one block is held in memory. 
+
+    Args:
+        stream (file): a text file object
+        lang (str): ISO 639-2 language code
+        chunk_size (int): number of characters read at a time
+
+    Returns:
+        the delimiter pattern, or 'auto' if the file must be read to choose it but is not seekable
+    """
+    if not langinfo.is_danda_delim(lang): 
+        return DELIM_PAT_NO_DANDA
+    if not stream.seekable(): 
+        return 'auto'
+
+    pos=stream.tell()
+    delim_pat=DELIM_PAT_NO_DANDA
+    for chunk in iter(functools.partial(stream.read,chunk_size),''): 
+        if CONTAINS_DANDA.search(chunk) is not None: 
+            delim_pat=DELIM_PAT_DANDA
+            break
+    stream.seek(pos)
+    return delim_pat
+
+def iter_sentences(stream,lang,delim_pat='auto',chunk_size=1<<16): 
+    """split a text read incrementally into sentences
+
+    Gives the same sentences as `sentence_split` on the whole text, but reads 
+    the text in chunks and yields each sentence as soon as it is complete, so 
+    that memory use is bounded by the length of the sentences rather than of 
+    the text, except in the case below. 
+
+    In 'auto' mode, for languages which use danda as delimiter, the delimiter 
+    pattern depends on whether the text contains a danda (see `sentence_split`). 
+    A seekable file object is first scanned for a danda and rewound (see 
+    `get_delim_pat`). Otherwise the text is buffered until the first danda, or 
+    to the end if it has none, so memory use is not bounded. Pass the delimiter 
+    pattern to avoid this. 
+
+    Args:
+        stream (file or iterable): a text file object, which is read in blocks of `chunk_size` characters, or an iterable of strings whose concatenation is the text
+        lang (str): ISO 639-2 language code
+        delim_pat (str): regular expression to identify sentence delimiter characters, see `sentence_split`. Delimiters must be single characters
+        chunk_size (int): number of characters read at a time from a file object 
+
+    Returns:
+        generator: sentences identified from the input text 
+    """
+    if hasattr(stream,'read'): 
+        if delim_pat=='auto' and lang!='ur': 
+            delim_pat=get_delim_pat(stream,lang,chunk_size)
+        chunks=iter(functools.partial(stream.read,chunk_size),'')
+    else: 
+        chunks=iter(stream)
+
+    if lang == "ur":
+        yield from _iter_urdu_sentences(chunks)
+        return
+
     if delim_pat=='auto':
         if langinfo.is_danda_delim(lang):
-            # in modern texts it is possible that period is used as delimeter
-            # instead of DANDA. Hence, a check. Use danda delimiter pattern
-            # only if text contains at least one danda
-            if CONTAINS_DANDA.search(text) is None:
-                delim_pat=DELIM_PAT_NO_DANDA
-                #print('LANG has danda delim. TEXT_CONTAINS_DANDA: FALSE --> DELIM_PAT_NO_DANDA')
-            else:
-                delim_pat=DELIM_PAT_DANDA
-                #print('LANG has danda delim. TEXT_CONTAINS_DANDA: TRUE --> DELIM_PAT_DANDA')
+            buffered=[]
+            delim_pat=DELIM_PAT_NO_DANDA
+            for chunk in chunks: 
+                buffered.append(chunk)
+                if CONTAINS_DANDA.search(chunk) is not None: 
+                    delim_pat=DELIM_PAT_DANDA
+                    break
+            chunks=itertools.chain(buffered,chunks)
         else:
             delim_pat=DELIM_PAT_NO_DANDA
-            #print('LANG has no danda delim --> DELIM_PAT_NO_DANDA')
 
-    ## otherwise, assume the caller set the delimiter pattern
-    
-    ### Phase 1: break on sentence delimiters.
-    cand_sentences=[]
-    begin=0
-    text = text.strip()
-    for mo in delim_pat.finditer(text):
-        p1=mo.start()
-        p2=mo.end()
-        
-        ## NEW
-        if p1>0 and text[p1-1].isnumeric():
+    chunks=( (chunk,[ mo.start() for mo in delim_pat.finditer(chunk) ]) for chunk in chunks )
+    for sentence, _, _ in _iter_sentences(chunks,lang,delim_pat): 
+        yield sentence
+
+def _split_documents(docs): 
+    return [ (doc_id, sentence_split(text,lang)) for doc_id, text, lang in docs ]
+
+def _chunk_documents(docs,chunksize,chunk_chars): 
+    """
+    Group documents into chunks of at most `chunksize` documents and about 
+    `chunk_chars` characters. A document longer than `chunk_chars` is a chunk 
+    by itself, so that it does not hold back the documents batched with it. 
+    """
+    chunk=[]
+    n_chars=0
+    for doc in docs: 
+        n=len(doc[1])
+        if n>=chunk_chars: 
+            if len(chunk)>0: 
+                yield chunk
+                chunk=[]
+                n_chars=0
+            yield [doc]
             continue
-        
-        ## Prevents splitting on "." in URLs/emails in indic texts.
-        if lang != "en":
-            if is_latin_or_numeric(text[p1-1]):
-                if p1+1 < len(text) and is_latin_or_numeric(text[p1+1]):
-                    continue
-
-        end=p1+1
-        s= text[begin:end].strip()
-        if len(s)>0:
-            cand_sentences.append(s)
-        begin=p1+1
-
-    s= text[begin:].strip()
-    if len(s)>0:
-        cand_sentences.append(s)
+        chunk.append(doc)
+        n_chars+=n
+        if len(chunk)>=chunksize or n_chars>=chunk_chars: 
+            yield chunk
+            chunk=[]
+            n_chars=0
+    if len(chunk)>0: 
+        yield chunk
 
-    if not delim_pat.search('.'):
-        ## run phase 2 only if delimiter pattern contains period
-        #print('No need to run phase2')
-        return cand_sentences
-#     print(cand_sentences)
-#     print('====')
-        
-#     return cand_sentences
-
-    ### Phase 2: Address the fact that '.' may not always be a sentence delimiter
-    ### Method: If there is a run of lines containing only a word (optionally) and '.',
-    ### merge these lines as well one sentence preceding and succeeding this run of lines.
-    final_sentences=[]
-    sen_buffer=''        
-    bad_state=False
+def sentence_split_batch(docs,n_jobs=1,chunksize=10000,chunk_chars=1<<20,ordered=True): 
+    """split a batch of documents into sentences using multiple processes
 
-    for i, sentence in enumerate(cand_sentences): 
-        words=sentence.split(' ')
-        #if len(words)<=2 and words[-1]=='.':
-        if len(words)==1 and sentence[-1]=='.':
-            bad_state=True
-            sen_buffer = sen_buffer + ' ' + sentence
-        ## NEW condition    
-        elif sentence[-1]=='.' and is_acronym_abbvr(words[-1][:-1],lang):
-            if len(sen_buffer)>0 and not bad_state:
-                final_sentences.append(sen_buffer)
-                sen_buffer = sentence
-            else:
-                sen_buffer = sen_buffer + ' ' + sentence
-            bad_state=True
-        elif bad_state:
-            sen_buffer = sen_buffer + ' ' + sentence
-            if len(sen_buffer)>0:
-                final_sentences.append(sen_buffer)
-            sen_buffer=''
-            bad_state=False
-        else: ## good state                    
-            if len(sen_buffer)>0:
-                final_sentences.append(sen_buffer)
-            sen_buffer=sentence
-            bad_state=False
+    The documents are grouped into chunks by size: a chunk holds up to 
+    `chunksize` documents and about `chunk_chars` characters, and longer 
+    documents are sent alone. The chunks are split by a pool of `n_jobs` 
+    worker processes, using `sentence_split`. Results are yielded as the 
+    chunks are processed, and can be collected with `dict`. 
 
-    if len(sen_buffer)>0:
-        final_sentences.append(sen_buffer)
-        
-    for i in range(0, len(final_sentences)):
-        final_sentences[i] = CONTAINS_MULTIPLE_SPACES.sub(' ', final_sentences[i].strip())
-    
-    return final_sentences
+    Args:
+        docs (iterable): tuples (doc_id, text, lang) of the documents, where lang is the ISO 639-2 language code of the text
+        n_jobs (int): number of worker processes. If -1, as many as the number of CPUs. If 1, the documents are split in the calling process 
+        chunksize (int): maximum number of documents sent to a worker at a time
+        chunk_chars (int): number of characters sent to a worker at a time 
+        ordered (bool): if True, results are yielded in the order of the documents, else as soon as their chunk is processed
+
+    Returns:
+        generator: tuples (doc_id, sentences) for each document 
+    """
+    for result in parallel.imap_chunks(_split_documents,
+                            _chunk_documents(docs,chunksize,chunk_chars),
+                            n_jobs=n_jobs,ordered=ordered): 
+        yield from result
@@ -13,11 +13,13 @@
 
 import sys, string, itertools, re, os
 from collections import defaultdict
+from array import array
 
 from indicnlp import common
 from indicnlp import langinfo 
 from indicnlp.script import indic_scripts as isc
 from indicnlp.transliterate.sinhala_transliterator import SinhalaDevanagariTransliterator  as sdt
+from indicnlp.normalize.normalization_plan import NormalizationPlan
 import pandas as pd
 
 OFFSET_TO_ITRANS={}
@@ -82,6 +84,100 @@ def init():
                 'OM': 'AUM'
             }
 
+    ## the matcher is built from the maps on first use
+    ItransTransliterator._reset()
+
+### Registry of the transliteration tables of all the script pairs. The tables 
+### can be saved to a binary file, so that a process (e.g. a worker) can load 
+### them at startup instead of building them. 
+###
+### File format: native byte order uint32 array. Header: magic, version, number 
+### of tables. Each table: source base, target base, number of entries n, 
+### followed by the n source codepoints and the n target codepoints. 
+
+TRANSTABLE_MAGIC=0x54544e49
+TRANSTABLE_VERSION=1
+
+## (uint32 array, {(src_base,tgt_base): (start,n)}) of the loaded file
+_LOADED_TRANSTABLES=None
+
+def _transtable_keys(): 
+    """
+    Keys of the tables needed to transliterate between all the pairs of 
+    languages in `langinfo.SCRIPT_RANGES`
+    """
+    bases=sorted(set( r[0] for r in langinfo.SCRIPT_RANGES.values() ))
+    return [ (src_base,tgt_base) for src_base in bases for tgt_base in bases ]
+
+def _decode_transtable(key): 
+    if _LOADED_TRANSTABLES is None: 
+        return None
+    data, index=_LOADED_TRANSTABLES
+    if key not in index: 
+        return None
+    start, n=index[key]
+    return dict(zip(data[start:start+n],data[start+n:start+2*n]))
+
+def precompute_transtables(): 
+    """
+    Build the transliteration tables of all the language pairs, including the 
+    tables used for Sinhala 
+    """
+    for key in _transtable_keys(): 
+        UnicodeIndicTransliterator._get_transtable_by_key(key)
+
+def save_transtables(fname): 
+    """
+    Save the transliteration tables of all the language pairs to a binary file, 
+    which can be loaded with `load_transtables` 
+
+    Args:
+        fname (str): path of the file
+    """
+    precompute_transtables()
+    tables=UnicodeIndicTransliterator._TRANS_TABLES
+
+    data=array('I',[TRANSTABLE_MAGIC,TRANSTABLE_VERSION,len(tables)])
+    for (src_base,tgt_base), table in sorted(tables.items()): 
+        data.extend([src_base,tgt_base,len(table)])
+        data.extend(table.keys())
+        data.extend(table.values())
+
+    with open(fname,'wb') as ofile: 
+        data.tofile(ofile)
+
+def load_transtables(fname): 
+    """
+    Load the transliteration tables saved by `save_transtables`. Only an index 
+    of the file is built here, each table is decoded when it is first used. 
+
+    Args:
+        fname (str): path of the file
+
+    Raises:
+        IndicNlpException: If the file is not a transliteration table file
+    """
+    global _LOADED_TRANSTABLES
+
+    data=array('I')
+    with open(fname,'rb') as ifile: 
+        data.frombytes(ifile.read())
+
+    if len(data)>0 and data[0]!=TRANSTABLE_MAGIC: 
+        ## saved on a machine with the other byte order
+        data.byteswap()
+    if len(data)<3 or data[0]!=TRANSTABLE_MAGIC or data[1]!=TRANSTABLE_VERSION: 
+        raise common.IndicNlpException('Not a transliteration table file: {}'.format(fname))
+
+    index={}
+    pos=3
+    for _ in range(data[2]): 
+        src_base, tgt_base, n=data[pos:pos+3]
+        index[(src_base,tgt_base)]=(pos+3,n)
+        pos+=3+2*n
+
+    _LOADED_TRANSTABLES=(data,index)
+
 class UnicodeIndicTransliterator(object):
     """
     Base class for rule-based transliteration among Indian languages. 
@@ -113,6 +209,72 @@ class UnicodeIndicTransliterator(object):
 
         return offset             
 
+    ## translation tables for str.translate, keyed by the first codepoints 
+    ## of the source and target script ranges. Built on first use, or 
+    ## decoded from the tables loaded by `load_transtables` 
+    _TRANS_TABLES={}
+
+    @staticmethod
+    def _build_transtable(src_base,tgt_base): 
+        si_base=langinfo.SCRIPT_RANGES['si'][0]
+        hi_base=langinfo.SCRIPT_RANGES['hi'][0]
+
+        ## Sinhala is mapped to and from Devanagari by explicit maps. The 
+        ## tables for Sinhala compose these maps with the Devanagari tables, 
+        ## so that the text is converted in a single pass.
+        if src_base==si_base or tgt_base==si_base: 
+            if src_base==si_base: 
+                first={ ord(k):ord(v) for k, v in sdt.sinhala_devnag_map.items() }
+            else: 
+                first=UnicodeIndicTransliterator._get_transtable_by_key((src_base,hi_base))
+
+            if tgt_base==si_base: 
+                second={ ord(k):ord(v) for k, v in sdt.devnag_sinhala_map.items() }
+            else: 
+                second=UnicodeIndicTransliterator._get_transtable_by_key((hi_base,tgt_base))
+
+            table={}
+            for c in itertools.chain(first,second): 
+                d=first.get(c,c)
+                d=second.get(d,d)
+                if c!=d: 
+                    table[c]=d
+            return table
+
+        table={}
+        for offset in range(langinfo.COORDINATED_RANGE_START_INCLUSIVE,langinfo.COORDINATED_RANGE_END_INCLUSIVE+1): 
+            c=src_base+offset
+            if c==0x0964 or c==0x0965:
+                continue
+            if tgt_base==langinfo.SCRIPT_RANGES['ta'][0]: 
+                # tamil exceptions 
+                offset=UnicodeIndicTransliterator._correct_tamil_mapping(offset)
+            if c!=tgt_base+offset:
+                table[c]=tgt_base+offset
+        return table
+
+    @staticmethod
+    def get_transtable(lang1_code,lang2_code): 
+        """
+        Get the translation table (see `str.translate`) which maps the characters 
+        of the lang1 script to the lang2 script. Both languages must be in 
+        `langinfo.SCRIPT_RANGES`. 
+
+        The table is built the first time it is requested and cached. 
+        """
+        key=(langinfo.SCRIPT_RANGES[lang1_code][0],langinfo.SCRIPT_RANGES[lang2_code][0])
+        return UnicodeIndicTransliterator._get_transtable_by_key(key)
+
+    @staticmethod
+    def _get_transtable_by_key(key): 
+        table=UnicodeIndicTransliterator._TRANS_TABLES.get(key)
+        if table is None: 
+            table=_decode_transtable(key)
+            if table is None: 
+                table=UnicodeIndicTransliterator._build_transtable(*key)
+            UnicodeIndicTransliterator._TRANS_TABLES[key]=table
+        return table
+
     @staticmethod
     def transliterate(text,lang1_code,lang2_code):
         """
@@ -124,34 +286,7 @@ class UnicodeIndicTransliterator(object):
         """
         if lang1_code in langinfo.SCRIPT_RANGES and lang2_code in langinfo.SCRIPT_RANGES:
             
-            # if Sinhala is source, do a mapping to Devanagari first 
-            if lang1_code=='si': 
-                text=sdt.sinhala_to_devanagari(text)
-                lang1_code='hi'
-
-            # if Sinhala is target, make Devanagiri the intermediate target
-            org_lang2_code=''
-            if lang2_code=='si': 
-                lang2_code='hi'
-                org_lang2_code='si'
-
-            trans_lit_text=[]
-            for c in text: 
-                newc=c
-                offset=ord(c)-langinfo.SCRIPT_RANGES[lang1_code][0]
-                if offset >=langinfo.COORDINATED_RANGE_START_INCLUSIVE and offset <= langinfo.COORDINATED_RANGE_END_INCLUSIVE and c!='\u0964' and c!='\u0965':
-                    if lang2_code=='ta': 
-                        # tamil exceptions 
-                        offset=UnicodeIndicTransliterator._correct_tamil_mapping(offset)
-                    newc=chr(langinfo.SCRIPT_RANGES[lang2_code][0]+offset)
-
-                trans_lit_text.append(newc)        
-
-            # if Sinhala is source, do a mapping to Devanagari first 
-            if org_lang2_code=='si': 
-                return sdt.devanagari_to_sinhala(''.join(trans_lit_text))
-
-            return ''.join(trans_lit_text)
+            return text.translate(UnicodeIndicTransliterator.get_transtable(lang1_code,lang2_code))
         else:
             return text
 
@@ -192,101 +327,139 @@ class ItransTransliterator(object):
         else:
             return text
 
+    ## maximum length of the ITRANS codes matched (see `_build_code_pat`)
+    MAXCODE=4
+
+    ## built on first use from ITRANS_TO_OFFSET and DUPLICATE_ITRANS_REPRESENTATIONS
+    _DUPLICATES_PLAN=None
+    _CODE_PAT=None
+    ## {lang: (codes, post-processing regex, schwa placeholder, halant)}
+    _DECODERS={}
+
     @staticmethod
-    def from_itrans(text,lang):
+    def _reset(): 
+        ItransTransliterator._DUPLICATES_PLAN=None
+        ItransTransliterator._CODE_PAT=None
+        ItransTransliterator._DECODERS={}
+
+    @staticmethod
+    def _build_code_pat(): 
         """
-        TODO: Document this method properly
-        TODO: A little hack is used to handle schwa: needs to be documented
-        TODO: check for robustness
+        Build a regex which matches the longest ITRANS code at a position, or 
+        a single character if no code starts there. 
+
+        The codes are stored in a trie, which is written as a regex: every 
+        node matches its character, followed by one of its children, which is 
+        optional if the node ends a code. The regex engine thus walks the trie 
+        in a single pass, and backtracks to the last code seen. 
+
+        Codes longer than MAXCODE+1 characters are matched only if their 
+        prefixes of MAXCODE+1 or more characters are codes too. 
         """
+        codes=[ c for c in ITRANS_TO_OFFSET if isinstance(c,str) and len(c)>0 ]
+        code_set=set(codes)
+        n=ItransTransliterator.MAXCODE+1
+        codes=[ c for c in codes if all( c[:k] in code_set for k in range(n,len(c)) ) ]
+
+        ## a node is a dict from characters to child nodes, '' marks the end of a code
+        trie={}
+        for code in codes: 
+            node=trie
+            for c in code: 
+                node=node.setdefault(c,{})
+            node['']={}
+
+        def node_regex(node): 
+            alts=[ re.escape(c)+node_regex(child) for c, child in sorted(node.items()) if c!='' ]
+            if len(alts)==0: 
+                return ''
+            if '' in node: 
+                return '(?:{})?'.format('|'.join(alts))
+            return alts[0] if len(alts)==1 else '(?:{})'.format('|'.join(alts))
+
+        if len(trie)==0: 
+            return re.compile('.',re.DOTALL)
+        return re.compile('{}|.'.format(node_regex(trie)),re.DOTALL)
 
-        MAXCODE=4  ### TODO: Needs to be fixed
-        
-        ##  handle_duplicate_itrans_representations
-        for k, v in DUPLICATE_ITRANS_REPRESENTATIONS.items():
-            if k in text:
-                text=text.replace(k,v)
-        
-        start=0
-        match=None
-        solution=[]
+    @staticmethod
+    def _get_decoder(lang): 
+        decoder=ItransTransliterator._DECODERS.get(lang)
+        if decoder is None: 
+            halant=langinfo.offset_to_char(langinfo.HALANTA_OFFSET,lang)
+            schwa=langinfo.offset_to_char(0x7f,lang)
+
+            ## the characters for each code: (after a character other than the 
+            ## halant, after the halant)
+            ## codes of 2 offsets are either a consonant and the halant, or an 
+            ## independent and a dependent vowel, which is used after a consonant 
+            ## (i.e. after the halant)
+            codes={}
+            for code, offs in ITRANS_TO_OFFSET.items(): 
+                if len(offs)==2 and langinfo.is_vowel_offset(offs[0]): 
+                    codes[code]=(langinfo.offset_to_char(offs[0],lang),langinfo.offset_to_char(offs[1],lang))
+                else: 
+                    c=''.join([ langinfo.offset_to_char(x,lang) for x in offs ])
+                    codes[code]=(c,c)
+
+            ## unecessary halants: before a vowel sign, a nukta or the schwa placeholder
+            halant_pat=re.compile('{}(?=[{}-{}{}{}])'.format(re.escape(halant),
+                                    langinfo.offset_to_char(0x3e,lang),langinfo.offset_to_char(0x4c,lang),
+                                    re.escape(langinfo.offset_to_char(langinfo.NUKTA_OFFSET,lang)),re.escape(schwa)))
+
+            decoder=(codes,halant_pat,schwa,halant)
+            ItransTransliterator._DECODERS[lang]=decoder
+        return decoder
 
-        i=start+1  
-        while i<=len(text):
+    @staticmethod
+    def from_itrans(text,lang):
+        """
+        Convert ITRANS text to the script of the language
 
-            itrans=text[start:i]
-            
-    #         print('===')
-    #         print('i: {}'.format(i))
-    #         if i<len(text):
-    #             print('c: {}'.format(text[i-1]))
-    #         print('start: {}'.format(start))
-    #         print('itrans: {}'.format(itrans))
-            
-            if itrans in ITRANS_TO_OFFSET:
-                offs=ITRANS_TO_OFFSET[itrans]
-                
-                ## single element list - no problem 
-                ## except when it is 'a'
-                
-                ## 2 element list of 2 kinds: 
-                ### 1. alternate char for independent/dependent vowel
-                ### 2. consonant + halant
-                
-                if len(offs)==2 and \
-                    langinfo.is_vowel_offset(offs[0]):
-                        ### 1. alternate char for independent/dependent vowel
-                        ## if previous is a consonant, then use the dependent vowel 
-                    if len(solution)>0 and langinfo.is_halanta(solution[-1],lang):
-                        offs=[offs[1]]  ## dependent vowel
-                    else:
-                        offs=[offs[0]]  ## independent vowel
-
-                c=''.join([ langinfo.offset_to_char(x,lang) for x in offs ])
-                match=(i,c)
-                
-            elif len(itrans)==1: ## unknown character 
-                match=(i,itrans)
-            elif i<len(text) and (i-start)<MAXCODE+1: ## continue matching till MAXCODE length substring
-                i=i+1
-                continue
-            else: 
-                solution.extend(match[1])
-    #             start=i-1
-                start=match[0]
-                i=start
-                match=None
-    #             print('match done')
-                
-                
-    #         print('match: {}'.format(match))
-            
-            i=i+1
+        The alternate representations of characters (see 
+        `DUPLICATE_ITRANS_REPRESENTATIONS`) are first replaced by their canonical 
+        form. The text is then split into the longest ITRANS codes, in a single 
+        pass of a regex built from a trie of the codes (characters which do not 
+        start a code are copied). 
 
-        ### flush matches 
-        if match is not None:
-            solution.extend(match[1])
+        Schwa handling: 'a' maps to a placeholder character (offset 0x7f) after 
+        a consonant, and every consonant is followed by a halant. Halants before 
+        a vowel sign, a nukta or the placeholder are deleted, and then the 
+        placeholders. 
+
+        Args:
+            text (str): ITRANS text
+            lang (str): language code, the language must be in `langinfo.SCRIPT_RANGES`
+
+        Returns:
+            str: text in the script of the language
+        """
+        if ItransTransliterator._CODE_PAT is None: 
+            plan=NormalizationPlan()
+            for k, v in DUPLICATE_ITRANS_REPRESENTATIONS.items():
+                plan.replace(k,v)
+            ItransTransliterator._DUPLICATES_PLAN=plan
+            ItransTransliterator._CODE_PAT=ItransTransliterator._build_code_pat()
+        codes, halant_pat, schwa, halant=ItransTransliterator._get_decoder(lang)
+
+        ##  handle_duplicate_itrans_representations
+        text=ItransTransliterator._DUPLICATES_PLAN.apply(text)
+
+        solution=[]
+        after_halant=False
+        for mo in ItransTransliterator._CODE_PAT.finditer(text): 
+            code=mo.group()
+            chars=codes.get(code)
+            ## unknown character 
+            c=code if chars is None else chars[after_halant]
+            solution.append(c)
+            after_halant= c[-1]==halant
 
         #### post-processing 
         ## delete unecessary halants 
-    #     print(''.join(solution))
-        temp_out=list(''.join(solution))
-        rem_indices=[]
-        for i in range(len(temp_out)-1):
-            if langinfo.is_halanta(temp_out[i],lang) and \
-                (langinfo.is_vowel_sign(temp_out[i+1],lang) \
-                or langinfo.is_nukta(temp_out[i+1],lang)  \
-                or temp_out[i+1]==langinfo.offset_to_char(0x7f,lang)):
-                rem_indices.append(i)
-    #         if temp_out[i]==langinfo.offset_to_char(0x7f,lang):
-    #             rem_indices.append(i)
-        for i in reversed(rem_indices):
-            temp_out.pop(i)
-
-        out=''.join(temp_out)    
-        
+        out=halant_pat.sub('',''.join(solution))
+
         ## delete schwa placeholder
-        out=out.replace(langinfo.offset_to_char(0x7f,lang),'')
+        out=out.replace(schwa,'')
 
         return out 
 
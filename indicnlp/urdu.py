@@ -0,0 +1,326 @@
+#
+#  Copyright (c) 2013-present, Anoop Kunchukuttan
+#  All rights reserved.
+#
+#  This source code is licensed under the MIT license found in the
+#  LICENSE file in the root directory of this source tree.
+#
+
+"""
+Urdu normalization and sentence splitting.
+
+The Urdu text processing of the library uses the UrduHack library
+(https://github.com/urduhack/urduhack), an optional dependency which is
+slow to import. It is imported once, lazily, on the first use or by calling
+`warmup`. If UrduHack is not installed, a pure Python implementation of the
+rules which the library uses is applied instead. The backend can also be
+chosen explicitly with `set_backend`:
+
+- 'auto': UrduHack if it is installed, else the Python implementation (default)
+- 'urduhack': always UrduHack
+- 'python': always the Python implementation, UrduHack is never imported
+
+The Python implementation follows UrduHack 1.1.1. The character tables are
+taken from UrduHack (MIT license). UrduHack builds its regex character
+classes from unescaped sets of characters, whose order varies between runs;
+here the classes are escaped, so the punctuation rules always apply to the
+complete set of punctuation characters.
+"""
+
+import re
+import string
+import threading
+import importlib.util
+
+from indicnlp.common import IndicNlpException
+
+BACKENDS=['auto','urduhack','python']
+
+_backend='auto'
+
+## backend chosen in 'auto' mode, resolved on the first use
+_resolved_backend=None
+
+## functions of UrduHack, loaded once
+_urduhack=None
+_urduhack_lock=threading.Lock()
+
+def set_backend(backend):
+    """
+    Choose the implementation of the Urdu rules
+
+    Args:
+        backend (str): one of 'auto', 'urduhack' or 'python'
+    """
+    global _backend, _resolved_backend
+    if backend not in BACKENDS:
+        raise IndicNlpException('Unknown Urdu backend: {}'.format(backend))
+    _backend=backend
+    _resolved_backend=None
+
+def get_backend():
+    """
+    Get the implementation of the Urdu rules which is used: 'urduhack' or 'python'.
+    In 'auto' mode, whether UrduHack is installed is checked once, without 
+    importing it, and the result is cached until `set_backend` is called.
+    """
+    global _resolved_backend
+    if _backend!='auto':
+        return _backend
+    if _resolved_backend is None:
+        _resolved_backend='urduhack' if importlib.util.find_spec('urduhack') is not None else 'python'
+    return _resolved_backend
+
+def _load_urduhack():
+    global _urduhack
+    if _urduhack is None:
+        with _urduhack_lock:
+            if _urduhack is None:
+                from urduhack.normalization import (
+                    remove_diacritics,
+                    normalize_characters,
+                    normalize_combine_characters
+                )
+                from urduhack.preprocessing import (
+                    normalize_whitespace,
+                    digits_space,
+                    all_punctuations_space,
+                    english_characters_space
+                )
+                from urduhack.tokenization import sentence_tokenizer
+
+                _urduhack={
+                    'remove_diacritics':remove_diacritics,
+                    'normalize_characters':normalize_characters,
+                    'normalize_combine_characters':normalize_combine_characters,
+                    'normalize_whitespace':normalize_whitespace,
+                    'digits_space':digits_space,
+                    'all_punctuations_space':all_punctuations_space,
+                    'english_characters_space':english_characters_space,
+                    'sentence_tokenizer':sentence_tokenizer,
+                }
+    return _urduhack
+
+def warmup():
+    """
+    Load the Urdu backend, e.g. when a worker process starts, so that the
+    first request does not pay for the import of UrduHack
+
+    Returns:
+        str: the backend which is used, see `get_backend`
+    """
+    backend=get_backend()
+    if backend=='urduhack':
+        _load_urduhack()
+    return backend
+
+#### Python implementation of the UrduHack rules
+
+URDU_ALPHABETS='\u0621\u0622\u0623\u0624\u0626\u0627\u0628\u062a\u062b\u062c\u062d\u062e\u062f\u0630\u0631\u0632\u0633\u0634\u0635\u0636\u0637\u0638\u0639\u063a\u0641\u0642\u0644\u0645\u0646\u0648\u0679\u067e\u0686\u0688\u0691\u0698\u06a9\u06af\u06ba\u06be\u06c1\u06c2\u06c3\u06cc\u06d2\u06d3'
+URDU_DIGITS='\u06f0\u06f1\u06f2\u06f3\u06f4\u06f5\u06f6\u06f7\u06f8\u06f9'
+URDU_PUNCTUATIONS='\u060c\u061b\u061f\u066a\u066b\u06d4'
+URDU_DIACRITICS='\u064b\u064d\u064e\u064f\u0650\u0670'
+URDU_EXTRA_CHARACTERS='\u0600\u0601\u0602\u0603\u060d\u060e\u060f\u0610\u0611\u0612\u0613\u0614\u0615\u064c\u0651\u0652\u0653\u0654\u0656\u0657\u0658\u066c'
+URDU_ALL_CHARACTERS=URDU_ALPHABETS+URDU_DIGITS+URDU_PUNCTUATIONS+URDU_DIACRITICS+URDU_EXTRA_CHARACTERS
+
+## Urdu character and the Arabic characters (presentation forms) which are replaced by it
+CORRECT_URDU_CHARACTERS={
+    '\u0622':'\ufe81\ufe82',
+    '\u0623':'\ufe83',
+    '\u0627':'\ufe8d\ufe8e',
+    '\u0628':'\ufe8f\ufe90\ufe91\ufe92',
+    '\u067e':'\ufb56\ufb58\ufb59',
+    '\u062a':'\ufe95\ufe96\ufe97\ufe98',
+    '\u0679':'\ufb66\ufb67\ufb68\ufb69',
+    '\u062b':'\ufe9b\ufe9c\ufe9a',
+    '\u062c':'\ufe9d\ufe9e\ufe9f\ufea0',
+    '\u062d':'\ufea1\ufea3\ufea4\ufea2',
+    '\u062e':'\ufea7\ufea8\ufea6',
+    '\u062f':'\ufea9\ufeaa',
+    '\u0630':'\ufeac\ufeab',
+    '\u0631':'\ufead\ufeae',
+    '\u0632':'\ufeaf\ufeb0',
+    '\u0633':'\ufeb1\ufeb2\ufeb3\ufeb4',
+    '\u0634':'\ufeb5\ufeb6\ufeb7\ufeb8',
+    '\u0635':'\ufeb9\ufeba\ufebb\ufebc',
+    '\u0636':'\ufebd\ufebe\ufebf\ufec0',
+    '\u0637':'\ufec3\ufec4',
+    '\u0638':'\ufec5\ufec7\ufec8',
+    '\u0639':'\ufec9\ufeca\ufecb\ufecc',
+    '\u063a':'\ufecd\ufecf\ufed0',
+    '\u0641':'\ufed1\ufed2\ufed3\ufed4',
+    '\u0642':'\ufed5\ufed6\ufed7\ufed8',
+    '\u0644':'\ufedd\ufede\ufedf\ufee0',
+    '\u0645':'\ufee1\ufee2\ufee3\ufee4',
+    '\u0646':'\ufee5\ufee6\ufee7\ufee8',
+    '\u0686':'\ufb7a\ufb7b\ufb7c\ufb7d',
+    '\u0688':'\ufb88\ufb89',
+    '\u0691':'\ufb8d\ufb8c',
+    '\u0698':'\ufb8b',
+    '\u06a9':'\ufb8e\ufb8f\ufb90\ufb91\ufedb\u0643',
+    '\u06af':'\ufb92\ufb93\ufb94\ufb95',
+    '\u06ba':'\ufb9e\ufb9f',
+    '\u0648':'\ufeee\ufeed\ufeee',
+    '\u0624':'\ufe85',
+    '\u06be':'\ufbaa\ufbac\ufbad\ufeec\ufeeb\ufbab',
+    '\u06c1':'\ufee9\ufba6\ufeea\ufba7\ufba9\ufba8\u0647',
+    '\u06c3':'\u0629',
+    '\u0621':'\ufe80',
+    '\u06cc':'\ufbfc\u0649\ufbfd\ufef0\ufef1\ufef2\ufbfe\ufbff\u064a',
+    '\u0626':'\ufe8b\ufe8c',
+    '\u06d2':'\ufbae\ufbaf\ufef3\ufef4',
+    '\u06f0':'\u0660',
+    '\u06f1':'\u0661',
+    '\u06f2':'\u0662',
+    '\u06f3':'\u0663',
+    '\u06f4':'\u0664',
+    '\u06f5':'\u0665',
+    '\u06f6':'\u0666',
+    '\u06f7':'\u0667',
+    '\u06f8':'\u0668',
+    '\u06f9':'\u0669',
+    '\u0644\u0627':'\ufefb\ufefc',
+    '':'\u0640',
+}
+
+## sequences of a character and a combining mark which have a single character form
+COMBINE_URDU_CHARACTERS=[
+    ('\u0627\u0653','\u0622'),
+    ('\u0627\u0654','\u0623'),
+    ('\u06d2\u0654','\u06d3'),
+]
+
+## one translation table for the diacritics and the characters, the diacritics
+## are removed before the characters are replaced, and no character is replaced
+## by a diacritic
+_CHARACTERS_TABLE={ ord(c):urdu_char for urdu_char, chars in CORRECT_URDU_CHARACTERS.items() for c in chars }
+_DIACRITICS_TABLE={ ord(c):None for c in URDU_DIACRITICS }
+_DIACRITICS_CHARACTERS_TABLE=dict(_CHARACTERS_TABLE)
+_DIACRITICS_CHARACTERS_TABLE.update(_DIACRITICS_TABLE)
+
+def _char_class(chars):
+    return '[{}]'.format(''.join( re.escape(c) for c in sorted(set(chars)) ))
+
+def _not_char_class(chars):
+    return '[^{}]'.format(''.join( re.escape(c) for c in sorted(set(chars)) ))
+
+_ALL_PUNCTUATIONS=URDU_PUNCTUATIONS+string.punctuation
+
+_LINEBREAK_RE=re.compile(r'((\r\n)|[\n\v])+')
+## whitespace other than newlines, UrduHack uses the regex library, whose \s does 
+## not match the information separators \x1c-\x1f
+_NONBREAKING_SPACE_RE=re.compile(r'(?!\n)[^\S\x1c-\x1f]+')
+
+## a space between Urdu characters and digits, punctuations and English characters
+_URDU_CHAR=_char_class(URDU_ALL_CHARACTERS)
+_SPACE_BEFORE_DIGITS_RE=re.compile('(?<={})(?=[0-9])'.format(_URDU_CHAR))
+_SPACE_AFTER_DIGITS_RE=re.compile('(?<=[0-9])(?={})'.format(_char_class(URDU_ALL_CHARACTERS.replace('\u0621',''))))
+_SPACE_BEFORE_ALL_PUNCTUATIONS_RE=re.compile('(?<={})(?={})'.format(_URDU_CHAR,_char_class(_ALL_PUNCTUATIONS)))
+_SPACE_AFTER_ALL_PUNCTUATIONS_RE=re.compile('(?<={})(?={})'.format(_char_class(_ALL_PUNCTUATIONS),
+                                                _not_char_class(_ALL_PUNCTUATIONS+'0123456789 \n')))
+_SPACE_BEFORE_ENG_CHAR_RE=re.compile('(?<={})(?=[a-zA-Z])'.format(_URDU_CHAR))
+_SPACE_AFTER_ENG_CHAR_RE=re.compile('(?<=[a-zA-Z])(?={})'.format(_URDU_CHAR))
+
+def _normalize_python(text,remove_diacritics):
+    text=_NONBREAKING_SPACE_RE.sub(' ',_LINEBREAK_RE.sub('\n',text)).strip()
+    text=text.translate(_DIACRITICS_CHARACTERS_TABLE if remove_diacritics else _CHARACTERS_TABLE)
+    for match, repl in COMBINE_URDU_CHARACTERS:
+        text=text.replace(match,repl)
+    text=_SPACE_BEFORE_DIGITS_RE.sub(' ',text)
+    text=_SPACE_AFTER_DIGITS_RE.sub(' ',text)
+    text=_SPACE_BEFORE_ALL_PUNCTUATIONS_RE.sub(' ',text)
+    text=_SPACE_AFTER_ALL_PUNCTUATIONS_RE.sub(' ',text)
+    text=_SPACE_BEFORE_ENG_CHAR_RE.sub(' ',text)
+    text=_SPACE_AFTER_ENG_CHAR_RE.sub(' ',text)
+    return text
+
+def _normalize_urduhack(text,remove_diacritics):
+    urduhack=_load_urduhack()
+    text=urduhack['normalize_whitespace'](text)
+    if remove_diacritics:
+        text=urduhack['remove_diacritics'](text)
+    text=urduhack['normalize_characters'](text)
+    text=urduhack['normalize_combine_characters'](text)
+    text=urduhack['digits_space'](text)
+    text=urduhack['all_punctuations_space'](text)
+    text=urduhack['english_characters_space'](text)
+    return text
+
+def normalize(text,remove_diacritics=True):
+    """
+    Normalize Urdu text: normalize the whitespace, optionally remove the
+    diacritics, replace Arabic characters by Urdu characters, and add spaces
+    between Urdu characters and digits, punctuations and English characters.
+
+    Args:
+        text (str): Urdu text
+        remove_diacritics (bool): remove the diacritics
+
+    Returns:
+        str: normalized text
+    """
+    if get_backend()=='urduhack':
+        return _normalize_urduhack(text,remove_diacritics)
+    return _normalize_python(text,remove_diacritics)
+
+## the words after which a sentence can end, unless a conjunction follows
+_URDU_CONJUNCTIONS=frozenset(['جنہیں', 'جس', 'جن', 'جو',
+            'اور', 'اگر', 'اگرچہ', 'لیکن',
+            'مگر', 'پر', 'یا', 'تاہم', 'کہ',
+            'کر', 'تو', 'گے', 'گی'])
+_URDU_NEWLINE_WORDS=frozenset(['کیجیے', 'کیجئے',
+            'گئیں', 'تھیں', 'ہوں', 'خریدا',
+            'گے', 'ہونگے', 'گا', 'چاہیے',
+            'ہوئیں', 'گی', 'تھا', 'تھی',
+            'تھے', 'ہیں', 'ہے'])
+
+_FULL_STOP_SPLIT_RE=re.compile('(?<=۔)')
+_QUESTION_MARK_SPLIT_RE=re.compile('(?<=؟)')
+
+def _split_words(words,sentences):
+    ## a sentence ends after a sentence ending word (and a following full stop
+    ## or comma), unless the next word is a conjunction
+    sentence=[]
+    i=0
+    while i<len(words):
+        word=words[i]
+        sentence.append(word)
+        if word in _URDU_NEWLINE_WORDS and i+1<len(words) and words[i+1] not in _URDU_CONJUNCTIONS:
+            if words[i+1] in ['۔','،']:
+                sentence.append(words[i+1])
+                i+=1
+            if len(sentence)>=2:
+                sentences.append(' '.join(sentence))
+            sentence=[]
+        i+=1
+    if len(sentence)>=2:
+        sentences.append(' '.join(sentence))
+
+def _sentence_split_python(text):
+    sentences=[]
+    for part in _FULL_STOP_SPLIT_RE.split(text):
+        words=part.split()
+        if len(words)<2:
+            continue
+        if '؟' in part:
+            for question in _QUESTION_MARK_SPLIT_RE.split(part):
+                _split_words(question.split(),sentences)
+        else:
+            _split_words(words,sentences)
+    return sentences
+
+def sentence_split(text):
+    """
+    Split Urdu text into sentences, at full stops and question marks, and
+    after the words which end a sentence. Sentences of a single word are
+    dropped.
+
+    Args:
+        text (str): Urdu text
+
+    Returns:
+        list: sentences
+    """
+    if get_backend()=='urduhack':
+        return _load_urduhack()['sentence_tokenizer'](text)
+    return _sentence_split_python(text)